@@ -0,0 +1,69 @@
+"""
+Benchmark : build_teams_reference avec l'index inversé des aliases.
+
+Fait croître une table d'aliases synthétique (5 aliases par équipe) jusqu'à
+100k entrées et mesure le temps de construction du référentiel. Avec l'index
+inversé, le temps par alias reste constant (croissance linéaire) ; la version
+historique, quadratique, n'est mesurée que sur les petites tailles.
+
+Usage :
+    python benchmarks/bench_aliases_index.py
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from legacy import legacy_build_teams_reference
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import teams_reference
+
+SIZES = [1_000, 5_000, 10_000, 50_000, 100_000]
+LEGACY_MAX_SIZE = 10_000
+ALIASES_PER_TEAM = 5
+
+
+def synthetic_tables(n_aliases: int) -> tuple[dict, dict]:
+    """Génère (confédérations, aliases) synthétiques de taille donnée."""
+    n_teams = n_aliases // ALIASES_PER_TEAM
+    confederations = {f"Team {i}": "UEFA" for i in range(n_teams)}
+    aliases = {
+        f"Team {i} (alias {j})": f"Team {i}"
+        for i in range(n_teams)
+        for j in range(ALIASES_PER_TEAM)
+    }
+    return confederations, aliases
+
+
+def time_indexed(confederations: dict, aliases: dict) -> float:
+    with patch.object(teams_reference, "CONFEDERATIONS", confederations), \
+            patch.object(teams_reference, "ALIASES_MAPPING", aliases), \
+            patch.object(teams_reference, "_aliases_index", None):
+        start = time.perf_counter()
+        reference = teams_reference.build_teams_reference()
+        elapsed = time.perf_counter() - start
+    assert all(len(team["aliases"]) == ALIASES_PER_TEAM for team in reference.values())
+    return elapsed
+
+
+def time_legacy(confederations: dict, aliases: dict) -> float:
+    start = time.perf_counter()
+    legacy_build_teams_reference(confederations, aliases)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'aliases':>10} {'index (s)':>10} {'µs/alias':>9} {'historique (s)':>15}")
+    for size in SIZES:
+        confederations, aliases = synthetic_tables(size)
+        indexed = time_indexed(confederations, aliases)
+        legacy = time_legacy(confederations, aliases) if size <= LEGACY_MAX_SIZE else None
+        legacy_str = f"{legacy:15.3f}" if legacy is not None else f"{'-':>15}"
+        print(f"{size:>10,} {indexed:10.3f} {indexed / size * 1e6:9.2f} {legacy_str}")
+
+
+if __name__ == "__main__":
+    main()
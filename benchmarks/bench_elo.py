@@ -0,0 +1,115 @@
+"""
+Benchmark : classement Elo sur un historique synthétique (elo.py).
+
+Génère 1M matchs synthétiques (10k éditions × 100 matchs entre 300 équipes,
+un pays hôte par édition). Un parcours match par match (classements dans un
+dictionnaire, lignes lues une à une) n'est mesuré que sur un sous-ensemble,
+où l'équivalence des classements est vérifiée ; EloRatings est mesuré sur
+le jeu complet, en calcul complet puis en ajout d'éditions à un classement
+existant.
+
+Usage :
+    python benchmarks/bench_elo.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cleaning import ROUND_STAGES
+from elo import BASE_RATING, HOME_ADVANTAGE, K_FACTORS, EloRatings, chronological_order
+
+N_EDITIONS = 10_000
+MATCHES_PER_EDITION = 100
+N_TEAMS = 300
+LOOP_EDITIONS = [100, 1_000]
+APPENDED_EDITIONS = 10
+
+
+def synthetic_history(n_editions: int, seed: int = 0) -> pd.DataFrame:
+    """Historique synthétique : tours tirés au hasard, scores de 0 à 4 buts."""
+    rng = np.random.default_rng(seed)
+    n = n_editions * MATCHES_PER_EDITION
+    home = rng.integers(0, N_TEAMS, n)
+    away = (home + rng.integers(1, N_TEAMS, n)) % N_TEAMS
+    home_result, away_result = rng.integers(0, 5, n), rng.integers(0, 5, n)
+    matches = pd.DataFrame({
+        'id_match': np.arange(1, n + 1),
+        'home_team_id': home,
+        'away_team_id': away,
+        'home_result': home_result,
+        'away_result': away_result,
+        'result': np.select(
+            [home_result > away_result, home_result < away_result], ['home_team', 'away_team'], default='draw'
+        ),
+        'penalties': False,
+        'date': pd.NaT,
+        'round': np.array(ROUND_STAGES)[np.sort(rng.integers(0, len(ROUND_STAGES), n).reshape(n_editions, -1))].ravel(),
+        'edition': np.repeat(np.arange(n_editions), MATCHES_PER_EDITION),
+    })
+    return matches
+
+
+def loop_elo(matches, hosts) -> dict:
+    """Parcours match par match, classements dans un dictionnaire."""
+    ratings = {}
+    for _, row in matches.iloc[chronological_order(matches)].iterrows():
+        home, away = row['home_team_id'], row['away_team_id']
+        rating_home, rating_away = ratings.get(home, BASE_RATING), ratings.get(away, BASE_RATING)
+        host = hosts[row['edition']][0]
+        advantage = HOME_ADVANTAGE if row['round'] == 'Preliminary' or home == host else 0.0
+        advantage = -HOME_ADVANTAGE if away == host and row['round'] != 'Preliminary' else advantage
+        score = {'home_team': 1.0, 'away_team': 0.0, 'draw': 0.5}[row['result']]
+        goal_diff = abs(row['home_result'] - row['away_result'])
+        weight = 1.0 if goal_diff <= 1 else 1.5 if goal_diff == 2 else (11 + goal_diff) / 8
+        expected = 1 / (10 ** ((rating_away - rating_home - advantage) / 400) + 1)
+        delta = K_FACTORS[row['round']] * weight * (score - expected)
+        ratings[home], ratings[away] = rating_home + delta, rating_away - delta
+    return ratings
+
+
+def main() -> None:
+    full = synthetic_history(N_EDITIONS)
+    hosts = {edition: [edition % N_TEAMS] for edition in range(N_EDITIONS)}
+    print(f"{len(full):,} matchs, {N_EDITIONS:,} éditions, {N_TEAMS} équipes\n")
+
+    print(f"{'éditions':>9} {'matchs':>10} {'boucle (s)':>11} {'EloRatings (s)':>15}")
+    for n_editions in LOOP_EDITIONS:
+        subset = full[full['edition'] < n_editions]
+
+        start = time.perf_counter()
+        expected = loop_elo(subset, hosts)
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        elo = EloRatings.from_matches(subset, hosts=hosts)
+        current = time.perf_counter() - start
+
+        ids = np.array(sorted(expected))
+        assert np.allclose(elo.ratings[ids], [expected[i] for i in ids], rtol=0, atol=1e-6)
+        print(f"{n_editions:>9,} {len(subset):>10,} {loop:11.3f} {current:15.3f}")
+
+    start = time.perf_counter()
+    elo = EloRatings.from_matches(full, hosts=hosts)
+    current = time.perf_counter() - start
+    print(f"{N_EDITIONS:>9,} {len(full):>10,} {'-':>11} {current:15.3f}")
+
+    # Ajout des dernières éditions à un classement calculé sans elles
+    cutoff = N_EDITIONS - APPENDED_EDITIONS
+    incremental = EloRatings.from_matches(full[full['edition'] < cutoff], hosts=hosts)
+    start = time.perf_counter()
+    incremental.update(full[full['edition'] >= cutoff])
+    appended = time.perf_counter() - start
+
+    assert np.allclose(incremental.ratings, elo.ratings, rtol=0, atol=1e-6)
+    print(f"\nAjout de {APPENDED_EDITIONS} éditions ({APPENDED_EDITIONS * MATCHES_PER_EDITION:,} matchs) "
+          f"à un classement existant : {appended * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark : coût de démarrage des modules de src.
+
+1. `python -X importtime` pour chaque point d'entrée : temps d'import
+   cumulé, nombre de modules chargés et présence de pandas/numpy.
+2. Pour src.teams_reference, mesures dans un processus Python neuf (médiane
+   de plusieurs exécutions) : import seul, puis premier accès à
+   CONFEDERATIONS avec le cache disque chaud, froid, et en repli sur le
+   CSV FIFA (JSON absent).
+
+Usage :
+    python benchmarks/bench_import_time.py [nombre_de_runs]
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+# Le code mesuré affiche sa durée en millisecondes sur stdout
+TIMED = """
+import time
+start = time.perf_counter()
+{setup}
+import src.teams_reference as ref
+{body}
+print((time.perf_counter() - start) * 1000)
+"""
+
+ENTRY_POINTS = [
+    "src.teams_constants",
+    "src.teams_reference",
+    "src.normalize_teams",
+    "src.cleaning",
+]
+
+HEAVY_PACKAGES = ("pandas", "numpy")
+
+SCENARIOS = {
+    "import seul": ("", ""),
+    "import + CONFEDERATIONS (cache chaud)": ("", "len(ref.CONFEDERATIONS)"),
+    "import + CONFEDERATIONS (cache froid)": (
+        "",
+        "ref.CONFEDERATIONS_DISK_CACHE.unlink(missing_ok=True); len(ref.CONFEDERATIONS)",
+    ),
+    "import + CONFEDERATIONS (repli CSV, cache froid)": (
+        "from pathlib import Path",
+        "ref.CONFEDERATIONS_CACHE = Path('/nonexistent.json');"
+        " ref.CONFEDERATIONS_DISK_CACHE = Path('/tmp/bench_confederations.marshal');"
+        " ref.CONFEDERATIONS_DISK_CACHE.unlink(missing_ok=True); len(ref.CONFEDERATIONS)",
+    ),
+}
+
+
+def importtime(module: str) -> tuple[float, list[str]]:
+    """
+    Exécute `python -X importtime -c "import <module>"`.
+
+    Returns:
+        Tuple (temps cumulé du module en ms, liste des modules importés)
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    ).stderr
+
+    cumulative_ms = 0.0
+    imported = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        imported.append(name)
+        if name == module:
+            cumulative_ms = int(cumulative) / 1000
+    return cumulative_ms, imported
+
+
+def run(setup: str, body: str, runs: int) -> float:
+    code = TIMED.format(setup=setup, body=body)
+    timings = [
+        float(subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout)
+        for _ in range(runs)
+    ]
+    return statistics.median(timings)
+
+
+def main(runs: int = 7) -> None:
+    print("python -X importtime")
+    print(f"{'module':<25} {'cumulé':>10} {'modules':>8}  lourds")
+    for module in ENTRY_POINTS:
+        cumulative_ms, imported = importtime(module)
+        heavy = [name for name in HEAVY_PACKAGES if name in imported]
+        print(f"{module:<25} {cumulative_ms:7.1f} ms {len(imported):>8}  {', '.join(heavy) or '-'}")
+
+    print("\nsrc.teams_reference (processus neuf, médiane)")
+    # Préchauffer le cache disque
+    run("", "len(ref.CONFEDERATIONS)", 1)
+    for label, (setup, body) in SCENARIOS.items():
+        print(f"{label:<50} {run(setup, body, runs):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 7)
@@ -0,0 +1,108 @@
+"""
+Benchmark : résolution des nuls en phase éliminatoire (notebook 04).
+
+Génère un historique synthétique de 10k éditions × 100 matchs (1M matchs) :
+84 matchs de poule puis un tableau final de 16 matchs (huitièmes → finale),
+dont une partie se termine sur un nul à départager. La version historique
+(apply ligne par ligne, refiltrage du DataFrame par nul) n'est mesurée que
+sur un sous-ensemble d'éditions, où l'équivalence des résultats est vérifiée ;
+resolve_knockout_results est mesuré sur le jeu complet.
+
+Usage :
+    python benchmarks/bench_knockout_results.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from legacy import legacy_apply_get_result
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from match_results import resolve_knockout_results
+
+N_EDITIONS = 10_000
+GROUP_MATCHES = 84
+N_TEAMS = 300
+DRAW_RATE = 0.3
+LEGACY_EDITIONS = [50, 200]
+BRACKET = [('Round of 16', 8), ('Quarter-finals', 4), ('Semi-finals', 2)]
+
+
+def synthetic_history(n_editions: int, seed: int = 0) -> pd.DataFrame:
+    """Historique synthétique : 100 matchs par édition, tableau final cohérent."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for edition in range(n_editions):
+        teams = rng.choice(N_TEAMS, 32, replace=False)
+        for _ in range(GROUP_MATCHES):
+            home, away = rng.choice(teams, 2, replace=False)
+            rows.append((edition, 'Group Stage', home, away, *rng.integers(0, 4, 2), False))
+
+        # Tableau : le vainqueur de chaque match passe au tour suivant
+        alive = list(teams[:16])
+        for round_name, n_matches in BRACKET:
+            winners, losers = [], []
+            for i in range(n_matches):
+                home, away = alive[2 * i], alive[2 * i + 1]
+                goals = rng.integers(0, 4)
+                if rng.random() < DRAW_RATE:
+                    score = (goals, goals)
+                else:
+                    score = (goals + 1, goals)
+                home_wins = rng.random() < 0.5 if score[0] == score[1] else True
+                winners.append(home if home_wins else away)
+                losers.append(away if home_wins else home)
+                rows.append((edition, round_name, home, away, *score, False))
+            alive = winners
+        rows.append((edition, 'Third Place', losers[0], losers[1], 1, 0, False))
+        rows.append((edition, 'Final', alive[0], alive[1], 2, 2, False))
+
+    matches = pd.DataFrame(rows, columns=[
+        'edition', 'round', 'home_team_id', 'away_team_id',
+        'home_result', 'away_result', 'replay',
+    ])
+    matches['result'] = np.select(
+        [matches['home_result'] > matches['away_result'],
+         matches['home_result'] < matches['away_result']],
+        ['home_team', 'away_team'],
+        default='draw',
+    )
+    return matches
+
+
+def main() -> None:
+    full = synthetic_history(N_EDITIONS)
+    n_draws = ((full['result'] == 'draw') & (full['round'] != 'Group Stage')).sum()
+    print(f"{len(full):,} matchs, {N_EDITIONS:,} éditions, {n_draws:,} nuls en phase éliminatoire\n")
+
+    print(f"{'éditions':>9} {'matchs':>10} {'historique (s)':>15} {'vectorisé (s)':>14}")
+    for n_editions in LEGACY_EDITIONS:
+        subset = full[full['edition'] < n_editions].reset_index(drop=True)
+
+        start = time.perf_counter()
+        expected = subset.apply(lambda row: legacy_apply_get_result(row, subset), axis=1)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = resolve_knockout_results(subset)
+        current = time.perf_counter() - start
+
+        assert result.equals(expected.rename('result'))
+        print(f"{n_editions:>9,} {len(subset):>10,} {legacy:15.3f} {current:14.3f}")
+
+    start = time.perf_counter()
+    result = resolve_knockout_results(full)
+    current = time.perf_counter() - start
+    print(f"{N_EDITIONS:>9,} {len(full):>10,} {'-':>15} {current:14.3f}")
+
+    remaining = ((result == 'draw') & (full['round'] != 'Group Stage')).sum()
+    print(f"\nNuls restants en phase éliminatoire : {remaining:,} (finales sans tour suivant)")
+
+
+if __name__ == "__main__":
+    main()
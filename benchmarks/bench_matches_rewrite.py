@@ -0,0 +1,96 @@
+"""
+Benchmark : réécriture de matches.csv lors de la fusion des équipes.
+
+Compare la lecture/écriture complète en mémoire (read_csv + to_csv) à la
+réécriture par morceaux de rewrite_matches_team_ids, sur un fichier de matchs
+synthétique. Mesure le temps et le pic mémoire (tracemalloc), ainsi que le
+pré-scan seul quand aucun ID à remapper n'apparaît dans le fichier.
+
+Usage :
+    python benchmarks/bench_matches_rewrite.py
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from normalize_teams import TeamIdRemapper, rewrite_matches_team_ids, matches_reference_ids
+
+N_MATCHES = [100_000, 500_000]
+N_TEAMS = 500
+MAPPING = {N_TEAMS - i: i for i in range(1, 21)}
+
+
+def write_synthetic_matches(path: Path, n_matches: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'id_match': np.arange(1, n_matches + 1),
+        'home_team_id': rng.integers(1, N_TEAMS, n_matches),
+        'away_team_id': rng.integers(1, N_TEAMS, n_matches),
+        'home_result': rng.integers(0, 6, n_matches),
+        'away_result': rng.integers(0, 6, n_matches),
+        'round': rng.choice(['Group Stage', 'Round of 16', 'Final'], n_matches),
+        'city': rng.choice(['Montevideo', 'Rome', 'Paris'], n_matches),
+        'edition': rng.integers(1930, 2023, n_matches),
+    }).to_csv(path, index=False)
+
+
+def in_memory_rewrite(path: Path) -> None:
+    matches = pd.read_csv(path)
+    TeamIdRemapper(MAPPING).remap(matches).to_csv(path, index=False)
+
+
+def measure(func, path: Path, *args) -> tuple[float, float]:
+    """Temps (sans traçage) puis pic mémoire (tracemalloc, ralentit l'exécution)."""
+    source = path.with_name("source.csv")
+
+    shutil.copy(source, path)
+    start = time.perf_counter()
+    func(*args, path)
+    elapsed = time.perf_counter() - start
+
+    shutil.copy(source, path)
+    tracemalloc.start()
+    func(*args, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main() -> None:
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        print(f"{'matchs':>10} {'mémoire (s)':>12} {'pic (Mo)':>9} "
+              f"{'flux (s)':>9} {'pic (Mo)':>9} {'pré-scan (s)':>13}")
+        for n_matches in N_MATCHES:
+            source = tmp_dir / "source.csv"
+            write_synthetic_matches(source, n_matches)
+
+            full_path = tmp_dir / "full.csv"
+            full_time, full_peak = measure(in_memory_rewrite, full_path)
+
+            stream_path = tmp_dir / "stream.csv"
+            stream_time, stream_peak = measure(rewrite_matches_team_ids, stream_path, MAPPING)
+
+            assert full_path.read_bytes() == stream_path.read_bytes()
+
+            start = time.perf_counter()
+            assert not matches_reference_ids({10 * N_TEAMS: 1}, source)
+            scan_time = time.perf_counter() - start
+
+            print(f"{n_matches:>10,} {full_time:12.3f} {full_peak:9.1f} "
+                  f"{stream_time:9.3f} {stream_peak:9.1f} {scan_time:13.3f}")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark : analyse des scores bruts de l'historique 1930-2010 (notebook 01b).
+
+Compare parse_score appliqué ligne par ligne (trois recherches regex et une
+Series par ligne) à parse_scores (un seul Series.str.extract avec un motif
+compilé), sur matches_19302010 (1).csv puis sur ce fichier répliqué.
+
+Les colonnes communes sont comparées à la sortie du notebook, à une exception
+près : le motif de détection des tirs au but du notebook contient un signe
+moins Unicode et ne détecte jamais rien, alors que parse_scores reconnaît le
+marqueur "(p.k.)".
+
+Usage :
+    python benchmarks/bench_parse_scores.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from legacy import legacy_parse_score
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cleaning import parse_scores
+
+RAW_CSV = Path(__file__).parent.parent / "data/raw/matches_19302010 (1).csv"
+REPLICATIONS = [1, 10, 100]
+LEGACY_MAX_REPLICATIONS = 10
+
+
+def check_equivalence(scores: pd.Series) -> None:
+    expected = scores.apply(legacy_parse_score)
+    result = parse_scores(scores)
+
+    for column in ['score_team1', 'score_team2']:
+        pd.testing.assert_series_equal(
+            result[column], expected[column].astype('Int64'), check_names=False
+        )
+    for column in ['extra_time', 'replay']:
+        assert (result[column] == expected[column].astype(bool)).all(), column
+
+    assert not expected['penalty_shootout'].any()
+    assert result['penalty_shootout'].equals(
+        scores.astype(str).str.contains('(p.k.)', regex=False).astype('boolean')
+    )
+    print(f"Équivalence vérifiée sur {len(scores):,} scores "
+          f"({int(result['penalty_shootout'].sum())} tirs au but détectés)\n")
+
+
+def main() -> None:
+    raw_scores = pd.read_csv(RAW_CSV)['score']
+    check_equivalence(raw_scores)
+
+    print(f"{'lignes':>10} {'apply (s)':>10} {'extract (s)':>12} {'gain':>7}")
+    for replications in REPLICATIONS:
+        scores = pd.concat([raw_scores] * replications, ignore_index=True)
+
+        start = time.perf_counter()
+        parse_scores(scores)
+        current = time.perf_counter() - start
+
+        if replications <= LEGACY_MAX_REPLICATIONS:
+            start = time.perf_counter()
+            scores.apply(legacy_parse_score)
+            legacy = time.perf_counter() - start
+            print(f"{len(scores):>10,} {legacy:10.3f} {current:12.3f} {legacy / current:6.1f}x")
+        else:
+            print(f"{len(scores):>10,} {'-':>10} {current:12.3f} {'-':>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark : conversion des colonnes de pourcentages (notebook 03).
+
+Compare clean_percentage appliqué cellule par cellule à clean_percentages
+(une seule passe str.rstrip / to_numeric sur toutes les colonnes) sur un flux
+de statistiques synthétique à plusieurs dizaines de colonnes "NN%".
+
+Usage :
+    python benchmarks/bench_percentages.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cleaning import clean_percentage, clean_percentages
+
+N_COLUMNS = 40
+SIZES = [1_000, 10_000, 100_000]
+
+
+def synthetic_stats(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        f"stat {i}": [f"{value}%" for value in rng.integers(0, 101, n_rows)]
+        for i in range(N_COLUMNS)
+    })
+
+
+def main() -> None:
+    print(f"{N_COLUMNS} colonnes de pourcentages\n")
+    print(f"{'lignes':>10} {'apply (s)':>10} {'une passe (s)':>14} {'gain':>7}")
+    for n_rows in SIZES:
+        stats = synthetic_stats(n_rows)
+        columns = list(stats.columns)
+
+        start = time.perf_counter()
+        expected = stats.copy()
+        for column in columns:
+            expected[column] = expected[column].apply(clean_percentage)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result, invalid = clean_percentages(stats, columns)
+        current = time.perf_counter() - start
+
+        assert not invalid.to_numpy().any()
+        np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy(dtype=np.float32))
+        print(f"{n_rows:>10,} {legacy:10.3f} {current:14.3f} {legacy / current:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
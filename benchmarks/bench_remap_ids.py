@@ -0,0 +1,69 @@
+"""
+Benchmark : remappage des IDs d'équipes fusionnées dans matches.csv.
+
+Compare la boucle historique (deux comparaisons et deux replace par ancien ID)
+à TeamIdRemapper (tableau de correspondance + un seul bincount), sur une table
+de matchs synthétique dont on fait varier la taille et le nombre d'IDs fusionnés.
+
+Usage :
+    python benchmarks/bench_remap_ids.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from legacy import legacy_remap_team_ids
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from normalize_teams import TeamIdRemapper
+
+N_TEAMS = 500
+SCENARIOS = [
+    (100_000, 10),
+    (100_000, 100),
+    (1_000_000, 10),
+    (1_000_000, 100),
+]
+
+
+def synthetic_matches(n_matches: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'home_team_id': rng.integers(1, N_TEAMS, n_matches),
+        'away_team_id': rng.integers(1, N_TEAMS, n_matches),
+    })
+
+
+def synthetic_mapping(n_merged: int) -> dict:
+    return {N_TEAMS - i: i + 1 for i in range(1, n_merged + 1)}
+
+
+def main() -> None:
+    print(f"{'matchs':>10} {'IDs':>5} {'historique (s)':>15} {'remapper (s)':>13} {'gain':>7}")
+    for n_matches, n_merged in SCENARIOS:
+        matches = synthetic_matches(n_matches)
+        mapping = synthetic_mapping(n_merged)
+
+        start = time.perf_counter()
+        expected, expected_report = legacy_remap_team_ids(matches, mapping)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        remapper = TeamIdRemapper(mapping)
+        result = remapper.remap(matches)
+        report = remapper.report()
+        current = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert report == expected_report
+
+        print(f"{n_matches:>10,} {n_merged:>5} {legacy:15.3f} {current:13.3f} {legacy / current:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
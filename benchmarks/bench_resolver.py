@@ -0,0 +1,82 @@
+"""
+Benchmark : résolveur précompilé vs cascade historique de normalize_team_name.
+
+Usage :
+    python benchmarks/bench_resolver.py [nombre_d_appels]
+"""
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+from legacy import legacy_normalize_team_name
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR / "src"))
+
+from teams_constants import ALIASES_MAPPING, PLACEHOLDERS
+from teams_reference import CONFEDERATIONS, TeamNameResolver
+
+
+def build_corpus() -> list:
+    """
+    Construit un corpus réaliste de noms bruts : noms des fichiers sources,
+    constantes, et variantes (casse, espaces, noms inconnus).
+    """
+    raw = pd.read_csv(BASE_DIR / "data/raw/matches_19302010 (1).csv")
+    names = set(raw["team1"]) | set(raw["team2"])
+
+    teams = pd.read_csv(BASE_DIR / "data/processed/teams.csv")
+    names |= set(teams["nom_standard"])
+
+    with open(BASE_DIR / "data/raw/data_2018.json", encoding="utf-8") as f:
+        names |= {team["name"] for team in json.load(f)["teams"]}
+
+    names |= set(CONFEDERATIONS) | set(ALIASES_MAPPING) | set(PLACEHOLDERS)
+
+    variants = set()
+    for name in names:
+        variants.update({name.upper(), name.lower(), f"  {name} "})
+    variants.update({"Unknown Team", "Atlantis", "ETHIOPIA (x)", "Armenia (?)"})
+
+    return sorted(names | variants)
+
+
+def main(calls: int = 1_000_000) -> None:
+    corpus = build_corpus()
+    confederations_lower = {k.lower(): k for k in CONFEDERATIONS}
+    resolver = TeamNameResolver(CONFEDERATIONS)
+
+    # Équivalence sur le vocabulaire connu (les variantes peuvent différer :
+    # la forme canonique NFKC/casefold et le trie sont plus tolérants)
+    mismatches = [
+        name for name in corpus
+        if legacy_normalize_team_name(name, confederations_lower) != resolver.resolve(name)
+    ]
+    print(f"Corpus : {len(corpus)} noms, {len(mismatches)} divergence(s)")
+    for name in mismatches:
+        print(f"  {name!r}: {legacy_normalize_team_name(name, confederations_lower)!r}"
+              f" -> {resolver.resolve(name)!r}")
+
+    stream = (corpus * (calls // len(corpus) + 1))[:calls]
+
+    legacy_time = min(timeit.repeat(
+        lambda: [legacy_normalize_team_name(n, confederations_lower) for n in stream],
+        number=1, repeat=3,
+    ))
+    resolver_time = min(timeit.repeat(
+        lambda: [resolver.resolve(n) for n in stream],
+        number=1, repeat=3,
+    ))
+
+    print(f"\n{calls:,} appels")
+    print(f"  cascade historique : {legacy_time:.3f} s")
+    print(f"  résolveur          : {resolver_time:.3f} s")
+    print(f"  accélération       : x{legacy_time / resolver_time:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,70 @@
+"""
+Benchmark : normalisation des libellés de tours.
+
+Compare clean_round (notebook 01b) appliqué ligne par ligne à
+clean_round_names (une analyse par libellé distinct, diffusion par codes de
+catégorie) sur les libellés de matches_19302010 (1).csv, répliqués jusqu'à
+plusieurs millions de lignes. Mesure aussi un groupby sur le Categorical
+obtenu par rapport au même groupby sur les chaînes.
+
+Usage :
+    python benchmarks/bench_round_names.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from legacy import legacy_clean_round
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cleaning import clean_round_names
+
+RAW_CSV = Path(__file__).parent.parent / "data/raw/matches_19302010 (1).csv"
+REPLICATIONS = [1, 10, 100, 1000]
+LEGACY_MAX_REPLICATIONS = 100
+
+
+def main() -> None:
+    raw_rounds = pd.read_csv(RAW_CSV)['round']
+
+    expected = raw_rounds.apply(legacy_clean_round)
+    result = clean_round_names(raw_rounds)
+    assert (result.astype(object) == expected).all()
+    print(f"Équivalence avec clean_round vérifiée sur {len(raw_rounds):,} libellés\n")
+
+    print(f"{'lignes':>10} {'apply (s)':>10} {'catégoriel (s)':>15} "
+          f"{'groupby str (s)':>16} {'groupby cat (s)':>16}")
+    for replications in REPLICATIONS:
+        rounds = pd.concat([raw_rounds] * replications, ignore_index=True)
+        goals = np.ones(len(rounds))
+
+        start = time.perf_counter()
+        categorical = clean_round_names(rounds)
+        current = time.perf_counter() - start
+
+        legacy_str = f"{'-':>10}"
+        if replications <= LEGACY_MAX_REPLICATIONS:
+            start = time.perf_counter()
+            strings = rounds.apply(legacy_clean_round)
+            legacy_str = f"{time.perf_counter() - start:10.3f}"
+        else:
+            strings = categorical.astype(object)
+
+        start = time.perf_counter()
+        pd.Series(goals).groupby(strings).sum()
+        group_str = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pd.Series(goals).groupby(categorical, observed=False).sum()
+        group_cat = time.perf_counter() - start
+
+        print(f"{len(rounds):>10,} {legacy_str} {current:15.3f} {group_str:16.3f} {group_cat:16.3f}")
+
+
+if __name__ == "__main__":
+    main()
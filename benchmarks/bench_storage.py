@@ -0,0 +1,149 @@
+"""
+Benchmark : stockage des tables traitées en CSV vs Parquet.
+
+Compare, pour matches.csv et teams_traitees.csv de data/processed, le temps
+d'écriture, le temps de lecture (avec les types rétablis : dates, booléens,
+IDs) et la taille sur disque du CSV, d'un fichier Parquet et du dataset
+Parquet partitionné par édition. La table des matchs est aussi répliquée
+(mêmes éditions, partitions plus grosses) pour mesurer le comportement à
+plus grande échelle.
+
+Usage :
+    python benchmarks/bench_storage.py
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from storage import (
+    read_matches_parquet,
+    read_teams_parquet,
+    write_matches_parquet,
+    write_teams_parquet,
+)
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data/processed"
+REPLICAS = [1, 10, 100]
+REPEAT = 3
+
+
+def replicate(matches: pd.DataFrame, replicas: int) -> pd.DataFrame:
+    """Réplique la table dans les mêmes éditions (plusieurs compétitions par année)."""
+    result = pd.concat([matches] * replicas, ignore_index=True)
+    result['id_match'] = range(1, len(result) + 1)
+    return result
+
+
+def size_of(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+    return path.stat().st_size
+
+
+def best_of(func) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def read_matches_csv(path: Path) -> pd.DataFrame:
+    """Lecture CSV avec les types rétablis, comme le fait chaque étape."""
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def report(label: str, rows: int, results: list) -> None:
+    print(f"\n{label} ({rows:,} lignes)")
+    print(f"  {'format':<22} {'écriture (s)':>12} {'lecture (s)':>12} {'taille (Ko)':>12}")
+    for name, write_time, read_time, size in results:
+        print(f"  {name:<22} {write_time:12.4f} {read_time:12.4f} {size / 1024:12.1f}")
+
+
+def bench_matches(matches: pd.DataFrame, tmp_dir: Path) -> list:
+    csv_path = tmp_dir / "matches.csv"
+    file_path = tmp_dir / "matches_file.parquet"
+    dataset_path = tmp_dir / "matches.parquet"
+
+    results = [
+        (
+            "CSV",
+            best_of(lambda: matches.to_csv(csv_path, index=False)),
+            best_of(lambda: read_matches_csv(csv_path)),
+            size_of(csv_path),
+        ),
+        (
+            "Parquet (fichier)",
+            best_of(lambda: write_matches_parquet(matches, file_path, partitioned=False)),
+            best_of(lambda: read_matches_parquet(file_path)),
+            size_of(file_path),
+        ),
+        (
+            "Parquet (par édition)",
+            best_of(lambda: write_matches_parquet(matches, dataset_path)),
+            best_of(lambda: read_matches_parquet(dataset_path)),
+            size_of(dataset_path),
+        ),
+    ]
+
+    # Équivalence des données relues
+    expected = matches.reset_index(drop=True)
+    for path in [file_path, dataset_path]:
+        df = read_matches_parquet(path)
+        assert df['id_match'].tolist() == expected['id_match'].tolist()
+        assert (df['home_team_id'].to_numpy() == expected['home_team_id'].to_numpy()).all()
+        assert df['round'].astype(str).tolist() == expected['round'].astype(str).tolist()
+
+    one_edition = best_of(lambda: read_matches_parquet(dataset_path, editions=[2018]))
+    results.append(("Parquet (1 édition)", float('nan'), one_edition, size_of(dataset_path / "edition=2018")))
+    return results
+
+
+def main() -> None:
+    matches = pd.read_csv(PROCESSED_DIR / "matches.csv")
+    teams = pd.read_csv(PROCESSED_DIR / "teams_traitees.csv")
+
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        for replicas in REPLICAS:
+            table = replicate(matches, replicas)
+            report(f"matches x{replicas}", len(table), bench_matches(table, tmp_dir))
+
+        csv_path = tmp_dir / "teams.csv"
+        parquet_path = tmp_dir / "teams.parquet"
+        report("teams_traitees", len(teams), [
+            (
+                "CSV",
+                best_of(lambda: teams.to_csv(csv_path, index=False)),
+                best_of(lambda: pd.read_csv(csv_path)),
+                size_of(csv_path),
+            ),
+            (
+                "Parquet (fichier)",
+                best_of(lambda: write_teams_parquet(teams, parquet_path)),
+                best_of(lambda: read_teams_parquet(parquet_path)),
+                size_of(parquet_path),
+            ),
+        ])
+
+        memory_csv = read_matches_csv(PROCESSED_DIR / "matches.csv").memory_usage(deep=True).sum()
+        write_matches_parquet(matches, tmp_dir / "m.parquet")
+        memory_parquet = read_matches_parquet(tmp_dir / "m.parquet").memory_usage(deep=True).sum()
+        print(f"\nMémoire de la table des matchs : CSV {memory_csv / 1024:,.0f} Ko, "
+              f"Parquet {memory_parquet / 1024:,.0f} Ko ({memory_csv / memory_parquet:.1f}x)")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Implémentations de référence (avant optimisation) utilisées par les benchmarks.
+
+Chaque fonction reproduit à l'identique le code remplacé, afin de vérifier
+l'équivalence des résultats et de mesurer le gain de performance.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from match_results import FINALS_PENALTY_WINNERS, GROUP_ROUNDS, WINNER_ROUND_MAP, LOSER_ROUND_MAP
+from teams_constants import ALIASES_MAPPING, ALIASES_MAPPING_LOWER, PLACEHOLDERS
+
+
+def legacy_normalize_team_name(raw_name, confederations_lower: dict):
+    """Cascade de recherches de teams_reference.normalize_team_name."""
+    if pd.isna(raw_name):
+        return None
+
+    name = str(raw_name).strip()
+
+    if name in PLACEHOLDERS:
+        return None
+
+    if name.lower() in ALIASES_MAPPING_LOWER:
+        return ALIASES_MAPPING_LOWER[name.lower()]
+
+    if name in ALIASES_MAPPING:
+        return ALIASES_MAPPING[name]
+
+    if name.lower() in confederations_lower:
+        return confederations_lower[name.lower()]
+
+    if name.startswith("Ethiopia ("):
+        return "Ethiopia"
+
+    if name.startswith("Ivory Coast (Côte d"):
+        return "Côte d'Ivoire"
+
+    if name.startswith("Armenia ("):
+        return "Armenia"
+
+    return name
+
+
+def legacy_get_aliases(team_name: str, aliases_mapping: dict) -> list:
+    """Parcours complet de ALIASES_MAPPING de teams_reference.get_aliases."""
+    aliases = []
+    for alias, standard in aliases_mapping.items():
+        if standard == team_name:
+            aliases.append(alias)
+    return aliases
+
+
+def legacy_build_teams_reference(confederations: dict, aliases_mapping: dict) -> dict:
+    """teams_reference.build_teams_reference avec get_aliases en O(aliases)."""
+    return {
+        team_name: {
+            "confederation": confederation,
+            "aliases": legacy_get_aliases(team_name, aliases_mapping),
+        }
+        for team_name, confederation in confederations.items()
+    }
+
+
+def legacy_remap_team_ids(matches_df: pd.DataFrame, id_mapping: dict) -> tuple[pd.DataFrame, list]:
+    """Boucle historique de normalize_teams : deux comparaisons et deux replace par ID."""
+    matches_df = matches_df.copy()
+    report = []
+    for old_id, new_id in id_mapping.items():
+        count_home = (matches_df['home_team_id'] == old_id).sum()
+        count_away = (matches_df['away_team_id'] == old_id).sum()
+
+        matches_df['home_team_id'] = matches_df['home_team_id'].replace(old_id, new_id)
+        matches_df['away_team_id'] = matches_df['away_team_id'].replace(old_id, new_id)
+
+        report.append((old_id, new_id, int(count_home), int(count_away)))
+    return matches_df, report
+
+
+# Notebook 04 : résolution ligne par ligne des nuls en phase éliminatoire
+
+
+def legacy_find_winner_from_next_round(row, df_full):
+    """Trouve le vainqueur en vérifiant qui apparaît au tour suivant"""
+    edition = row['edition']
+    team1 = row['home_team_id']
+    team2 = row['away_team_id']
+    current_round = row['round']
+
+    if current_round in WINNER_ROUND_MAP:
+        next_round = WINNER_ROUND_MAP[current_round]
+        next_matches = df_full[(df_full['edition'] == edition) & (df_full['round'] == next_round)]
+        teams_in_next = set(next_matches['home_team_id'].tolist() + next_matches['away_team_id'].tolist())
+
+        if team1 in teams_in_next and team2 not in teams_in_next:
+            return 'home_team'
+        elif team2 in teams_in_next and team1 not in teams_in_next:
+            return 'away_team'
+
+    if current_round in LOSER_ROUND_MAP:
+        loser_round = LOSER_ROUND_MAP[current_round]
+        loser_matches = df_full[(df_full['edition'] == edition) & (df_full['round'] == loser_round)]
+        teams_in_loser = set(loser_matches['home_team_id'].tolist() + loser_matches['away_team_id'].tolist())
+
+        if team1 in teams_in_loser and team2 not in teams_in_loser:
+            return 'away_team'
+        elif team2 in teams_in_loser and team1 not in teams_in_loser:
+            return 'home_team'
+
+    return None
+
+
+def legacy_get_result(row, df_full):
+    """Détermine le résultat du match"""
+    score1 = row['home_result']
+    score2 = row['away_result']
+    round_name = row['round']
+    edition = row['edition']
+    team1 = row['home_team_id']
+    team2 = row['away_team_id']
+
+    if score1 > score2:
+        return 'home_team'
+    elif score1 < score2:
+        return 'away_team'
+
+    if round_name in GROUP_ROUNDS:
+        return 'draw'
+
+    if row.get('replay', False):
+        return 'draw'
+
+    if round_name == 'Final' and edition in FINALS_PENALTY_WINNERS:
+        winner = FINALS_PENALTY_WINNERS[edition]
+        if team1 == winner:
+            return 'home_team'
+        elif team2 == winner:
+            return 'away_team'
+
+    winner = legacy_find_winner_from_next_round(row, df_full)
+    if winner:
+        return winner
+
+    return 'draw'
+
+
+def legacy_apply_get_result(row, df_full):
+    """Applique get_result seulement si nécessaire"""
+    current_result = row['result']
+    round_name = row['round']
+
+    if current_result != 'draw':
+        return current_result
+
+    if round_name in GROUP_ROUNDS:
+        return 'draw'
+
+    if row.get('replay', False):
+        return 'draw'
+
+    return legacy_get_result(row, df_full)
+
+
+# Notebook 01b : analyse ligne par ligne des scores bruts
+
+
+def legacy_parse_score(score):
+    score = str(score)
+
+    # Détecter prolongation et replay
+    extra_time = '(a.e.t.)' in score or 'aet' in score.lower()
+    replay = '(r.)' in score
+    penalty = bool(re.search(r'\d+−\d+\d+-\d+', score) and ('p' in score.lower() or 'pso' in score.lower()))
+
+    # Extraire le score final (premier pattern X-X)
+    match = re.match(r'(\d+)-(\d+)', score)
+    if match:
+        score_team1 = int(match.group(1))
+        score_team2 = int(match.group(2))
+    else:
+        score_team1 = None
+        score_team2 = None
+
+    return pd.Series({
+        'score_team1': score_team1,
+        'score_team2': score_team2,
+        'extra_time': extra_time,
+        'penalty_shootout': penalty,
+        'replay': replay
+    })
+
+
+# Normalisation des rounds : notebook 01b (clean_round) et cleaning.clean_round_name
+def legacy_clean_round(r):
+    r = str(r).replace('_', ' ').strip().upper()
+
+    if 'PRELIMINARY' in r:
+        return 'Preliminary'
+    elif 'GROUP STAGE' in r or r == 'GROUP':
+        return 'Group Stage'
+    elif 'FINAL ROUND' in r or 'SEMIFINAL STAGE' in r or 'QUARTERFINAL STAGE' in r:
+        return 'Second Group Stage'
+    elif '1/8' in r or r == 'FIRST':
+        return 'Round of 16'
+    elif '1/4' in r:
+        return 'Quarter-finals'
+    elif '1/2' in r:
+        return 'Semi-finals'
+    elif 'PLACES' in r or '3&4' in r or '3RD' in r or 'THIRD' in r:
+        return 'Third Place'
+    elif 'FINAL' in r:
+        return 'Final'
+    else:
+        return r
+
+
+def legacy_clean_round_name(r_raw):
+    r = str(r_raw).upper().strip()
+
+    if 'PRELIMINARY' in r or 'FIRST' in r: return 'Preliminary'
+    if 'GROUP' in r: return 'Group Stage'
+    if '1/8' in r or 'ROUND OF 16' in r: return 'Round of 16'
+    if '1/4' in r or 'QUARTER' in r: return 'Quarter-finals'
+    if '1/2' in r or 'SEMI' in r: return 'Semi-final'
+    if '3RD' in r or 'THIRD' in r or 'PLAY-OFF' in r: return 'Third Place'
+    if 'FINAL' in r: return 'Final'
+
+    return r_raw
+
+
+# Requêtes des notebooks 08 et 09 avant team_match (jointures OR sur matches),
+# mêmes colonnes et même ordre que leurs équivalents de stats.STATS_QUERIES
+LEGACY_QUERIES = {
+    'matches_played': """
+        SELECT t.nom_standard AS equipe, COUNT(*) AS matchs
+        FROM teams t
+        JOIN matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+        WHERE m.round != 'Preliminary'
+        GROUP BY t.nom_standard
+        ORDER BY matchs DESC, equipe
+        LIMIT 15
+    """,
+    'wins': """
+        SELECT t.nom_standard AS equipe, COUNT(*) AS victoires
+        FROM matches m
+        JOIN teams t ON (
+            (m.result = 'home_team' AND m.home_team_id = t.id_team) OR
+            (m.result = 'away_team' AND m.away_team_id = t.id_team)
+        )
+        GROUP BY t.nom_standard
+        ORDER BY victoires DESC, equipe
+        LIMIT 15
+    """,
+    'confederations': """
+        SELECT
+            t.confederation,
+            COUNT(DISTINCT t.id_team) AS nb_equipes,
+            COUNT(*) AS matchs_joues
+        FROM teams t
+        JOIN matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+        WHERE t.confederation IS NOT NULL
+        GROUP BY t.confederation
+        ORDER BY matchs_joues DESC
+    """,
+    'knockout': """
+        WITH knockout_matches AS (
+            SELECT
+                t.nom_standard,
+                m.round,
+                CASE
+                    WHEN (m.home_team_id = t.id_team AND m.result = 'home_team')
+                         OR (m.away_team_id = t.id_team AND m.result = 'away_team') THEN 1
+                    ELSE 0
+                END AS win,
+                m.penalties
+            FROM teams t
+            JOIN matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+            WHERE m.round IN ('Round of 16', 'Quarter-finals', 'Semi-finals', 'Third Place', 'Final')
+        )
+        SELECT
+            nom_standard AS equipe,
+            SUM(CASE WHEN round = 'Round of 16' THEN 1 ELSE 0 END) AS r16_matchs,
+            SUM(CASE WHEN round = 'Round of 16' AND win = 1 THEN 1 ELSE 0 END) AS r16_wins,
+            SUM(CASE WHEN round = 'Quarter-finals' THEN 1 ELSE 0 END) AS qf_matchs,
+            SUM(CASE WHEN round = 'Quarter-finals' AND win = 1 THEN 1 ELSE 0 END) AS qf_wins,
+            SUM(CASE WHEN round = 'Semi-finals' THEN 1 ELSE 0 END) AS sf_matchs,
+            SUM(CASE WHEN round = 'Semi-finals' AND win = 1 THEN 1 ELSE 0 END) AS sf_wins,
+            SUM(CASE WHEN round = 'Final' THEN 1 ELSE 0 END) AS finales,
+            SUM(CASE WHEN round = 'Final' AND win = 1 THEN 1 ELSE 0 END) AS titres,
+            COUNT(*) AS total_knockout,
+            SUM(win) AS total_wins,
+            ROUND(100.0 * SUM(win) / COUNT(*), 1) AS knockout_win_rate,
+            SUM(CASE WHEN penalties THEN 1 ELSE 0 END) AS tirs_au_but
+        FROM knockout_matches
+        GROUP BY nom_standard
+        HAVING COUNT(*) >= 5
+        ORDER BY titres DESC, knockout_win_rate DESC, equipe
+        LIMIT 20
+    """,
+    'draws': """
+        SELECT
+            t.nom_standard AS equipe,
+            COUNT(*) AS total_matchs,
+            SUM(CASE WHEN m.result = 'draw' THEN 1 ELSE 0 END) AS nuls,
+            ROUND(100.0 * SUM(CASE WHEN m.result = 'draw' THEN 1 ELSE 0 END) / COUNT(*), 1) AS pct_nuls,
+            SUM(CASE WHEN m.result = 'draw' AND m.home_result = 0 THEN 1 ELSE 0 END) AS nuls_0_0,
+            SUM(CASE WHEN m.result = 'draw' AND m.home_result > 0 THEN 1 ELSE 0 END) AS nuls_avec_buts
+        FROM teams t
+        JOIN matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+        WHERE m.round != 'Preliminary'
+        GROUP BY t.nom_standard
+        HAVING COUNT(*) >= 10
+        ORDER BY pct_nuls DESC, equipe
+        LIMIT 20
+    """,
+}
@@ -0,0 +1,640 @@
+"""
+Moteur d'analyse en mémoire, sans base de données.
+
+Les notebooks 08 et 09 interrogent PostgreSQL pour chaque question, alors
+que quelques dizaines de milliers de matchs tiennent en quelques tableaux
+NumPy : l'aller-retour coûte plus que le calcul. Ce module charge une fois
+les tables traitées (Parquet, sinon CSV) et répond aux requêtes de
+stats.STATS_QUERIES par des agrégations vectorisées sur les IDs d'équipes :
+
+    from src.analytics import get_analytics
+    analytics = get_analytics()
+    analytics.query('head_to_head', {'team1': 'France', 'team2': 'Brazil'})
+
+Les résultats ont les colonnes, l'ordre et les arrondis des requêtes SQL
+(matchs Preliminary exclus, sauf pour la répartition par confédération,
+comme dans les requêtes).
+"""
+
+import os
+from pathlib import Path
+
+try:
+    from .cleaning import ROUND_STAGES
+    from .schema import RESULT_VALUES, coerce_matches, coerce_teams
+    from .stats import ROUND_RANKS
+    from .storage import PROCESSED_DIR, read_matches_parquet, read_teams_parquet
+except ImportError:
+    from cleaning import ROUND_STAGES
+    from schema import RESULT_VALUES, coerce_matches, coerce_teams
+    from stats import ROUND_RANKS
+    from storage import PROCESSED_DIR, read_matches_parquet, read_teams_parquet
+
+# Colonnes des matchs utilisées par le moteur
+ANALYTICS_COLUMNS = [
+    'id_match', 'home_team_id', 'away_team_id', 'home_result', 'away_result',
+    'result', 'extra_time', 'penalties', 'date', 'round', 'edition',
+]
+
+# Agrégats par (équipe, édition), dans l'ordre des tableaux de MatchAnalytics
+EDITION_MEASURES = [
+    'matches', 'wins', 'draws', 'losses', 'goals_for', 'goals_against',
+    'clean_sheets', 'extra_time_matches', 'penalty_matches', 'finals', 'titles',
+]
+
+HOME, AWAY, DRAW = (RESULT_VALUES.index(value) for value in ('home_team', 'away_team', 'draw'))
+PRELIMINARY = ROUND_STAGES.index('Preliminary')
+FINAL = ROUND_STAGES.index('Final')
+
+
+# Champs de chaque case (a, b) de la matrice des confrontations, vus de a.
+# Les trois derniers décrivent la dernière rencontre (-1 : jamais rencontrés,
+# ou date inconnue), la plus récente selon (édition, id_match).
+HEAD_TO_HEAD_FIELDS = [
+    'matches', 'wins', 'draws', 'losses', 'goals_for', 'goals_against',
+    'extra_time_matches', 'penalty_matches', 'last_edition', 'last_id_match', 'last_date',
+]
+
+HEAD_TO_HEAD_NPY = PROCESSED_DIR / "head_to_head.npy"
+
+_COUNTS = HEAD_TO_HEAD_FIELDS.index('last_edition')
+_LAST_EDITION, _LAST_ID_MATCH, _LAST_DATE = range(_COUNTS, len(HEAD_TO_HEAD_FIELDS))
+
+
+def _codes(series, categories):
+    """Codes d'une colonne dans la liste de catégories (-1 si absente)."""
+    import numpy as np
+    import pandas as pd
+
+    values = series.astype(object).to_numpy()
+    return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+
+def _sql_ratio(numerator, denominator, scale: int):
+    """
+    ROUND(1.0 * numerator / denominator, décimales) en arithmétique entière.
+
+    Arrondi au demi supérieur comme PostgreSQL, sans l'erreur de
+    représentation d'une division flottante suivie d'un arrondi.
+
+    Args:
+        numerator: Tableau d'entiers positifs
+        denominator: Tableau d'entiers strictement positifs
+        scale: 10 ** décimales (100 pour 2 décimales)
+    """
+    return (2 * numerator * scale + denominator) // (2 * denominator) / scale
+
+
+class HeadToHeadMatrix:
+    """
+    Matrice dense des confrontations (ID d'équipe × ID d'équipe × champ).
+
+    La case (a, b) contient le bilan de a contre b (HEAD_TO_HEAD_FIELDS) et
+    la case (b, a) le même bilan vu de b : une confrontation se lit par
+    simple indexation, sans recherche ni jointure. La matrice est construite
+    en une passe sur les tableaux des matchs (hors Preliminary, comme
+    pair_edition_stats), mise à jour par append() quand des matchs
+    s'ajoutent, et persistée en .npy ouvert en mémoire mappée.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @property
+    def size(self) -> int:
+        """Nombre d'IDs d'équipe couverts (plus grande ID + 1)."""
+        return self.cells.shape[0]
+
+    @classmethod
+    def empty(cls, size: int):
+        """Matrice sans aucune confrontation, pour les IDs 0 à size - 1."""
+        import numpy as np
+
+        cells = np.zeros((size, size, len(HEAD_TO_HEAD_FIELDS)), dtype=np.int32)
+        cells[:, :, _COUNTS:] = -1
+        return cls(cells)
+
+    @classmethod
+    def from_matches(cls, matches, size: int = None):
+        """
+        Construit la matrice à partir de la table des matchs.
+
+        Args:
+            matches: Matchs avec id_match, home_team_id, away_team_id,
+                home_result, away_result, result, extra_time, penalties,
+                date, round et edition
+            size: Nombre d'IDs d'équipe couverts (défaut : plus grande ID + 1)
+
+        Returns:
+            Instance de HeadToHeadMatrix
+        """
+        matrix = cls.empty(size or 0)
+        matrix.append(matches)
+        return matrix
+
+    @classmethod
+    def load(cls, path: Path = HEAD_TO_HEAD_NPY, mmap_mode: str = 'r'):
+        """
+        Ouvre une matrice persistée par save(), en mémoire mappée.
+
+        Seules les cases lues sont chargées depuis le disque. Avec
+        mmap_mode='r+', append() modifie le fichier en place (tant que
+        les IDs des nouveaux matchs restent dans la matrice) ; en 'r',
+        append() lève ValueError.
+
+        Args:
+            path: Fichier .npy
+            mmap_mode: Mode d'ouverture ('r' lecture seule, 'r+' mise à jour)
+
+        Returns:
+            Instance de HeadToHeadMatrix
+        """
+        import numpy as np
+
+        return cls(np.load(path, mmap_mode=mmap_mode))
+
+    def save(self, path: Path = HEAD_TO_HEAD_NPY) -> Path:
+        """
+        Écrit la matrice en .npy (fichier temporaire puis remplacement).
+
+        Args:
+            path: Fichier de sortie
+
+        Returns:
+            Chemin écrit
+        """
+        import numpy as np
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(self.cells))
+        os.replace(tmp_path, path)
+        return path
+
+    def _grow(self, size: int) -> None:
+        """Agrandit la matrice (en mémoire) pour couvrir les IDs jusqu'à size - 1."""
+        grown = HeadToHeadMatrix.empty(size).cells
+        grown[:self.size, :self.size] = self.cells
+        self.cells = grown
+
+    def append(self, matches) -> None:
+        """
+        Ajoute des matchs au bilan, sans reparcourir les matchs déjà comptés.
+
+        Chaque match est compté à chaque appel : ne passer que des matchs
+        absents de la matrice. Si un match fait intervenir une ID hors de la
+        matrice, celle-ci est agrandie en mémoire (save() pour la persister).
+
+        Args:
+            matches: Nouveaux matchs (mêmes colonnes que from_matches)
+
+        Raises:
+            ValueError: Si la matrice est en lecture seule (load() en
+                mmap_mode='r')
+        """
+        import numpy as np
+
+        if not self.cells.flags.writeable:
+            raise ValueError(
+                "Matrice des confrontations en lecture seule : l'ouvrir avec "
+                "HeadToHeadMatrix.load(path, mmap_mode='r+') pour la mettre à jour"
+            )
+
+        matches = matches[matches['round'].astype(object) != 'Preliminary']
+        if matches.empty:
+            return
+
+        home = matches['home_team_id'].to_numpy(dtype=np.int64)
+        away = matches['away_team_id'].to_numpy(dtype=np.int64)
+        size = int(max(home.max(), away.max())) + 1
+        if size > self.size:
+            self._grow(size)
+
+        # Deux entrées par match : (domicile, extérieur) puis (extérieur, domicile)
+        home_goals = matches['home_result'].to_numpy(dtype=np.int64)
+        away_goals = matches['away_result'].to_numpy(dtype=np.int64)
+        result = _codes(matches['result'], RESULT_VALUES)
+        team = np.concatenate([home, away])
+        opponent = np.concatenate([away, home])
+        won = np.concatenate([result == HOME, result == AWAY])
+        lost = np.concatenate([result == AWAY, result == HOME])
+        counts = [
+            np.ones(len(team), dtype=np.int64),
+            won,
+            np.tile(result == DRAW, 2),
+            lost,
+            np.concatenate([home_goals, away_goals]),
+            np.concatenate([away_goals, home_goals]),
+            np.tile(matches['extra_time'].to_numpy(dtype=bool, na_value=False), 2),
+            np.tile(matches['penalties'].to_numpy(dtype=bool, na_value=False), 2),
+        ]
+
+        flat = self.cells.reshape(-1, len(HEAD_TO_HEAD_FIELDS))
+        cell = team * self.size + opponent
+        for field, values in enumerate(counts):
+            np.add.at(flat[:, field], cell, values.astype(np.int32))
+
+        # Dernière rencontre : clé (édition, id_match) la plus grande par case
+        edition = np.tile(matches['edition'].to_numpy(dtype=np.int64), 2)
+        id_match = np.tile(matches['id_match'].to_numpy(dtype=np.int64), 2)
+        dates = matches['date'].to_numpy(dtype='datetime64[D]')
+        days = np.where(np.isnat(dates), -1, dates.astype(np.int64))
+        key = (edition << 32) | id_match
+        order = np.argsort(key, kind='stable')[::-1]
+        cell, first = np.unique(cell[order], return_index=True)
+        latest = order[first]
+
+        current = flat[cell]
+        current_key = (current[:, _LAST_EDITION].astype(np.int64) << 32) | (
+            current[:, _LAST_ID_MATCH].astype(np.int64) & 0xFFFFFFFF
+        )
+        newer = key[latest] > np.where(current[:, _LAST_EDITION] < 0, -1, current_key)
+        cell, latest = cell[newer], latest[newer]
+        flat[cell, _LAST_EDITION] = edition[latest]
+        flat[cell, _LAST_ID_MATCH] = id_match[latest]
+        flat[cell, _LAST_DATE] = np.tile(days, 2)[latest]
+
+        if isinstance(self.cells, np.memmap):
+            self.cells.flush()
+
+    def head_to_head(self, team_a: int, team_b: int) -> dict:
+        """
+        Bilan de team_a contre team_b, en temps constant.
+
+        Args:
+            team_a: ID de l'équipe de référence
+            team_b: ID de l'adversaire
+
+        Returns:
+            Dictionnaire {champ: valeur} de HEAD_TO_HEAD_FIELDS (victoires,
+            buts pour... de team_a) ; last_date est une datetime.date, les
+            champs last_* valent None si les équipes ne se sont jamais
+            rencontrées (ou si la date est inconnue)
+        """
+        import datetime
+
+        if not (0 <= team_a < self.size and 0 <= team_b < self.size):
+            row = HeadToHeadMatrix.empty(1).cells[0, 0]
+        else:
+            row = self.cells[team_a, team_b]
+        values = dict(zip(HEAD_TO_HEAD_FIELDS, row.tolist()))
+        for field in HEAD_TO_HEAD_FIELDS[_COUNTS:]:
+            if values[field] < 0:
+                values[field] = None
+        if values['last_date'] is not None:
+            values['last_date'] = datetime.date(1970, 1, 1) + datetime.timedelta(days=values['last_date'])
+        return values
+
+    def pairs(self, min_matches: int = 1):
+        """
+        Toutes les paires qui se sont rencontrées, pour les rapports de rivalités.
+
+        Args:
+            min_matches: Nombre minimal de confrontations
+
+        Returns:
+            DataFrame d'une ligne par paire (team_a_id < team_b_id), aux
+            champs de HEAD_TO_HEAD_FIELDS vus de team_a, trié par nombre de
+            confrontations décroissant
+        """
+        import numpy as np
+        import pandas as pd
+
+        matches = np.asarray(self.cells[:, :, 0])
+        team_a, team_b = np.nonzero(np.triu(matches >= max(min_matches, 1), k=1))
+        frame = pd.DataFrame(np.asarray(self.cells[team_a, team_b]), columns=HEAD_TO_HEAD_FIELDS)
+        frame.insert(0, 'team_b_id', team_b)
+        frame.insert(0, 'team_a_id', team_a)
+        return frame.sort_values(
+            ['matches', 'team_a_id', 'team_b_id'], ascending=[False, True, True], kind='stable', ignore_index=True
+        )
+
+
+class MatchAnalytics:
+    """
+    Tables des matchs et des équipes en tableaux NumPy, indexés par ID.
+
+    À la construction, chaque match donne deux apparitions (une par équipe),
+    agrégées en tableaux denses (ID d'équipe × édition) par bincount ; les
+    confrontations sont lues dans une HeadToHeadMatrix. Chaque requête ne
+    fait ensuite que lire ou réduire ces tableaux.
+    """
+
+    def __init__(self, matches, teams):
+        import numpy as np
+
+        teams = teams.dropna(subset=['id_team'])
+        team_ids = teams['id_team'].to_numpy(dtype=np.int64)
+        home = matches['home_team_id'].to_numpy(dtype=np.int64)
+        away = matches['away_team_id'].to_numpy(dtype=np.int64)
+        size = int(max(team_ids.max(initial=-1), home.max(initial=-1), away.max(initial=-1))) + 1
+
+        # Référentiel des équipes indexé par ID (None : ID absent de teams)
+        self.names = np.full(size, None, dtype=object)
+        self.names[team_ids] = teams['nom_standard'].to_numpy(dtype=object)
+        self.confederations = np.full(size, None, dtype=object)
+        self.confederations[team_ids] = teams['confederation'].astype(object).where(
+            teams['confederation'].notna(), None
+        ).to_numpy()
+        self.team_index = dict(zip(teams['nom_standard'], team_ids.tolist()))
+        known = np.zeros(size, dtype=bool)
+        known[team_ids] = True
+
+        home_goals = matches['home_result'].to_numpy(dtype=np.int64)
+        away_goals = matches['away_result'].to_numpy(dtype=np.int64)
+        result = _codes(matches['result'], RESULT_VALUES)
+        rounds = _codes(matches['round'], ROUND_STAGES)
+        extra_time = matches['extra_time'].to_numpy(dtype=bool, na_value=False)
+        penalties = matches['penalties'].to_numpy(dtype=bool, na_value=False)
+        self.editions, edition_index = np.unique(
+            matches['edition'].to_numpy(dtype=np.int64), return_inverse=True
+        )
+        n_editions = len(self.editions)
+
+        # Apparitions de chaque équipe, matchs Preliminary compris (confédérations)
+        appearances = np.bincount(np.concatenate([home, away]), minlength=size)
+        self.appearances = np.where(known, appearances, 0)
+
+        # Apparitions hors Preliminary : côté domicile puis côté extérieur
+        played = rounds != PRELIMINARY
+        team = np.concatenate([home[played], away[played]])
+        goals_for = np.concatenate([home_goals[played], away_goals[played]])
+        goals_against = np.concatenate([away_goals[played], home_goals[played]])
+        outcome = result[played]
+        won = np.concatenate([outcome == HOME, outcome == AWAY])
+        lost = np.concatenate([outcome == AWAY, outcome == HOME])
+        final = np.tile(rounds[played] == FINAL, 2)
+        cells = team * n_editions + np.tile(edition_index[played], 2)
+
+        measures = {
+            'matches': None,
+            'wins': won,
+            'draws': np.tile(outcome == DRAW, 2),
+            'losses': lost,
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+            'clean_sheets': goals_against == 0,
+            'extra_time_matches': np.tile(extra_time[played], 2),
+            'penalty_matches': np.tile(penalties[played], 2),
+            'finals': final,
+            'titles': final & won,
+        }
+        self.edition_stats = {
+            name: np.bincount(cells, weights=weights, minlength=size * n_editions)
+            .astype(np.int64).reshape(size, n_editions)
+            for name, weights in measures.items()
+        }
+
+        # Meilleur tour atteint (ROUND_RANKS, 1 pour les autres tours, 0 si absent)
+        ranks = np.ones(len(ROUND_STAGES), dtype=np.int64)
+        for round_name, rank in ROUND_RANKS.items():
+            ranks[ROUND_STAGES.index(round_name)] = rank
+        best_round_rank = np.zeros(size * n_editions, dtype=np.int64)
+        np.maximum.at(best_round_rank, cells, np.tile(ranks[rounds[played]], 2))
+        self.best_round_rank = best_round_rank.reshape(size, n_editions)
+
+        # Confrontations hors Preliminary, lues en temps constant
+        self.head_to_head_matrix = HeadToHeadMatrix.from_matches(matches, size=size)
+
+    @classmethod
+    def from_processed(cls, processed_dir: Path = PROCESSED_DIR):
+        """
+        Charge les tables traitées de data/processed.
+
+        Le dataset matches.parquet et teams_traitees.parquet sont lus s'ils
+        existent, sinon les exports matches.csv et teams_traitees.csv.
+
+        Args:
+            processed_dir: Dossier des tables traitées
+
+        Returns:
+            Instance de MatchAnalytics
+        """
+        import pandas as pd
+
+        processed_dir = Path(processed_dir)
+        if (processed_dir / "matches.parquet").exists():
+            matches = read_matches_parquet(processed_dir / "matches.parquet", columns=ANALYTICS_COLUMNS)
+        else:
+            matches = coerce_matches(
+                pd.read_csv(processed_dir / "matches.csv", usecols=ANALYTICS_COLUMNS)
+            )
+        if (processed_dir / "teams_traitees.parquet").exists():
+            teams = read_teams_parquet(processed_dir / "teams_traitees.parquet")
+        else:
+            teams = coerce_teams(pd.read_csv(processed_dir / "teams_traitees.csv"))
+        return cls(matches, teams)
+
+    def team_id(self, team: str) -> int | None:
+        """ID d'une équipe d'après son nom standard, ou None si inconnue."""
+        return self.team_index.get(team)
+
+    def _ranked(self, rows, columns, sort_by, ascending):
+        """DataFrame trié comme un ORDER BY (colonnes et sens donnés)."""
+        import pandas as pd
+
+        frame = pd.DataFrame(rows, columns=columns)
+        return frame.sort_values(sort_by, ascending=ascending, kind='stable', ignore_index=True)
+
+    def _totals(self, measure: str):
+        """Total d'un agrégat par ID d'équipe, toutes éditions confondues."""
+        return self.edition_stats[measure].sum(axis=1)
+
+    def champions(self):
+        """Titres par équipe (requête champions)."""
+        return self._count_by_team('titles', 'titres')
+
+    def finalists(self):
+        """Finales jouées par équipe (requête finalists)."""
+        return self._count_by_team('finals', 'finales')
+
+    def _count_by_team(self, measure: str, label: str):
+        import numpy as np
+
+        totals = self._totals(measure)
+        ids = np.flatnonzero((totals > 0) & (self.names != None))  # noqa: E711
+        rows = {'equipe': self.names[ids], label: totals[ids]}
+        return self._ranked(rows, ['equipe', label], [label, 'equipe'], [False, True])
+
+    def team_stats(self):
+        """
+        Bilan global par équipe (requête team_stats).
+
+        Returns:
+            DataFrame trié par victoires décroissantes puis nom
+        """
+        import numpy as np
+
+        matches = self._totals('matches')
+        ids = np.flatnonzero((matches > 0) & (self.names != None))  # noqa: E711
+        matches = matches[ids]
+        totals = {name: self._totals(name)[ids] for name in EDITION_MEASURES}
+        rows = {
+            'id_team': ids,
+            'nom_standard': self.names[ids],
+            'confederation': self.confederations[ids],
+            'total_matches': matches,
+            'editions': np.count_nonzero(self.edition_stats['matches'][ids], axis=1),
+            'wins': totals['wins'],
+            'draws': totals['draws'],
+            'losses': totals['losses'],
+            'goals_for': totals['goals_for'],
+            'goals_against': totals['goals_against'],
+            'goal_difference': totals['goals_for'] - totals['goals_against'],
+            'win_rate': _sql_ratio(100 * totals['wins'], matches, 10),
+            'avg_goals_scored': _sql_ratio(totals['goals_for'], matches, 100),
+            'avg_goals_conceded': _sql_ratio(totals['goals_against'], matches, 100),
+            'clean_sheets': totals['clean_sheets'],
+        }
+        return self._ranked(rows, list(rows), ['wins', 'nom_standard'], [False, True])
+
+    def team_by_edition(self, team: str):
+        """
+        Performance d'une équipe par édition (requête team_by_edition).
+
+        Args:
+            team: Nom standard de l'équipe
+
+        Returns:
+            DataFrame trié par édition (vide si l'équipe est inconnue)
+        """
+        import numpy as np
+
+        columns = [
+            'id_team', 'nom_standard', 'confederation', 'edition', 'matches', 'wins', 'draws',
+            'losses', 'goals_for', 'goals_against', 'goal_diff', 'win_rate', 'best_round_rank',
+        ]
+        team_id = self.team_id(team)
+        if team_id is None:
+            return self._ranked({}, columns, 'edition', True)
+
+        stats = {name: values[team_id] for name, values in self.edition_stats.items()}
+        played = np.flatnonzero(stats['matches'] > 0)
+        stats = {name: values[played] for name, values in stats.items()}
+        rows = {
+            'id_team': team_id,
+            'nom_standard': team,
+            'confederation': self.confederations[team_id],
+            'edition': self.editions[played],
+            'matches': stats['matches'],
+            'wins': stats['wins'],
+            'draws': stats['draws'],
+            'losses': stats['losses'],
+            'goals_for': stats['goals_for'],
+            'goals_against': stats['goals_against'],
+            'goal_diff': stats['goals_for'] - stats['goals_against'],
+            'win_rate': _sql_ratio(100 * stats['wins'], stats['matches'], 10),
+            'best_round_rank': self.best_round_rank[team_id, played],
+        }
+        return self._ranked(rows, columns, 'edition', True)
+
+    def head_to_head(self, team1: str, team2: str):
+        """
+        Bilan des confrontations entre deux équipes (requête head_to_head).
+
+        La paire est normalisée comme dans pair_edition_stats : team_a est
+        l'équipe de plus petite ID, quel que soit l'ordre des arguments.
+
+        Args:
+            team1: Nom standard de la première équipe
+            team2: Nom standard de la seconde équipe
+
+        Returns:
+            DataFrame d'une ligne (vide si les équipes ne se sont jamais
+            rencontrées)
+        """
+        columns = [
+            'team_a', 'team_b', 'total_matches', 'team_a_wins', 'team_b_wins', 'draws',
+            'team_a_goals', 'team_b_goals', 'extra_time_matches', 'penalty_matches',
+        ]
+        id1, id2 = self.team_id(team1), self.team_id(team2)
+        if id1 is None or id2 is None:
+            return self._ranked({}, columns, 'team_a', True)
+
+        team_a, team_b = min(id1, id2), max(id1, id2)
+        cell = self.head_to_head_matrix.head_to_head(team_a, team_b)
+        if cell['matches'] == 0:
+            return self._ranked({}, columns, 'team_a', True)
+
+        row = {
+            'team_a': self.names[team_a],
+            'team_b': self.names[team_b],
+            'total_matches': cell['matches'],
+            'team_a_wins': cell['wins'],
+            'team_b_wins': cell['losses'],
+            'draws': cell['draws'],
+            'team_a_goals': cell['goals_for'],
+            'team_b_goals': cell['goals_against'],
+            'extra_time_matches': cell['extra_time_matches'],
+            'penalty_matches': cell['penalty_matches'],
+        }
+        return self._ranked([row], columns, 'team_a', True)
+
+    def confederations_breakdown(self):
+        """
+        Équipes et matchs joués par confédération (requête confederations).
+
+        Comme la requête, compte toutes les apparitions, Preliminary compris.
+
+        Returns:
+            DataFrame trié par matchs joués décroissants
+        """
+        import numpy as np
+        import pandas as pd
+
+        ids = np.flatnonzero(self.appearances > 0)
+        confederations = pd.Series(self.confederations[ids])
+        ids, confederations = ids[confederations.notna().to_numpy()], confederations.dropna()
+        labels, codes = np.unique(confederations.to_numpy(dtype=str), return_inverse=True)
+        rows = {
+            'confederation': labels,
+            'nb_equipes': np.bincount(codes, minlength=len(labels)),
+            'matchs_joues': np.bincount(codes, weights=self.appearances[ids], minlength=len(labels)).astype(np.int64),
+        }
+        return self._ranked(rows, list(rows), ['matchs_joues', 'confederation'], [False, True])
+
+    def query(self, name: str, params: dict = None):
+        """
+        Répond à une requête de STATS_QUERIES, sans base de données.
+
+        Args:
+            name: Nom de la requête (champions, finalists, team_stats,
+                team_by_edition, head_to_head, confederations)
+            params: Paramètres nommés, comme pour stats.run_stats_query
+                (:team, :team1, :team2)
+
+        Returns:
+            DataFrame aux colonnes de la requête SQL
+
+        Raises:
+            KeyError: Si la requête n'est pas prise en charge
+        """
+        queries = {
+            'champions': self.champions,
+            'finalists': self.finalists,
+            'team_stats': self.team_stats,
+            'team_by_edition': self.team_by_edition,
+            'head_to_head': self.head_to_head,
+            'confederations': self.confederations_breakdown,
+        }
+        if name not in queries:
+            raise KeyError(f"Requête non prise en charge : {name}")
+        return queries[name](**(params or {}))
+
+
+_analytics = None
+
+
+def get_analytics() -> MatchAnalytics:
+    """
+    Retourne le moteur partagé, chargé depuis data/processed au premier appel.
+
+    Returns:
+        Instance de MatchAnalytics
+    """
+    global _analytics
+    if _analytics is None:
+        _analytics = MatchAnalytics.from_processed()
+    return _analytics
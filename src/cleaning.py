@@ -1,22 +1,187 @@
+import re
+
+
 def clean_percentage(x):
     if isinstance(x, str):
         return float(x.replace('%', ''))
     return x
 
 
+def clean_percentages(df, columns):
+    """
+    Convertit des colonnes de pourcentages ("65%") en float32, en une passe.
 
-def clean_round_name(r_raw):
+    Les colonnes texte des colonnes demandées sont aplaties en un seul
+    tableau ; chaque valeur distincte passe une fois par str.rstrip('%') et
+    to_numeric, puis le résultat est diffusé par les codes de factorize. Les
+    colonnes déjà numériques sont conservées telles quelles (ni copie ni
+    conversion) ; les colonnes absentes de df sont ignorées.
+
+    Args:
+        df: DataFrame source (non modifié)
+        columns: Colonnes de pourcentages à convertir
+
+    Returns:
+        Tuple (DataFrame converti, masque booléen des cellules non
+        convertibles, mises à NaN au lieu de lever une erreur)
     """
-    Normalise les noms des étapes de la compétition (Group Stage, Final, etc.)
+    import numpy as np
+    import pandas as pd
+
+    columns = [column for column in columns if column in df.columns]
+    text_columns = [
+        column for column in columns if not pd.api.types.is_numeric_dtype(df[column])
+    ]
+
+    result = df.copy(deep=False)
+    invalid = pd.DataFrame(False, index=df.index, columns=columns)
+    if not text_columns:
+        return result, invalid
+
+    # Les pourcentages distincts sont peu nombreux : on ne convertit que ceux-là
+    codes, uniques = pd.factorize(df[text_columns].to_numpy(dtype=object).ravel(order='F'))
+    raw = pd.Series(uniques, dtype=object)
+    # Seules les chaînes sont nettoyées : une colonne objet peut contenir des nombres
+    stripped = raw.map(lambda value: value.strip().rstrip('%') if isinstance(value, str) else value)
+    parsed = pd.to_numeric(stripped, errors='coerce').to_numpy(dtype=np.float32)
+
+    # Code -1 de factorize (valeur manquante) : NaN, non signalé
+    values = np.append(parsed, np.float32(np.nan))[codes]
+    bad = np.append(np.isnan(parsed), False)[codes]
+
+    n_rows = len(df)
+    for position, column in enumerate(text_columns):
+        block = slice(position * n_rows, (position + 1) * n_rows)
+        result[column] = values[block]
+        invalid[column] = bad[block]
+    return result, invalid
+
+
+
+# Les 8 étapes canoniques, dans l'ordre chronologique d'une édition
+ROUND_STAGES = [
+    'Preliminary', 'Group Stage', 'Second Group Stage', 'Round of 16',
+    'Quarter-finals', 'Semi-finals', 'Third Place', 'Final',
+]
+
+ROUND_CACHE_SIZE = 4096
+
+_round_cache = {}
+
+
+def canonical_round_name(r_raw):
     """
-    r = str(r_raw).upper().strip()
-    
-    if 'PRELIMINARY' in r or 'FIRST' in r: return 'Preliminary'
+    Retourne l'étape canonique d'un libellé de tour brut, ou None si inconnu.
+
+    Couvre les libellés de l'historique 1930-2010 (GROUP_STAGE, 1/8_FINAL,
+    PLACES_3&4, ...) comme ceux des sources 2014-2022 (Group A, Semi-final,
+    Play-off for third place, ...). L'ordre des tests est important : les
+    cas particuliers passent avant les cas généraux.
+    """
+    r = str(r_raw).replace('_', ' ').upper().strip()
+
+    if 'PRELIMINARY' in r: return 'Preliminary'
+    # Deuxième tour en poules (1950: FINAL_ROUND, 1974/1978: SEMIFINAL_STAGE, 1982: QUARTERFINAL_STAGE)
+    if 'FINAL ROUND' in r or 'SEMIFINAL STAGE' in r or 'QUARTERFINAL STAGE' in r or 'SECOND GROUP' in r:
+        return 'Second Group Stage'
     if 'GROUP' in r: return 'Group Stage'
+    # 1934/1938 : FIRST = premier tour à élimination directe
+    if r == 'FIRST': return 'Round of 16'
+    if 'FIRST' in r: return 'Preliminary'
     if '1/8' in r or 'ROUND OF 16' in r: return 'Round of 16'
     if '1/4' in r or 'QUARTER' in r: return 'Quarter-finals'
-    if '1/2' in r or 'SEMI' in r: return 'Semi-final'
-    if '3RD' in r or 'THIRD' in r or 'PLAY-OFF' in r: return 'Third Place'
+    if '1/2' in r or 'SEMI' in r: return 'Semi-finals'
+    if 'PLACES' in r or '3&4' in r or '3RD' in r or 'THIRD' in r or 'PLAY-OFF' in r:
+        return 'Third Place'
+    # Finale en dernier : de nombreux libellés contiennent "FINAL"
     if 'FINAL' in r: return 'Final'
-    
-    return r_raw
\ No newline at end of file
+
+    return None
+
+
+def clean_round_name(r_raw):
+    """
+    Normalise les noms des étapes de la compétition (Group Stage, Final, etc.)
+
+    Les libellés inconnus sont retournés tels quels.
+    """
+    stage = canonical_round_name(r_raw)
+    return r_raw if stage is None else stage
+
+
+def clean_round_names(series):
+    """
+    Normalise une colonne de libellés de tours en Categorical ordonné.
+
+    Chaque libellé distinct n'est analysé qu'une fois (résultat conservé dans
+    un cache borné à ROUND_CACHE_SIZE entrées), puis diffusé aux lignes par
+    les codes de catégorie : les groupby sur round travaillent ensuite sur
+    des entiers.
+
+    Args:
+        series: Series de libellés bruts
+
+    Returns:
+        Series catégorielle ordonnée selon ROUND_STAGES, alignée sur series
+        (NaN pour les libellés inconnus)
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series)
+
+    stage_codes = {stage: code for code, stage in enumerate(ROUND_STAGES)}
+    unique_codes = np.empty(len(uniques) + 1, dtype=np.int8)
+    unique_codes[-1] = -1  # code -1 de factorize (valeurs manquantes)
+    for position, raw in enumerate(uniques):
+        stage = _round_cache.get(raw)
+        if stage is None and raw not in _round_cache:
+            stage = canonical_round_name(raw)
+            if len(_round_cache) < ROUND_CACHE_SIZE:
+                _round_cache[raw] = stage
+        unique_codes[position] = stage_codes.get(stage, -1)
+
+    dtype = pd.CategoricalDtype(ROUND_STAGES, ordered=True)
+    rounds = pd.Categorical.from_codes(unique_codes[codes], dtype=dtype)
+    return pd.Series(rounds, index=series.index, name=series.name)
+
+
+# Score brut de l'historique 1930-2010, ex: "2-1 (1-0) (a.e.t.) (p.k.)".
+# Un seul passage : les marqueurs sont détectés par des lookaheads n'importe
+# où dans la chaîne, puis le score final et le score à la mi-temps en tête.
+SCORE_PATTERN = re.compile(
+    r"^(?=(?:.*?(?P<extra_time>\(a\.e\.t\.\)|(?i:aet)))?)"
+    r"(?=(?:.*?(?P<penalty_shootout>\(p\.k\.\)|(?i:\bpso\b)))?)"
+    r"(?=(?:.*?(?P<replay>\(r\.\)))?)"
+    r"(?:(?P<score_team1>\d+)-(?P<score_team2>\d+))?"
+    r"(?:\s*\((?P<half_time_team1>\d+)-(?P<half_time_team2>\d+)\))?",
+    re.DOTALL,
+)
+
+SCORE_INT_COLUMNS = ['score_team1', 'score_team2', 'half_time_team1', 'half_time_team2']
+SCORE_FLAG_COLUMNS = ['extra_time', 'penalty_shootout', 'replay']
+
+
+def parse_scores(series):
+    """
+    Analyse une colonne de scores bruts en une seule passe vectorisée.
+
+    Args:
+        series: Series de scores bruts (ex: "2-1 (1-0) (a.e.t.)")
+
+    Returns:
+        DataFrame aligné sur series avec les colonnes score_team1, score_team2,
+        half_time_team1, half_time_team2 (Int64) et extra_time,
+        penalty_shootout, replay (boolean)
+    """
+    import pandas as pd
+
+    # Les scores distincts sont peu nombreux : on n'analyse que ceux-là
+    codes, uniques = pd.factorize(series.astype(str))
+    parts = pd.Series(uniques, dtype=object).str.extract(SCORE_PATTERN)
+
+    scores = parts[SCORE_INT_COLUMNS].astype('Int64')
+    flags = parts[SCORE_FLAG_COLUMNS].notna().astype('boolean')
+    parsed = scores.join(flags).take(codes)
+    parsed.index = series.index
+    return parsed
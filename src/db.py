@@ -0,0 +1,188 @@
+"""
+Connexion partagée à la base PostgreSQL du projet World Cup ETL.
+
+Les notebooks 00, 05, 07, 08 et 09 reconstruisaient chacun DATABASE_URL
+depuis le .env et créaient leur propre engine (et le notebook 00 une
+connexion psycopg2 par requête). Ce module expose un engine unique, créé à
+la première utilisation, dont le pool de connexions est réutilisé par les
+requêtes d'analyse comme par les chargements :
+
+    from src.db import run_query
+    df = run_query("SELECT * FROM v_team_stats WHERE confederation = :conf", {"conf": "UEFA"})
+
+Les paramètres du pool se règlent par arguments de get_engine ou par les
+variables DB_POOL_SIZE, DB_MAX_OVERFLOW et DB_STATEMENT_TIMEOUT (ms) du .env.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+# Durée maximale d'une requête côté serveur, en millisecondes (0 : illimitée)
+STATEMENT_TIMEOUT_MS = 60_000
+
+# Requêtes distinctes dont la forme compilée est conservée
+STATEMENT_CACHE_SIZE = 256
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def database_url() -> str:
+    """
+    Construit l'URL PostgreSQL à partir des variables DB_* du .env.
+
+    Returns:
+        URL SQLAlchemy (driver psycopg2)
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return (
+        f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME')}"
+    )
+
+
+def _setting(value, variable: str, default: int) -> int:
+    """Valeur explicite, sinon variable d'environnement, sinon défaut."""
+    if value is not None:
+        return value
+    return int(os.getenv(variable, default))
+
+
+def get_engine(url: str = None, pool_size: int = None, max_overflow: int = None,
+               statement_timeout: int = None):
+    """
+    Retourne l'engine partagé, créé au premier appel.
+
+    Le pool vérifie chaque connexion avant de la prêter (pre-ping) : une
+    connexion coupée par le serveur est remplacée au lieu de faire échouer
+    la requête. Les arguments ne servent qu'à la création ; pour changer de
+    configuration, appeler dispose_engine() d'abord.
+
+    Args:
+        url: URL de la base (défaut : database_url())
+        pool_size: Connexions gardées ouvertes (défaut : DB_POOL_SIZE ou POOL_SIZE)
+        max_overflow: Connexions supplémentaires temporaires (défaut :
+            DB_MAX_OVERFLOW ou MAX_OVERFLOW)
+        statement_timeout: Durée maximale d'une requête en ms, PostgreSQL
+            uniquement (défaut : DB_STATEMENT_TIMEOUT ou STATEMENT_TIMEOUT_MS)
+
+    Returns:
+        Engine SQLAlchemy
+    """
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            from sqlalchemy import create_engine
+
+            url = url or database_url()
+            options = {}
+            if url.startswith('postgresql'):
+                timeout = _setting(statement_timeout, 'DB_STATEMENT_TIMEOUT', STATEMENT_TIMEOUT_MS)
+                options['connect_args'] = {'options': f"-c statement_timeout={timeout}"}
+            if not url.startswith('sqlite'):
+                options['pool_size'] = _setting(pool_size, 'DB_POOL_SIZE', POOL_SIZE)
+                options['max_overflow'] = _setting(max_overflow, 'DB_MAX_OVERFLOW', MAX_OVERFLOW)
+            _engine = create_engine(url, pool_pre_ping=True, **options)
+    return _engine
+
+
+def dispose_engine() -> None:
+    """Ferme les connexions du pool et oublie l'engine partagé."""
+    global _engine
+
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+@contextmanager
+def connection():
+    """
+    Prête une connexion du pool, dans une transaction.
+
+    La transaction est validée en sortie du bloc, annulée en cas
+    d'exception ; la connexion retourne ensuite au pool.
+
+    Yields:
+        Connexion SQLAlchemy
+    """
+    with get_engine().begin() as conn:
+        yield conn
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _statement(query: str):
+    """
+    Construction text() d'une requête, réutilisée à chaque appel.
+
+    SQLAlchemy met en cache la forme compilée d'une construction : une
+    requête relancée (même avec d'autres paramètres) n'est plus recompilée.
+    """
+    from sqlalchemy import text
+
+    return text(query)
+
+
+def run_query(query: str, params: dict = None, conn=None):
+    """
+    Exécute une requête SQL et retourne un DataFrame.
+
+    Args:
+        query: Requête SQL, avec des paramètres nommés (:team)
+        params: Valeurs des paramètres
+        conn: Connexion à utiliser (défaut : une connexion du pool)
+
+    Returns:
+        DataFrame du résultat
+    """
+    import pandas as pd
+
+    if conn is not None:
+        return pd.read_sql(_statement(query), conn, params=params)
+    with connection() as conn:
+        return pd.read_sql(_statement(query), conn, params=params)
+
+
+def run_explain(query: str, params: dict = None, analyze: bool = True, conn=None):
+    """
+    Exécute EXPLAIN (ANALYZE, BUFFERS) et retourne le plan d'exécution.
+
+    Avec analyze, la requête est réellement exécutée : la transaction est
+    annulée ensuite, si bien qu'un EXPLAIN ANALYZE d'un UPDATE ne modifie
+    rien.
+
+    Args:
+        query: Requête SQL, avec des paramètres nommés
+        params: Valeurs des paramètres
+        analyze: Si True, exécute la requête et mesure chaque nœud
+        conn: Connexion à utiliser (défaut : une connexion du pool)
+
+    Returns:
+        DataFrame avec une colonne Plan (une ligne de plan par ligne)
+    """
+    import pandas as pd
+
+    options = "ANALYZE, BUFFERS, FORMAT TEXT" if analyze else "FORMAT TEXT"
+    statement = _statement(f"EXPLAIN ({options}) {query}")
+
+    def explain(conn):
+        transaction = conn.begin_nested() if conn.in_transaction() else conn.begin()
+        try:
+            rows = conn.execute(statement, params or {}).fetchall()
+        finally:
+            transaction.rollback()
+        return pd.DataFrame([row[0] for row in rows], columns=['Plan'])
+
+    if conn is not None:
+        return explain(conn)
+    with get_engine().connect() as conn:
+        return explain(conn)
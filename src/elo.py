@@ -0,0 +1,344 @@
+"""
+Classement Elo des équipes sur tout l'historique des matchs.
+
+Les notebooks ne décrivent les équipes que par leurs taux de victoire ; ce
+module leur attribue une force, mise à jour après chaque match dans l'ordre
+chronologique (édition, date, puis ordre des tours de ROUND_STAGES et
+id_match), selon la formule du World Football Elo :
+
+    Rn = Ro + K × G × (W - We)
+
+- W : 1 victoire, 0.5 nul (et tirs au but), 0 défaite ;
+- We : 1 / (10 ** (-(Ro - Ro_adversaire + avantage) / 400) + 1), avec
+  HOME_ADVANTAGE pour le pays hôte de la phase finale (HOST_NATIONS) et
+  pour l'équipe qui reçoit en Preliminary, 0 sur terrain neutre ;
+- K : selon le tour (K_FACTORS), plus élevé en phase éliminatoire ;
+- G : écart de buts, 1 jusqu'à un but, 1.5 à deux, (11 + N) / 8 au-delà.
+
+Les classements sont tenus dans des tableaux NumPy contigus indexés par ID
+d'équipe. Un match ne dépend que des matchs précédents de ses deux
+équipes : les matchs sont regroupés en niveaux (aucune équipe deux fois
+par niveau), chaque niveau est mis à jour en une opération vectorisée,
+avec le même résultat qu'un parcours match par match.
+"""
+
+from pathlib import Path
+
+try:
+    from .cleaning import ROUND_STAGES
+    from .schema import RESULT_VALUES, coerce_matches, coerce_teams
+    from .storage import PROCESSED_DIR
+except ImportError:
+    from cleaning import ROUND_STAGES
+    from schema import RESULT_VALUES, coerce_matches, coerce_teams
+    from storage import PROCESSED_DIR
+
+BASE_RATING = 1500.0
+HOME_ADVANTAGE = 100.0
+
+# Coefficient K par tour (qualifications < phase de groupes < élimination directe)
+K_FACTORS = {
+    'Preliminary': 40.0,
+    'Group Stage': 60.0,
+    'Second Group Stage': 60.0,
+    'Round of 16': 75.0,
+    'Quarter-finals': 75.0,
+    'Semi-finals': 75.0,
+    'Third Place': 75.0,
+    'Final': 75.0,
+}
+
+# Pays hôtes de chaque phase finale (noms standards de teams_traitees)
+HOST_NATIONS = {
+    1930: ['Uruguay'],
+    1934: ['Italy'],
+    1938: ['France'],
+    1950: ['Brazil'],
+    1954: ['Switzerland'],
+    1958: ['Sweden'],
+    1962: ['Chile'],
+    1966: ['England'],
+    1970: ['Mexico'],
+    1974: ['Germany'],
+    1978: ['Argentina'],
+    1982: ['Spain'],
+    1986: ['Mexico'],
+    1990: ['Italy'],
+    1994: ['USA'],
+    1998: ['France'],
+    2002: ['Korea Republic', 'Japan'],
+    2006: ['Germany'],
+    2010: ['South Africa'],
+    2014: ['Brazil'],
+    2018: ['Russia'],
+    2022: ['Qatar'],
+}
+
+# Classements avant / après chaque match, dans l'ordre de traitement
+HISTORY_COLUMNS = [
+    'id_match', 'edition', 'home_team_id', 'away_team_id',
+    'home_rating_before', 'away_rating_before', 'home_rating_after', 'away_rating_after',
+]
+
+HOME, AWAY = RESULT_VALUES.index('home_team'), RESULT_VALUES.index('away_team')
+PRELIMINARY = ROUND_STAGES.index('Preliminary')
+
+
+def host_team_ids(teams, hosts: dict = HOST_NATIONS) -> dict:
+    """
+    IDs des pays hôtes par édition.
+
+    Args:
+        teams: Table des équipes (id_team, nom_standard)
+        hosts: {édition: [noms standards]}
+
+    Returns:
+        Dictionnaire {édition: [id_team]} (noms absents de teams ignorés)
+    """
+    ids = dict(zip(teams['nom_standard'], teams['id_team'].astype(int)))
+    return {edition: [ids[name] for name in names if name in ids] for edition, names in hosts.items()}
+
+
+def chronological_order(matches):
+    """
+    Ordre de traitement des matchs : édition, date, tour, id_match.
+
+    Les matchs sans date passent avant les matchs datés de leur édition ;
+    entre matchs de même date (ou sans date), l'ordre des tours de
+    ROUND_STAGES puis id_match départagent.
+
+    Args:
+        matches: Matchs avec edition, date, round et id_match
+
+    Returns:
+        Tableau des positions des matchs dans l'ordre chronologique
+    """
+    import numpy as np
+    import pandas as pd
+
+    rounds = pd.Categorical(matches['round'].astype(object), categories=ROUND_STAGES).codes
+    days = matches['date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return np.lexsort((
+        matches['id_match'].to_numpy(dtype=np.int64),
+        rounds,
+        days,
+        matches['edition'].to_numpy(dtype=np.int64),
+    ))
+
+
+def match_levels(home, away, size: int):
+    """
+    Niveau de chaque match : 1 + niveau du dernier match de ses deux équipes.
+
+    Deux matchs de même niveau n'ont aucune équipe en commun ; traiter les
+    niveaux dans l'ordre redonne exactement le parcours match par match.
+
+    Args:
+        home: IDs des équipes à domicile, dans l'ordre chronologique
+        away: IDs des équipes à l'extérieur
+        size: Nombre d'IDs d'équipe (plus grande ID + 1)
+
+    Returns:
+        Tableau des niveaux (à partir de 0)
+    """
+    import numpy as np
+
+    last = [-1] * size
+    levels = []
+    append = levels.append
+    for h, a in zip(home.tolist(), away.tolist()):
+        level_home, level_away = last[h], last[a]
+        level = (level_home if level_home > level_away else level_away) + 1
+        last[h] = last[a] = level
+        append(level)
+    return np.array(levels, dtype=np.int64)
+
+
+class EloRatings:
+    """
+    Classements Elo, mis à jour match après match.
+
+    ratings[id] est le classement courant de l'équipe id, played[id] son
+    nombre de matchs traités. update() traite un lot de matchs postérieurs
+    aux précédents : un nouvel appel prolonge l'historique sans recalculer
+    les matchs déjà traités.
+    """
+
+    def __init__(self, size: int = 0, hosts: dict = None, base_rating: float = BASE_RATING,
+                 home_advantage: float = HOME_ADVANTAGE, k_factors: dict = K_FACTORS):
+        """
+        Args:
+            size: Nombre d'IDs d'équipe initial (agrandi au besoin)
+            hosts: {édition: [id_team]} des pays hôtes (host_team_ids)
+            base_rating: Classement initial d'une équipe
+            home_advantage: Points ajoutés à l'équipe qui reçoit
+            k_factors: Coefficient K par tour
+        """
+        import numpy as np
+
+        self.base_rating = base_rating
+        self.home_advantage = home_advantage
+        self.hosts = {int(edition): list(ids) for edition, ids in (hosts or {}).items()}
+        self.ratings = np.full(size, base_rating, dtype=np.float64)
+        self.played = np.zeros(size, dtype=np.int64)
+        self._k_by_round = np.array([k_factors[name] for name in ROUND_STAGES], dtype=np.float64)
+        self._history = []
+
+    @classmethod
+    def from_matches(cls, matches, teams=None, **kwargs):
+        """
+        Calcule les classements sur tout l'historique.
+
+        Args:
+            matches: Matchs (colonnes de update())
+            teams: Table des équipes, pour situer les pays hôtes
+                (sans elle, toutes les phases finales sont sur terrain neutre)
+            **kwargs: Paramètres de EloRatings
+
+        Returns:
+            Instance de EloRatings
+        """
+        if teams is not None:
+            kwargs.setdefault('hosts', host_team_ids(teams))
+        elo = cls(**kwargs)
+        elo.update(matches)
+        return elo
+
+    @classmethod
+    def from_processed(cls, processed_dir: Path = PROCESSED_DIR, **kwargs):
+        """Calcule les classements sur matches.csv et teams_traitees.csv."""
+        import pandas as pd
+
+        processed_dir = Path(processed_dir)
+        matches = coerce_matches(pd.read_csv(processed_dir / "matches.csv"))
+        teams = coerce_teams(pd.read_csv(processed_dir / "teams_traitees.csv"))
+        return cls.from_matches(matches, teams, **kwargs)
+
+    def _grow(self, size: int) -> None:
+        import numpy as np
+
+        extra = size - len(self.ratings)
+        if extra > 0:
+            self.ratings = np.concatenate([self.ratings, np.full(extra, self.base_rating)])
+            self.played = np.concatenate([self.played, np.zeros(extra, dtype=np.int64)])
+
+    def _advantage(self, home, away, edition, rounds):
+        """Avantage du terrain vu de l'équipe à domicile (+, - ou 0)."""
+        import numpy as np
+
+        # Clés (édition, équipe) des pays hôtes, comparées en une seule recherche
+        size = len(self.ratings)
+        host_keys = np.array(
+            [edition * size + team for edition, ids in self.hosts.items() for team in ids if team < size],
+            dtype=np.int64,
+        )
+        is_host = np.isin(edition * size + home, host_keys), np.isin(edition * size + away, host_keys)
+        advantage = np.zeros(len(home), dtype=np.float64)
+        home_side = (rounds == PRELIMINARY) | (is_host[0] & ~is_host[1])
+        advantage[home_side] = self.home_advantage
+        advantage[is_host[1] & ~is_host[0] & (rounds != PRELIMINARY)] = -self.home_advantage
+        return advantage
+
+    def update(self, matches):
+        """
+        Traite des matchs et met à jour les classements.
+
+        Les matchs sont triés par chronological_order ; ils doivent être
+        postérieurs à ceux des appels précédents.
+
+        Args:
+            matches: Matchs avec id_match, home_team_id, away_team_id,
+                home_result, away_result, result, penalties, date, round
+                et edition
+
+        Returns:
+            DataFrame aux colonnes HISTORY_COLUMNS, une ligne par match
+            dans l'ordre de traitement
+        """
+        import numpy as np
+        import pandas as pd
+
+        matches = matches.iloc[chronological_order(matches)]
+        home = matches['home_team_id'].to_numpy(dtype=np.int64)
+        away = matches['away_team_id'].to_numpy(dtype=np.int64)
+        edition = matches['edition'].to_numpy(dtype=np.int64)
+        if len(matches):
+            self._grow(int(max(home.max(), away.max())) + 1)
+
+        # Constantes de chaque match, calculées une fois pour tout le lot
+        rounds = pd.Categorical(matches['round'].astype(object), categories=ROUND_STAGES).codes
+        result = pd.Categorical(matches['result'].astype(object), categories=RESULT_VALUES).codes
+        penalties = matches['penalties'].to_numpy(dtype=bool, na_value=False)
+        score = np.where(result == HOME, 1.0, np.where(result == AWAY, 0.0, 0.5))
+        score[penalties] = 0.5
+        goal_diff = np.abs(
+            matches['home_result'].to_numpy(dtype=np.int64) - matches['away_result'].to_numpy(dtype=np.int64)
+        )
+        goal_diff[penalties] = 0
+        weight = np.where(goal_diff <= 1, 1.0, np.where(goal_diff == 2, 1.5, (11.0 + goal_diff) / 8.0))
+        weight *= self._k_by_round[np.maximum(rounds, 0)]
+        advantage = self._advantage(home, away, edition, rounds)
+
+        before = np.empty((len(matches), 2), dtype=np.float64)
+        after = np.empty((len(matches), 2), dtype=np.float64)
+        levels = match_levels(home, away, len(self.ratings))
+        order = np.argsort(levels, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(levels))])
+
+        ratings = self.ratings
+        for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            index = order[start:stop]
+            h, a = home[index], away[index]
+            rating_home, rating_away = ratings[h], ratings[a]
+            expected = 1.0 / (10.0 ** ((rating_away - rating_home - advantage[index]) / 400.0) + 1.0)
+            delta = weight[index] * (score[index] - expected)
+            ratings[h] = rating_home + delta
+            ratings[a] = rating_away - delta
+            before[index, 0], before[index, 1] = rating_home, rating_away
+            after[index, 0], after[index, 1] = ratings[h], ratings[a]
+
+        np.add.at(self.played, np.concatenate([home, away]), 1)
+        history = pd.DataFrame({
+            'id_match': matches['id_match'].to_numpy(dtype=np.int64),
+            'edition': edition,
+            'home_team_id': home,
+            'away_team_id': away,
+            'home_rating_before': before[:, 0],
+            'away_rating_before': before[:, 1],
+            'home_rating_after': after[:, 0],
+            'away_rating_after': after[:, 1],
+        })
+        self._history.append(history)
+        return history
+
+    @property
+    def history(self):
+        """Classements avant / après chaque match traité (HISTORY_COLUMNS)."""
+        import pandas as pd
+
+        if not self._history:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        if len(self._history) > 1:
+            self._history = [pd.concat(self._history, ignore_index=True)]
+        return self._history[0]
+
+    def table(self, teams=None):
+        """
+        Classement courant des équipes ayant joué au moins un match.
+
+        Args:
+            teams: Table des équipes, pour ajouter nom_standard
+
+        Returns:
+            DataFrame (id_team, rating, matches[, nom_standard]) trié par
+            classement décroissant
+        """
+        import numpy as np
+        import pandas as pd
+
+        ids = np.flatnonzero(self.played)
+        table = pd.DataFrame({'id_team': ids, 'rating': self.ratings[ids], 'matches': self.played[ids]})
+        if teams is not None:
+            names = teams[['id_team', 'nom_standard']].astype({'id_team': np.int64})
+            table = table.merge(names, on='id_team', how='left')
+        return table.sort_values(['rating', 'id_team'], ascending=[False, True], ignore_index=True)
@@ -0,0 +1,706 @@
+"""
+Chargement des tables dans PostgreSQL par COPY (remplace le to_sql du notebook 07).
+
+Les DataFrames sont sérialisés en CSV dans un tampon mémoire, puis envoyés
+par COPY FROM STDIN (psycopg2 copy_expert) : chaque partition de matches
+dans sa table de staging, sans index pendant la copie ; les index de la
+partition sont construits ensuite, puis ANALYZE. Les partitions peuvent être
+chargées en parallèle, une par worker, sur un pool borné de connexions.
+Les anciennes partitions ne sont remplacées par les tables de staging
+qu'une fois toutes les données copiées, dans une seule transaction, si bien
+qu'un échec laisse la base intacte.
+
+Les opérations propres à PostgreSQL sont regroupées dans PostgresBackend ;
+un objet de même interface permet de tester l'orchestration sans serveur.
+"""
+
+import hashlib
+import io
+import json
+import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+from typing import NamedTuple
+
+try:
+    from .stats import (
+        PAIR_EDITION_COLUMNS, STATS_INDEXES, STATS_TABLES, TEAM_EDITION_COLUMNS, TEAM_MATCH_COLUMNS,
+        pair_edition_stats, team_edition_stats, team_match_rows,
+    )
+except ImportError:
+    from stats import (
+        PAIR_EDITION_COLUMNS, STATS_INDEXES, STATS_TABLES, TEAM_EDITION_COLUMNS, TEAM_MATCH_COLUMNS,
+        pair_edition_stats, team_edition_stats, team_match_rows,
+    )
+
+# Colonnes des tables (notebook 00 ; stadium_id en VARCHAR depuis le notebook 07)
+MATCH_DB_COLUMNS = [
+    'id_match', 'home_team_id', 'away_team_id', 'home_result', 'away_result', 'result',
+    'extra_time', 'penalties', 'replay', 'date', 'round', 'city', 'stadium_id', 'edition',
+]
+
+TEAM_DB_COLUMNS = ['id_team', 'nom_standard', 'confederation', 'aliases']
+
+# Colonnes du DataFrame renommées pour la base
+MATCH_COLUMN_RENAMES = {'id_stadium': 'stadium_id'}
+
+# Identité naturelle d'un match (upsert_database) ; le rang d'apparition
+# départage les homonymes (matchs rejoués sans date, ...)
+MATCH_KEY_COLUMNS = ['edition', 'round', 'home_team_id', 'away_team_id', 'date']
+
+# Séparateur des valeurs d'une ligne dans son empreinte (partition_summary)
+SUMMARY_SEPARATOR = '\x1f'
+
+# Clé de partitionnement de matches (notebook 00 : PARTITION BY RANGE (edition))
+PARTITION_KEY = 'edition'
+
+PARTITION_BOUND_PATTERN = re.compile(r"FROM \((\d+)\) TO \((\d+)\)")
+
+# Définition d'index du parent ("CREATE INDEX nom ON ONLY public.matches USING ...")
+INDEX_TARGET_PATTERN = re.compile(r"^CREATE (UNIQUE )?INDEX \S+ ON (?:ONLY )?\S+ ")
+
+# Connexions simultanées au plus (le pool SQLAlchemy par défaut en autorise 15)
+MAX_LOAD_WORKERS = 8
+
+
+def _copy_text(df, columns):
+    """
+    Valeurs des colonnes telles que COPY les lit : chaînes, '' pour NULL,
+    dates AAAA-MM-JJ et booléens t/f.
+    """
+    import pandas as pd
+
+    text = {}
+    for column in columns:
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime('%Y-%m-%d')
+        elif pd.api.types.is_bool_dtype(values):
+            values = values.map({True: 't', False: 'f'})
+        values = values.astype(object)
+        text[column] = values.where(values.notna(), '').astype(str)
+    return pd.DataFrame(text, index=df.index)
+
+
+def _db_text(value) -> str:
+    """Une valeur relue de la base, au format de _copy_text."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, (list, dict)):
+        # JSONB relu par psycopg2
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def to_copy_buffer(df, columns):
+    """
+    Sérialise un DataFrame en CSV pour COPY ... WITH (FORMAT csv).
+
+    Les valeurs manquantes deviennent des champs vides (NULL pour COPY),
+    les dates AAAA-MM-JJ et les booléens t/f.
+
+    Args:
+        df: DataFrame contenant les colonnes demandées
+        columns: Colonnes à écrire, dans l'ordre de la commande COPY
+
+    Returns:
+        io.StringIO positionné au début
+    """
+    import pandas as pd
+
+    df = df[columns].copy()
+    for column in columns:
+        values = df[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            df[column] = values.dt.strftime('%Y-%m-%d')
+        elif pd.api.types.is_bool_dtype(values):
+            df[column] = values.map({True: 't', False: 'f'})
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+class PostgresBackend:
+    """Opérations SQL de chargement propres à PostgreSQL (curseur psycopg2)."""
+
+    def copy(self, cursor, table: str, columns: list, buffer) -> None:
+        """Envoie un tampon CSV dans une table par COPY FROM STDIN."""
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+
+    def partitions(self, cursor, parent: str) -> dict:
+        """
+        Liste les partitions d'une table partitionnée par intervalle.
+
+        Returns:
+            Dictionnaire {nom de partition: (borne basse incluse, borne haute exclue)}
+        """
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = %s::regclass
+            """,
+            (parent,),
+        )
+        bounds = {}
+        for name, expression in cursor.fetchall():
+            match = PARTITION_BOUND_PATTERN.search(expression or '')
+            if match:
+                bounds[name] = (int(match.group(1)), int(match.group(2)))
+        return bounds
+
+    def create_staging(self, cursor, staging: str, like: str, temporary: bool = False) -> None:
+        """Crée une table de staging vide de même structure que like."""
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        if temporary:
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging} (LIKE {like} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+        else:
+            cursor.execute(
+                f"CREATE TABLE {staging} (LIKE {like} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+
+    def create_partition_indexes(self, cursor, parent: str, table: str, bounds: tuple) -> None:
+        """
+        Construit sur une table de staging remplie les index et contraintes du parent.
+
+        Ce sont ceux qu'ATTACH PARTITION créerait ou vérifierait : s'ils
+        existent déjà, l'attache les reprend sans reconstruire ni relire la
+        table. La contrainte CHECK des bornes dispense ATTACH de vérifier
+        chaque ligne ; elle est supprimée après l'attache.
+        """
+        cursor.execute(
+            "SELECT pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'u')",
+            (parent,),
+        )
+        for (definition,) in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {table} ADD {definition}")
+
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            """,
+            (parent,),
+        )
+        for (definition,) in cursor.fetchall():
+            # Index sans nom : PostgreSQL en génère un qui ne collisionne pas
+            cursor.execute(INDEX_TARGET_PATTERN.sub(rf"CREATE \1INDEX ON {table} ", definition))
+
+        cursor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_bounds "
+            f"CHECK ({PARTITION_KEY} >= {bounds[0]} AND {PARTITION_KEY} < {bounds[1]})"
+        )
+
+    def analyze(self, cursor, table: str) -> None:
+        """Met à jour les statistiques du planificateur pour une table."""
+        cursor.execute(f"ANALYZE {table}")
+
+    def drop_table(self, cursor, table: str) -> None:
+        """Supprime une table si elle existe (nettoyage des tables de staging)."""
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+    def drop_partition(self, cursor, parent: str, name: str) -> None:
+        """Détache et supprime une partition (et ses lignes)."""
+        cursor.execute(f"ALTER TABLE {parent} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+
+    def attach_partition(self, cursor, parent: str, staging: str, name: str, bounds: tuple) -> None:
+        """Renomme la table de staging et l'attache comme partition (les FK sont vérifiées à l'attache)."""
+        cursor.execute(f"ALTER TABLE {staging} RENAME TO {name}")
+        cursor.execute(
+            f"ALTER TABLE {parent} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ({bounds[0]}) TO ({bounds[1]})"
+        )
+        cursor.execute(f"ALTER TABLE {name} DROP CONSTRAINT IF EXISTS {staging}_bounds")
+
+    def replace_rows(self, cursor, table: str, staging: str, columns: list) -> None:
+        """Remplace le contenu d'une table par celui de sa table de staging."""
+        column_list = ', '.join(columns)
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging}")
+
+    def fetch_rows(self, cursor, table: str, columns: list) -> list:
+        """Relit toutes les lignes d'une table (ou d'une partition)."""
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        return cursor.fetchall()
+
+    def summarize_rows(self, cursor, table: str, columns: list) -> tuple:
+        """
+        Résumé d'une table calculé par le serveur, sans relire ses lignes.
+
+        Même calcul que partition_summary : format() écrit chaque valeur
+        comme _copy_text (NULL vide, booléens t/f, dates AAAA-MM-JJ).
+
+        Returns:
+            Tuple (nombre de lignes, somme des empreintes des lignes)
+        """
+        row_format = SUMMARY_SEPARATOR.join('%s' for _ in columns)
+        cursor.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(('x' || LEFT(MD5(FORMAT(%s, {', '.join(columns)})), 15))"
+            f"::bit(60)::bigint), 0) FROM {table}",
+            (row_format,),
+        )
+        rows, checksum = cursor.fetchone()
+        return int(rows), int(checksum)
+
+    def max_value(self, cursor, table: str, column: str):
+        """Maximum d'une colonne entière (None si la table est vide)."""
+        cursor.execute(f"SELECT MAX({column}) FROM {table}")
+        return cursor.fetchone()[0]
+
+    def upsert_rows(self, cursor, table: str, staging: str, columns: list, conflict: list) -> None:
+        """Insère les lignes de staging, en mettant à jour celles dont la clé conflict existe."""
+        column_list = ', '.join(columns)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in columns if column not in conflict)
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} "
+            f"ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {updates}"
+        )
+
+    def delete_rows(self, cursor, table: str, column: str, values: list) -> None:
+        """Supprime les lignes dont column vaut l'une des valeurs."""
+        cursor.execute(f"DELETE FROM {table} WHERE {column} = ANY(%s)", (list(values),))
+
+    def create_tables(self, cursor, statements) -> None:
+        """Exécute des CREATE TABLE IF NOT EXISTS."""
+        for statement in statements:
+            cursor.execute(statement)
+
+    def clear_table(self, cursor, table: str) -> None:
+        """Supprime toutes les lignes d'une table."""
+        cursor.execute(f"DELETE FROM {table}")
+
+    def reset_sequence(self, cursor, table: str, column: str) -> None:
+        """Recale la séquence SERIAL d'une colonne sur son maximum."""
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+            f"(SELECT COALESCE(MAX({column}), 1) FROM {table}))"
+        )
+
+
+def split_by_partition(matches, bounds: dict) -> dict:
+    """
+    Répartit les matchs entre les partitions selon leur édition.
+
+    Args:
+        matches: DataFrame avec une colonne edition
+        bounds: {nom de partition: (borne basse, borne haute exclue)}
+
+    Returns:
+        Dictionnaire {nom de partition: DataFrame}, partitions vides comprises
+
+    Raises:
+        ValueError: Si des éditions ne tombent dans aucune partition
+    """
+    import numpy as np
+
+    edition = matches['edition'].to_numpy()
+    covered = np.zeros(len(matches), dtype=bool)
+    parts = {}
+    for name, (lower, upper) in sorted(bounds.items(), key=lambda item: item[1]):
+        mask = (edition >= lower) & (edition < upper)
+        covered |= mask
+        parts[name] = matches[mask]
+
+    if not covered.all():
+        missing = sorted(set(matches.loc[~covered, 'edition'].tolist()))
+        raise ValueError(f"Aucune partition pour les éditions : {missing}")
+    return parts
+
+
+def refresh_stats(backend, cursor, matches, editions=None) -> None:
+    """
+    Recalcule team_match et les agrégats matérialisés (stats.py) des éditions données.
+
+    Les lignes des éditions sont supprimées puis recalculées depuis matches
+    et copiées par COPY ; les autres éditions ne sont pas touchées. Les
+    tables sont créées si besoin. Ne valide pas la transaction.
+
+    Args:
+        backend: Opérations SQL
+        cursor: Curseur de la transaction du chargement
+        matches: Matchs au schéma canonique, avec les id_match de la base
+        editions: Éditions à recalculer (défaut : toutes, les tables sont vidées)
+    """
+    backend.create_tables(cursor, [*STATS_TABLES.values(), *STATS_INDEXES])
+    for table, columns, aggregate in (
+        ('team_match', TEAM_MATCH_COLUMNS, team_match_rows),
+        ('team_edition_stats', TEAM_EDITION_COLUMNS, team_edition_stats),
+        ('pair_edition_stats', PAIR_EDITION_COLUMNS, pair_edition_stats),
+    ):
+        if editions is None:
+            backend.clear_table(cursor, table)
+        elif editions:
+            backend.delete_rows(cursor, table, 'edition', sorted(editions))
+        else:
+            continue
+        backend.copy(cursor, table, columns, to_copy_buffer(aggregate(matches, editions), columns))
+
+
+class ConnectionPool:
+    """
+    Pool borné de connexions DB-API, partagé entre threads.
+
+    Au plus size connexions sont ouvertes (par connect, à la demande) et
+    prêtées en même temps ; acquire() attend qu'une connexion se libère.
+    """
+
+    def __init__(self, connect, size: int):
+        self._connect = connect
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._opened = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        """Prête une connexion, rendue au pool en sortie du bloc."""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                with self._lock:
+                    self._opened.append(conn)
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        """Ferme toutes les connexions ouvertes par le pool."""
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+
+
+def _stage_partition(backend, cursor, parent: str, name: str, part, bounds: tuple) -> None:
+    """Remplit la table de staging d'une partition, puis construit ses index et l'analyse."""
+    staging = f"{name}_staging"
+    backend.create_staging(cursor, staging, parent)
+    backend.copy(cursor, staging, MATCH_DB_COLUMNS, to_copy_buffer(part, MATCH_DB_COLUMNS))
+    backend.create_partition_indexes(cursor, parent, staging, bounds)
+    backend.analyze(cursor, staging)
+
+
+def _stage_partition_pooled(pool, backend, parent: str, name: str, part, bounds: tuple) -> None:
+    """_stage_partition sur une connexion du pool, validée à la fin."""
+    with pool.acquire() as conn:
+        cursor = conn.cursor()
+        try:
+            _stage_partition(backend, cursor, parent, name, part, bounds)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def load_database(conn, matches, teams, backend=None, parent: str = 'matches',
+                  connect=None, workers=None) -> dict:
+    """
+    Recharge teams et matches par COPY.
+
+    Étapes : chaque partition de matchs est copiée dans sa table de
+    staging, qui reçoit ensuite les index du parent et un ANALYZE ; puis,
+    en une transaction sur conn, copie des équipes dans une table
+    temporaire, suppression des anciennes partitions, remplacement des
+    équipes et attache des tables de staging comme nouvelles partitions ;
+    enfin recalage des séquences.
+
+    Avec connect, les partitions sont chargées en parallèle, une par
+    worker, chacune dans sa propre transaction sur une connexion d'un pool
+    borné à workers connexions. Sans connect, tout se fait sur conn, dans la
+    même transaction. Dans les deux cas, un échec laisse les anciennes
+    partitions en place et supprime les tables de staging.
+
+    Args:
+        conn: Connexion DB-API (psycopg2, ou engine.raw_connection())
+        matches: Matchs au schéma canonique (schema.MATCH_DTYPES)
+        teams: Équipes (id_team, nom_standard, confederation, aliases)
+        backend: Opérations SQL (PostgresBackend par défaut)
+        parent: Table partitionnée des matchs
+        connect: Fonction sans argument ouvrant une connexion (ex:
+            engine.raw_connection) ; active le chargement parallèle
+        workers: Connexions simultanées au plus (par défaut le nombre de
+            CPU, borné par MAX_LOAD_WORKERS et le nombre de partitions)
+
+    Returns:
+        Dictionnaire {table ou partition: nombre de lignes copiées}
+    """
+    backend = backend or PostgresBackend()
+    matches = matches.rename(columns=MATCH_COLUMN_RENAMES)
+    counts = {}
+
+    parts = {}
+    cursor = conn.cursor()
+    try:
+        bounds = backend.partitions(cursor, parent)
+        parts = split_by_partition(matches, bounds)
+
+        if connect is None:
+            for name, part in parts.items():
+                _stage_partition(backend, cursor, parent, name, part, bounds[name])
+        else:
+            workers = min(workers or os.cpu_count() or 1, MAX_LOAD_WORKERS, len(parts) or 1)
+            pool = ConnectionPool(connect, workers)
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(_stage_partition_pooled, pool, backend,
+                                        parent, name, part, bounds[name])
+                        for name, part in parts.items()
+                    ]
+                    for future in futures:
+                        future.result()
+            finally:
+                pool.close()
+
+        backend.create_staging(cursor, 'teams_staging', 'teams', temporary=True)
+        backend.copy(cursor, 'teams_staging', TEAM_DB_COLUMNS, to_copy_buffer(teams, TEAM_DB_COLUMNS))
+        counts['teams'] = len(teams)
+        counts.update({name: len(part) for name, part in parts.items()})
+
+        # Les anciennes partitions référencent teams : elles partent avant
+        for name in parts:
+            backend.drop_partition(cursor, parent, name)
+        backend.replace_rows(cursor, 'teams', 'teams_staging', TEAM_DB_COLUMNS)
+        for name in parts:
+            backend.attach_partition(cursor, parent, f"{name}_staging", name, bounds[name])
+        refresh_stats(backend, cursor, matches)
+
+        backend.reset_sequence(cursor, 'teams', 'id_team')
+        backend.reset_sequence(cursor, parent, 'id_match')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        # Les tables de staging validées par les workers survivent au rollback
+        for name in parts:
+            backend.drop_table(cursor, f"{name}_staging")
+        conn.commit()
+        raise
+    finally:
+        cursor.close()
+
+    return counts
+
+
+class Changes(NamedTuple):
+    """Lignes insérées, mises à jour et supprimées dans une table par upsert_database."""
+    inserted: int
+    updated: int
+    deleted: int
+
+
+def match_keys(text):
+    """
+    Clé naturelle de chaque match : édition, tour, équipes, date et rang.
+
+    Le rang numérote, dans l'ordre des id_match, les matchs de même
+    (édition, tour, équipes, date) : deux matchs rejoués sans date gardent
+    des clés distinctes et stables d'un chargement à l'autre.
+
+    Args:
+        text: Matchs au format de _copy_text (colonnes MATCH_KEY_COLUMNS et id_match)
+
+    Returns:
+        Series de clés (chaînes), alignée sur text
+    """
+    base = text[MATCH_KEY_COLUMNS[0]]
+    for column in MATCH_KEY_COLUMNS[1:]:
+        base = base + '|' + text[column]
+    order = text['id_match'].astype(int).sort_values(kind='stable').index
+    rank = base.loc[order].groupby(base.loc[order]).cumcount().reindex(text.index)
+    return base + '#' + rank.astype(str)
+
+
+def partition_summary(text, columns) -> tuple:
+    """
+    Résumé d'une partition : nombre de lignes et somme des empreintes des lignes.
+
+    L'empreinte d'une ligne est faite des 60 premiers bits du MD5 de ses
+    valeurs jointes par SUMMARY_SEPARATOR. La somme ne dépend pas de
+    l'ordre des lignes ; PostgresBackend.summarize_rows la calcule en SQL
+    sur la partition en base.
+
+    Args:
+        text: Lignes au format de _copy_text
+        columns: Colonnes résumées
+
+    Returns:
+        Tuple (nombre de lignes, somme des empreintes des lignes)
+    """
+    checksum = sum(
+        int(hashlib.md5(SUMMARY_SEPARATOR.join(values).encode('utf-8')).hexdigest()[:15], 16)
+        for values in text[columns].itertuples(index=False)
+    )
+    return len(text), checksum
+
+
+def diff_rows(loaded, incoming, keys_loaded, keys_incoming, columns):
+    """
+    Compare les lignes en base et les lignes à charger par clé.
+
+    Args:
+        loaded, incoming: DataFrames au format de _copy_text
+        keys_loaded, keys_incoming: Clés de chaque ligne, alignées
+        columns: Colonnes comparées pour détecter une mise à jour
+
+    Returns:
+        Tuple (lignes de incoming à insérer, paires (ligne de incoming,
+        ligne de loaded) à mettre à jour sous forme de deux DataFrames
+        alignés, lignes de loaded à supprimer)
+    """
+    loaded = loaded.set_axis(keys_loaded.to_numpy())
+    incoming = incoming.set_axis(keys_incoming.to_numpy())
+    if loaded.index.has_duplicates or incoming.index.has_duplicates:
+        raise ValueError("Clés en double : impossible de comparer les lignes")
+
+    common = incoming.index.intersection(loaded.index)
+    changed = (incoming.loc[common, columns] != loaded.loc[common, columns]).any(axis=1)
+    updated = common[changed.to_numpy()]
+
+    inserted = incoming.loc[incoming.index.difference(loaded.index, sort=False)]
+    deleted = loaded.loc[loaded.index.difference(incoming.index, sort=False)]
+    return inserted, (incoming.loc[updated], loaded.loc[updated]), deleted
+
+
+def _apply_changes(backend, cursor, table, columns, conflict, upserts, key_column, deleted) -> None:
+    """Supprime puis insère ou met à jour les lignes modifiées d'une table."""
+    if len(deleted):
+        backend.delete_rows(cursor, table, key_column, deleted[key_column].astype(int).tolist())
+    if len(upserts):
+        staging = f"{table}_upsert"
+        backend.create_staging(cursor, staging, table, temporary=True)
+        backend.copy(cursor, staging, columns, to_copy_buffer(upserts, columns))
+        backend.upsert_rows(cursor, table, staging, columns, conflict)
+        backend.drop_table(cursor, staging)
+
+
+def upsert_database(conn, matches, teams, backend=None, parent: str = 'matches') -> dict:
+    """
+    Applique à la base les seules différences avec teams et matches.
+
+    Les lignes en base sont relues et comparées aux DataFrames : les
+    équipes par id_team, les matchs par leur clé naturelle (match_keys),
+    partition par partition. Une partition n'est relue que si son résumé
+    calculé en base (nombre de lignes et somme des empreintes,
+    partition_summary) diffère de celui des matchs à charger. Les lignes nouvelles ou modifiées passent par
+    une table de staging temporaire et INSERT ... ON CONFLICT ; les lignes
+    disparues sont supprimées. Une partition sans différence n'est pas
+    touchée : ni écriture, ni invalidation de ses statistiques. Un match
+    mis à jour garde son id_match en base ; un nouveau match reçoit le
+    suivant du maximum en base. Les agrégats matérialisés ne sont recalculés
+    que pour les éditions des partitions modifiées. Tout se fait en une
+    transaction.
+
+    Args:
+        conn: Connexion DB-API (psycopg2, ou engine.raw_connection())
+        matches: Matchs au schéma canonique (schema.MATCH_DTYPES)
+        teams: Équipes (id_team, nom_standard, confederation, aliases)
+        backend: Opérations SQL (PostgresBackend par défaut)
+        parent: Table partitionnée des matchs
+
+    Returns:
+        Dictionnaire {table ou partition modifiée: Changes}
+
+    Raises:
+        ValueError: Si des éditions ne tombent dans aucune partition
+    """
+    import pandas as pd
+
+    backend = backend or PostgresBackend()
+    matches = matches.rename(columns=MATCH_COLUMN_RENAMES)
+    text = _copy_text(matches, MATCH_DB_COLUMNS)
+    teams = _copy_text(teams, TEAM_DB_COLUMNS)
+    match_columns = MATCH_DB_COLUMNS[1:]
+    team_columns = TEAM_DB_COLUMNS[1:]
+
+    def fetch(table, columns):
+        rows = backend.fetch_rows(cursor, table, columns)
+        return pd.DataFrame([[_db_text(value) for value in row] for row in rows],
+                            columns=columns, dtype=object)
+
+    changes = {}
+    touched = set()
+    cursor = conn.cursor()
+    try:
+        bounds = backend.partitions(cursor, parent)
+        parts = split_by_partition(matches, bounds)
+
+        # Équipes ajoutées ou modifiées d'abord : les matchs les référencent
+        loaded_teams = fetch('teams', TEAM_DB_COLUMNS)
+        inserted, (updated, _), deleted_teams = diff_rows(
+            loaded_teams, teams, loaded_teams['id_team'], teams['id_team'], team_columns
+        )
+        _apply_changes(backend, cursor, 'teams', TEAM_DB_COLUMNS, ['id_team'],
+                       pd.concat([inserted, updated]), 'id_team', deleted_teams.iloc[:0])
+        team_changes = Changes(len(inserted), len(updated), len(deleted_teams))
+
+        # Partitions à relire : celles dont le résumé en base diffère (sans id_match, propre à la base)
+        changed = [
+            name for name, part in parts.items()
+            if backend.summarize_rows(cursor, name, match_columns)
+            != partition_summary(text.loc[part.index], match_columns)
+        ]
+        next_id = 1 + max((int(backend.max_value(cursor, name, 'id_match') or 0) for name in parts), default=0)
+        for name in changed:
+            loaded = fetch(name, MATCH_DB_COLUMNS)
+            part = text.loc[parts[name].index]
+            loaded_keys, part_keys = match_keys(loaded), match_keys(part)
+            inserted, (updated, previous), deleted = diff_rows(
+                loaded, part, loaded_keys, part_keys, match_columns
+            )
+            if not (len(inserted) or len(updated) or len(deleted)):
+                continue
+
+            # Nouveaux matchs : id_match après le maximum en base ; modifiés : id_match en base
+            inserted = inserted.assign(id_match=[str(i) for i in range(next_id, next_id + len(inserted))])
+            next_id += len(inserted)
+            updated = updated.assign(id_match=previous['id_match'])
+            _apply_changes(backend, cursor, name, MATCH_DB_COLUMNS, ['id_match', 'edition'],
+                           pd.concat([inserted, updated]), 'id_match', deleted)
+            changes[name] = Changes(len(inserted), len(updated), len(deleted))
+
+            # team_match référence les id_match de la base, pas ceux du DataFrame
+            db_ids = pd.concat([loaded['id_match'].set_axis(loaded_keys.to_numpy()), inserted['id_match']])
+            matches.loc[part.index, 'id_match'] = part_keys.map(db_ids).astype(int).to_numpy()
+            touched.update(int(edition) for edition in pd.concat([loaded, part])['edition'])
+
+        # Équipes disparues : après les matchs qui les référençaient
+        _apply_changes(backend, cursor, 'teams', TEAM_DB_COLUMNS, ['id_team'],
+                       teams.iloc[:0], 'id_team', deleted_teams)
+        if any(team_changes):
+            changes = {'teams': team_changes, **changes}
+        refresh_stats(backend, cursor, matches, touched)
+
+        backend.reset_sequence(cursor, 'teams', 'id_team')
+        backend.reset_sequence(cursor, parent, 'id_match')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return changes
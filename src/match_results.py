@@ -0,0 +1,163 @@
+"""
+Résolution des résultats des matchs pour le projet World Cup ETL.
+
+Un match nul en phase éliminatoire n'est pas un résultat final : le vainqueur
+(prolongation ou tirs au but) se déduit du tour suivant de la même édition.
+Ce module remplace le get_result ligne par ligne du notebook 04 par une
+résolution vectorisée : les participants de chaque (édition, tour) sont
+précalculés une seule fois dans une table d'appartenance, puis tous les nuls
+sont résolus par jointure sur cette table.
+"""
+
+# Finales remportées aux tirs au but (pas de tour suivant pour les départager)
+FINALS_PENALTY_WINNERS = {1994: 'Brazil (Brasil)', 2006: 'Italy (Italia)'}
+
+# Tours où un match nul est un résultat normal
+GROUP_ROUNDS = ['Preliminary', 'Group Stage', 'Second Group Stage']
+
+KNOCKOUT_ROUNDS = ['Round of 16', 'Quarter-finals', 'Semi-finals', 'Third Place', 'Final']
+
+# Le vainqueur d'un tour apparaît au tour suivant...
+WINNER_ROUND_MAP = {
+    'Round of 16': 'Quarter-finals',
+    'Quarter-finals': 'Semi-finals',
+    'Semi-finals': 'Final',
+}
+
+# ... et le perdant d'une demi-finale dispute le match pour la 3e place
+LOSER_ROUND_MAP = {'Semi-finals': 'Third Place'}
+
+TEAM_COLUMNS = ['home_team_id', 'away_team_id']
+
+
+def build_round_membership(matches, rounds=None):
+    """
+    Construit la table d'appartenance (édition, tour, équipe).
+
+    Chaque triplet n'apparaît qu'une fois : la table ne contient que les
+    participations réelles, pas une matrice éditions × tours × équipes.
+
+    Args:
+        matches: DataFrame avec edition, round, home_team_id et away_team_id
+        rounds: Tours à indexer (tous par défaut)
+
+    Returns:
+        DataFrame dédupliqué avec les colonnes edition, round et team
+    """
+    import pandas as pd
+
+    if rounds is not None:
+        matches = matches[matches['round'].isin(rounds)]
+
+    membership = pd.concat(
+        [
+            matches[['edition', 'round', column]].rename(columns={column: 'team'})
+            for column in TEAM_COLUMNS
+        ],
+        ignore_index=True,
+    )
+    return membership.dropna().drop_duplicates(ignore_index=True)
+
+
+def _is_member(editions, rounds, teams, membership):
+    """
+    Teste l'appartenance de chaque (édition, tour, équipe) par jointure.
+
+    Args:
+        editions, rounds, teams: Series alignées à tester
+        membership: Table retournée par build_round_membership
+
+    Returns:
+        Tableau booléen aligné sur les Series d'entrée
+    """
+    import pandas as pd
+
+    keys = pd.DataFrame({
+        'edition': editions.to_numpy(),
+        'round': rounds.to_numpy(),
+        'team': teams.to_numpy(),
+    })
+    joined = keys.merge(membership, on=['edition', 'round', 'team'], how='left', indicator=True)
+    return (joined['_merge'] == 'both').to_numpy()
+
+
+def resolve_knockout_results(matches, penalty_winners=FINALS_PENALTY_WINNERS):
+    """
+    Recalcule le résultat des matchs nuls en phase éliminatoire.
+
+    Seuls les matchs dont le résultat est 'draw', hors phase de groupes et
+    hors replay, sont recalculés ; les autres gardent leur résultat. Pour ces
+    matchs, dans l'ordre :
+    - le score départage s'il est différent ;
+    - pour une finale, le vainqueur connu aux tirs au but (penalty_winners) ;
+    - l'équipe présente au tour suivant (WINNER_ROUND_MAP) a gagné ;
+    - l'équipe présente au match pour la 3e place (LOSER_ROUND_MAP) a perdu ;
+    - sinon le match reste 'draw'.
+
+    Args:
+        matches: DataFrame avec home_team_id, away_team_id, home_result,
+            away_result, result, round, edition et éventuellement replay
+        penalty_winners: Dictionnaire {édition: équipe} des finales aux tirs au but
+
+    Returns:
+        Series result recalculée, alignée sur matches
+    """
+    import numpy as np
+
+    result = matches['result'].copy()
+
+    # Comme row.get('replay', False) : une valeur manquante compte comme replay
+    if 'replay' in matches.columns:
+        replay = matches['replay'].fillna(True).astype(bool)
+    else:
+        replay = False
+
+    to_resolve = (result == 'draw') & ~matches['round'].isin(GROUP_ROUNDS) & ~replay
+    draws = matches.loc[to_resolve]
+    if draws.empty:
+        return result
+
+    home, away = draws['home_team_id'], draws['away_team_id']
+
+    # 1. Score
+    home_wins = (draws['home_result'] > draws['away_result']).to_numpy(dtype=bool, na_value=False)
+    away_wins = (draws['home_result'] < draws['away_result']).to_numpy(dtype=bool, na_value=False)
+
+    # 2. Finales aux tirs au but
+    is_final = (draws['round'] == 'Final').to_numpy()
+    winner = draws['edition'].map(penalty_winners)
+    home_pen = is_final & (home == winner).to_numpy()
+    away_pen = is_final & (away == winner).to_numpy()
+
+    # 3. Présence au tour suivant
+    membership = build_round_membership(
+        matches, rounds=set(WINNER_ROUND_MAP.values()) | set(LOSER_ROUND_MAP.values())
+    )
+    next_round = draws['round'].map(WINNER_ROUND_MAP)
+    home_next = _is_member(draws['edition'], next_round, home, membership)
+    away_next = _is_member(draws['edition'], next_round, away, membership)
+
+    # 4. Présence au match pour la 3e place (le perdant)
+    loser_round = draws['round'].map(LOSER_ROUND_MAP)
+    home_loser = _is_member(draws['edition'], loser_round, home, membership)
+    away_loser = _is_member(draws['edition'], loser_round, away, membership)
+
+    # Conditions appliquées par priorité décroissante : np.select garde la première vraie
+    resolved = np.select(
+        [
+            home_wins,
+            away_wins,
+            home_pen,
+            away_pen,
+            home_next & ~away_next,
+            away_next & ~home_next,
+            home_loser & ~away_loser,
+            away_loser & ~home_loser,
+        ],
+        ['home_team', 'away_team', 'home_team', 'away_team',
+         'home_team', 'away_team', 'away_team', 'home_team'],
+        default='draw',
+    )
+
+    result.loc[to_resolve] = resolved
+    return result
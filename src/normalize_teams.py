@@ -6,21 +6,21 @@ et enrichit avec les confédérations et aliases.
 """
 
 import json
-import pandas as pd
+import os
 from pathlib import Path
 
 try:
     from .teams_reference import (
-        normalize_team_name,
-        get_confederation,
+        normalize_team_names,
+        get_confederations_for,
         get_aliases,
         build_alias_to_fifa_mapping,
         CONFEDERATIONS,
     )
 except ImportError:
     from teams_reference import (
-        normalize_team_name,
-        get_confederation,
+        normalize_team_names,
+        get_confederations_for,
         get_aliases,
         build_alias_to_fifa_mapping,
         CONFEDERATIONS,
@@ -33,55 +33,239 @@ OUTPUT_CSV = BASE_DIR / "data/processed/teams_traitees.csv"
 MATCHES_CSV = BASE_DIR / "data/processed/matches.csv"
 
 
-def normalize_teams(update_matches: bool = True):
+# Colonnes de matches.csv contenant des IDs d'équipes
+TEAM_ID_COLUMNS = ['home_team_id', 'away_team_id']
+
+# Nombre de lignes de matches.csv lues à la fois lors de la réécriture
+MATCHES_CHUNK_SIZE = 100_000
+
+
+class TeamIdRemapper:
     """
-    Normalise les noms des équipes et enrichit avec confederation et aliases.
+    Remappe les IDs d'équipes fusionnées dans les matchs en une seule passe.
+
+    Le mapping {ancien_id: nouvel_id} est compilé en un tableau de
+    correspondance indexé par ID, appliqué aux deux colonnes à la fois.
+    Les compteurs par ID (home/away) s'accumulent d'un bloc à l'autre,
+    ce qui permet de traiter un fichier par morceaux.
+    """
+
+    def __init__(self, id_mapping: dict):
+        import numpy as np
+
+        size = max(id_mapping) + 1 if id_mapping else 0
+        self.id_mapping = dict(id_mapping)
+        self.lookup = np.arange(size, dtype=np.int64)
+        for old_id, new_id in id_mapping.items():
+            self.lookup[old_id] = new_id
+
+        # counts[id, 0] = remplacements home, counts[id, 1] = remplacements away
+        self.counts = np.zeros((size, 2), dtype=np.int64)
+
+    def apply(self, matches):
+        """
+        Remappe un DataFrame de matchs (sans modifier l'original).
+
+        Args:
+            matches: DataFrame avec les colonnes home_team_id et away_team_id
+
+        Returns:
+            DataFrame avec les IDs remappés
+        """
+        import numpy as np
+
+        size = len(self.lookup)
+        values = matches[TEAM_ID_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        # Les NaN et IDs hors tableau ne sont pas concernés (comparaisons False)
+        in_range = (values >= 0) & (values < size)
+        old_ids = values[in_range].astype(np.int64)
+        new_ids = self.lookup[old_ids]
+        values[in_range] = new_ids
+
+        # Un seul bincount pour les compteurs home et away : code = id * 2 + colonne
+        changed = new_ids != old_ids
+        columns = np.nonzero(in_range)[1]
+        codes = old_ids[changed] * 2 + columns[changed]
+        self.counts += np.bincount(codes, minlength=2 * size).reshape(size, 2)
+
+        result = matches.copy(deep=False)
+        for position, column in enumerate(TEAM_ID_COLUMNS):
+            result[column] = values[:, position]
+            result[column] = result[column].astype(matches[column].dtype)
+        return result
+
+    def remap(self, matches):
+        """
+        Remappe un DataFrame en mémoire ou un itérable de DataFrames (chunks).
+
+        Args:
+            matches: DataFrame, ou itérable de DataFrames (ex: read_csv(chunksize=...))
+
+        Returns:
+            DataFrame remappé, ou générateur de chunks remappés
+        """
+        if hasattr(matches, 'columns'):
+            return self.apply(matches)
+        return (self.apply(chunk) for chunk in matches)
+
+    def report(self) -> list[tuple]:
+        """
+        Retourne les compteurs par ancien ID.
+
+        Returns:
+            Liste de tuples (ancien_id, nouvel_id, nb_home, nb_away)
+        """
+        return [
+            (old_id, new_id, int(self.counts[old_id, 0]), int(self.counts[old_id, 1]))
+            for old_id, new_id in self.id_mapping.items()
+        ]
+
+
+def _read_matches_chunks(matches_csv: Path, chunksize: int, usecols=None):
+    """
+    Lit matches.csv par morceaux de taille fixe.
+
+    Seules les colonnes d'IDs sont typées (Int64) ; les autres restent des
+    chaînes brutes, réécrites à l'identique.
 
     Args:
-        update_matches: Si True, met à jour matches.csv avec les IDs fusionnés
+        matches_csv: Chemin du fichier des matchs
+        chunksize: Nombre de lignes par morceau
+        usecols: Colonnes à lire (toutes par défaut)
 
     Returns:
-        Tuple (DataFrame résultat, liste des équipes non matchées)
+        Itérateur de DataFrames
     """
-    # Construire le mapping alias -> nom FIFA
-    alias_to_fifa = build_alias_to_fifa_mapping()
+    from collections import defaultdict
 
-    # Charger les données
-    df = pd.read_csv(TEAMS_CSV)
+    import pandas as pd
 
-    # Listes pour stocker les résultats
-    normalized_names = []
-    confederations = []
-    aliases_list = []
-    unmatched = []
+    return pd.read_csv(
+        matches_csv,
+        chunksize=chunksize,
+        usecols=usecols,
+        dtype=defaultdict(lambda: str, {column: 'Int64' for column in TEAM_ID_COLUMNS}),
+        keep_default_na=False,
+        na_values={column: [''] for column in TEAM_ID_COLUMNS},
+    )
 
-    for _, row in df.iterrows():
-        original_name = row['nom_standard']
 
-        # Chercher le nom FIFA officiel
-        if original_name in alias_to_fifa:
-            fifa_name = alias_to_fifa[original_name]
-        else:
-            # Essayer la normalisation avec gestion des cas spéciaux
-            fifa_name = normalize_team_name(original_name)
-            if fifa_name is None or fifa_name not in CONFEDERATIONS:
-                fifa_name = original_name
-                unmatched.append(original_name)
+def matches_reference_ids(
+    id_mapping: dict,
+    matches_csv: Path = MATCHES_CSV,
+    chunksize: int = MATCHES_CHUNK_SIZE,
+) -> bool:
+    """
+    Pré-scan rapide : vérifie si un ID à remapper apparaît dans matches.csv.
 
-        # Récupérer les données
-        confederation = get_confederation(fifa_name) or ''
-        aliases = get_aliases(fifa_name)
+    Seules les colonnes d'IDs sont lues, et la lecture s'arrête au premier
+    ID trouvé.
 
-        normalized_names.append(fifa_name)
-        confederations.append(confederation)
-        aliases_list.append(json.dumps(aliases, ensure_ascii=False))
+    Args:
+        id_mapping: Dictionnaire {ancien_id: nouvel_id}
+        matches_csv: Chemin du fichier des matchs
+        chunksize: Nombre de lignes par morceau
+
+    Returns:
+        True si au moins un ancien ID est présent
+    """
+    old_ids = list(id_mapping)
+    if not old_ids:
+        return False
+
+    with _read_matches_chunks(matches_csv, chunksize, usecols=TEAM_ID_COLUMNS) as reader:
+        for chunk in reader:
+            if chunk.isin(old_ids).to_numpy().any():
+                return True
+    return False
+
+
+def rewrite_matches_team_ids(
+    id_mapping: dict,
+    matches_csv: Path = MATCHES_CSV,
+    chunksize: int = MATCHES_CHUNK_SIZE,
+    skip_unchanged: bool = True,
+):
+    """
+    Réécrit matches.csv en flux avec les IDs fusionnés.
+
+    Le fichier est lu par morceaux de taille fixe (mémoire bornée quelle que
+    soit sa taille), écrit dans un fichier temporaire du même dossier puis
+    renommé atomiquement : en cas d'erreur, l'original reste intact.
+
+    Args:
+        id_mapping: Dictionnaire {ancien_id: nouvel_id}
+        matches_csv: Chemin du fichier des matchs
+        chunksize: Nombre de lignes par morceau
+        skip_unchanged: Si True, ne réécrit pas le fichier quand aucun
+            ancien ID n'y apparaît (voir matches_reference_ids)
+
+    Returns:
+        TeamIdRemapper avec les compteurs, ou None si la réécriture a été évitée
+    """
+    matches_csv = Path(matches_csv)
+    if skip_unchanged and not matches_reference_ids(id_mapping, matches_csv, chunksize):
+        return None
+
+    remapper = TeamIdRemapper(id_mapping)
+    tmp_path = matches_csv.with_name(matches_csv.name + '.tmp')
+    try:
+        with _read_matches_chunks(matches_csv, chunksize) as reader, \
+                open(tmp_path, 'w', encoding='utf-8', newline='') as output:
+            for position, chunk in enumerate(remapper.remap(reader)):
+                chunk.to_csv(output, index=False, header=position == 0)
+        os.replace(tmp_path, matches_csv)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return remapper
+
+
+def normalize_teams_frame(df):
+    """
+    Normalise un DataFrame d'équipes en mémoire (sans lecture ni écriture).
+
+    Args:
+        df: DataFrame avec les colonnes id_team et nom_standard (teams.csv)
+
+    Returns:
+        Tuple (DataFrame résultat dédupliqué, liste des équipes non matchées,
+        mapping {ancien_id: nouvel_id} des équipes fusionnées)
+    """
+    import pandas as pd
+
+    # Construire le mapping alias -> nom FIFA
+    alias_to_fifa = build_alias_to_fifa_mapping()
+
+    # Chaque nom distinct n'est résolu qu'une seule fois (voir normalize_team_names)
+    original_names = df['nom_standard']
+
+    # Chercher le nom FIFA officiel (correspondance exacte prioritaire)
+    direct_names = original_names.map(alias_to_fifa)
+    resolved_names = normalize_team_names(original_names).astype(object)
+
+    # Essayer la normalisation avec gestion des cas spéciaux
+    unresolved = direct_names.isna() & (
+        resolved_names.isna() | ~resolved_names.isin(CONFEDERATIONS.keys())
+    )
+    fifa_names = direct_names.fillna(resolved_names).where(~unresolved, original_names)
+    unmatched = original_names[unresolved].tolist()
+
+    # Récupérer les données
+    confederations = get_confederations_for(fifa_names).astype(object).fillna('')
+    aliases_by_name = {
+        name: json.dumps(get_aliases(name), ensure_ascii=False)
+        for name in fifa_names.unique()
+    }
 
     # Créer le DataFrame résultat
     df_result = pd.DataFrame({
         'id_team': df['id_team'],
-        'nom_standard': normalized_names,
+        'nom_standard': fifa_names,
         'confederation': confederations,
-        'aliases': aliases_list
+        'aliases': fifa_names.map(aliases_by_name)
     })
 
     # =========================================================================
@@ -123,6 +307,25 @@ def normalize_teams(update_matches: bool = True):
 
         print(f"\nÉquipes après déduplication: {len(df_result)}")
 
+    return df_result, unmatched, id_mapping
+
+
+def normalize_teams(update_matches: bool = True):
+    """
+    Normalise les noms des équipes et enrichit avec confederation et aliases.
+
+    Args:
+        update_matches: Si True, met à jour matches.csv avec les IDs fusionnés
+
+    Returns:
+        Tuple (DataFrame résultat, liste des équipes non matchées)
+    """
+    import pandas as pd
+
+    # Charger les données
+    df = pd.read_csv(TEAMS_CSV)
+    df_result, unmatched, id_mapping = normalize_teams_frame(df)
+
     # Sauvegarder teams_traitees.csv
     df_result.to_csv(OUTPUT_CSV, index=False, encoding='utf-8')
 
@@ -135,22 +338,18 @@ def normalize_teams(update_matches: bool = True):
         print("MISE À JOUR DES IDs DANS MATCHES.CSV")
         print("=" * 60)
 
-        matches_df = pd.read_csv(MATCHES_CSV)
+        remapper = rewrite_matches_team_ids(id_mapping, MATCHES_CSV)
         total_updates = 0
 
-        for old_id, new_id in id_mapping.items():
-            count_home = (matches_df['home_team_id'] == old_id).sum()
-            count_away = (matches_df['away_team_id'] == old_id).sum()
-
-            matches_df['home_team_id'] = matches_df['home_team_id'].replace(old_id, new_id)
-            matches_df['away_team_id'] = matches_df['away_team_id'].replace(old_id, new_id)
-
-            total = count_home + count_away
-            if total > 0:
-                print(f"  ID {old_id} → {new_id}: {count_home} (home) + {count_away} (away) = {total} matchs")
-                total_updates += total
+        if remapper is None:
+            print("  Aucun ID à remapper dans matches.csv, fichier inchangé")
+        else:
+            for old_id, new_id, count_home, count_away in remapper.report():
+                total = count_home + count_away
+                if total > 0:
+                    print(f"  ID {old_id} → {new_id}: {count_home} (home) + {count_away} (away) = {total} matchs")
+                    total_updates += total
 
-        matches_df.to_csv(MATCHES_CSV, index=False)
         print(f"\nTotal: {total_updates} références mises à jour dans matches.csv")
 
     # Rapport
@@ -169,6 +368,7 @@ def normalize_teams(update_matches: bool = True):
         print("\nToutes les équipes ont été matchées !")
 
     # Afficher quelques exemples de normalisation
+    alias_to_fifa = build_alias_to_fifa_mapping()
     original_names = df['nom_standard'].tolist()
     print("\nExemples de normalisation :")
     count = 0
@@ -0,0 +1,21 @@
+"""
+Pipeline ETL World Cup sans notebook.
+
+Remplace l'enchaînement manuel des notebooks 01b à 07 :
+
+    python -m src.pipeline --checkpoints data/staging
+
+Les étapes (pipeline.stages) forment un DAG (STAGES) exécuté par
+pipeline.scheduler sur un pool de processus : les étapes indépendantes
+tournent en parallèle et se passent les DataFrames en mémoire.
+run_pipeline écrit matches.csv et teams_traitees.csv dans data/processed.
+"""
+
+try:
+    from .runner import run_pipeline, STAGES
+    from .scheduler import Stage, run_dag, critical_path
+except ImportError:
+    from runner import run_pipeline, STAGES
+    from scheduler import Stage, run_dag, critical_path
+
+__all__ = ["run_pipeline", "STAGES", "Stage", "run_dag", "critical_path"]
@@ -0,0 +1,66 @@
+"""
+Point d'entrée en ligne de commande : python -m src.pipeline [options]
+"""
+
+import argparse
+from pathlib import Path
+
+try:
+    from ..db import get_engine
+except ImportError:
+    from db import get_engine
+
+try:
+    from .runner import run_pipeline, STAGING_DIR, ARTIFACT_DIR
+    from . import stages
+except ImportError:
+    from runner import run_pipeline, STAGING_DIR, ARTIFACT_DIR
+    import stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipeline",
+        description="Exécute le pipeline ETL World Cup (notebooks 01b à 07).",
+    )
+    parser.add_argument("--raw-dir", type=Path, default=stages.RAW_DIR,
+                        help="dossier des données brutes")
+    parser.add_argument("--processed-dir", type=Path, default=stages.PROCESSED_DIR,
+                        help="dossier de sortie des tables matches et teams_traitees")
+    parser.add_argument("--reference-dir", type=Path, default=stages.REFERENCE_DIR,
+                        help="dossier de teams_mapping.json")
+    parser.add_argument("--format", choices=["parquet", "csv", "both"], default="both",
+                        help="format des sorties de data/processed (défaut : both)")
+    parser.add_argument("--checkpoints", type=Path, nargs="?", const=STAGING_DIR, default=None,
+                        help=f"écrit les sorties intermédiaires (défaut : {STAGING_DIR})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="taille du pool de processus (1 : séquentiel ; défaut : nombre de CPU)")
+    parser.add_argument("--cache-dir", type=Path, default=ARTIFACT_DIR,
+                        help=f"cache d'artefacts des étapes (défaut : {ARTIFACT_DIR})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="recalcule toutes les étapes sans lire ni écrire le cache")
+    parser.add_argument("--explain", action="store_true",
+                        help="affiche pourquoi chaque étape est reconstruite")
+    parser.add_argument("--load", action="store_true",
+                        help="charge teams et matches dans PostgreSQL (variables du .env)")
+    parser.add_argument("--load-mode", choices=["replace", "upsert"], default="replace",
+                        help="replace : rechargement complet ; upsert : applique seulement "
+                             "les lignes modifiées (défaut : replace)")
+    args = parser.parse_args(argv)
+
+    run_pipeline(
+        raw_dir=args.raw_dir,
+        processed_dir=args.processed_dir,
+        reference_dir=args.reference_dir,
+        checkpoint_dir=args.checkpoints,
+        engine=get_engine() if args.load else None,
+        max_workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        explain=args.explain,
+        formats=("parquet", "csv") if args.format == "both" else (args.format,),
+        load_mode=args.load_mode,
+    )
+
+
+if __name__ == "__main__":
+    main()
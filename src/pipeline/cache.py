@@ -0,0 +1,328 @@
+"""
+Cache d'artefacts du pipeline : reconstruction incrémentale par empreinte.
+
+L'empreinte d'une étape combine la version et le code source de sa
+fonction (et des fonctions de son module qu'elle appelle), le SHA-256 des
+modules de src qu'elle utilise, de ses fichiers d'entrée et des constantes
+dont elle dépend, et les empreintes des étapes en amont. Une modification ne
+change donc que l'empreinte des étapes concernées et de leur aval : les
+autres sont relues depuis le cache au lieu d'être recalculées.
+"""
+
+import ast
+import dis
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pickle
+from pathlib import Path
+
+try:
+    from ..teams_reference import _file_digest, _stat_signature
+except ImportError:
+    from teams_reference import _file_digest, _stat_signature
+
+# Paquet parent des modules de src ("src" ou "" selon le mode d'import)
+_SRC_PACKAGE = __package__.rpartition('.')[0] if __package__ else ''
+
+# Dossier src : seuls ses modules entrent dans l'empreinte du code
+_SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+def _json_default(value):
+    """Sérialisation stable des valeurs non JSON (ensembles triés, sinon repr)."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def constant_digest(name: str) -> str:
+    """
+    Empreinte d'une constante de module désignée par "module.NOM".
+
+    Args:
+        name: Nom qualifié, ex: "teams_constants.ALIASES_MAPPING"
+
+    Returns:
+        SHA-256 de la sérialisation JSON (clés triées) de la valeur
+    """
+    module_name, _, attribute = name.rpartition('.')
+    if _SRC_PACKAGE:
+        module_name = f"{_SRC_PACKAGE}.{module_name}"
+    value = getattr(importlib.import_module(module_name), attribute)
+    try:
+        serialized = json.dumps(value, sort_keys=True, ensure_ascii=False, default=_json_default)
+    except TypeError:
+        # Clés de types mélangés : ordre d'insertion
+        serialized = json.dumps(value, ensure_ascii=False, default=_json_default)
+    return _sha256(serialized)
+
+
+def _src_path(obj) -> Path | None:
+    """Fichier de src où est défini obj (fonction, classe ou module), sinon None."""
+    module = obj if inspect.ismodule(obj) else inspect.getmodule(obj)
+    path = getattr(module, '__file__', None)
+    if path is None:
+        return None
+    path = Path(path).resolve()
+    return path if _SRC_DIR in path.parents else None
+
+
+def _global_names(code) -> set:
+    """Noms globaux lus par un objet code et ses fonctions imbriquées."""
+    names = {
+        instruction.argval for instruction in dis.get_instructions(code)
+        if instruction.opname in ('LOAD_GLOBAL', 'LOAD_NAME')
+    }
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _global_names(const)
+    return names
+
+
+def _imported_paths(path: Path) -> set:
+    """Fichiers de src importés par un module (imports relatifs ou à plat)."""
+    tree = ast.parse(path.read_text(encoding='utf-8'))
+    candidates = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            candidates += [(0, alias.name) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ''
+            candidates.append((node.level, module))
+            candidates += [(node.level, f"{module}.{alias.name}".strip('.')) for alias in node.names]
+
+    paths = set()
+    for level, name in candidates:
+        base = path.parent
+        for _ in range(level - 1):
+            base = base.parent
+        if level == 0:
+            base = _SRC_DIR
+            name = name.removeprefix(f"{_SRC_DIR.name}.")
+        target = base.joinpath(*name.split('.')) if name else base
+        for candidate in (target.with_suffix('.py'), target / '__init__.py'):
+            if candidate.is_file() and _SRC_DIR in candidate.resolve().parents:
+                paths.add(candidate.resolve())
+    return paths
+
+
+def _dependencies(func) -> tuple[list, set]:
+    """
+    Code dont dépend une fonction d'étape.
+
+    Les fonctions et classes de son propre module qu'elle appelle (de
+    proche en proche) sont retenues par leur code source ; les autres
+    modules de src qu'elle utilise le sont en entier, avec les modules de
+    src qu'ils importent à leur tour.
+
+    Returns:
+        Tuple (sources du module de l'étape, fichiers des autres modules)
+    """
+    own_path = _src_path(func)
+    sources, seen, pending = [], {id(func)}, [func]
+    modules = set()
+
+    while pending:
+        obj = pending.pop()
+        sources.append(inspect.getsource(obj))
+        code = getattr(obj, '__code__', None)
+        for name in _global_names(code) if code is not None else ():
+            value = obj.__globals__.get(name)
+            if not (inspect.isfunction(value) or inspect.isclass(value) or inspect.ismodule(value)):
+                continue
+            path = _src_path(value)
+            if path is None:
+                continue
+            if path != own_path or inspect.ismodule(value):
+                modules.add(path)
+            elif id(value) not in seen:
+                seen.add(id(value))
+                pending.append(value)
+
+    pending_modules = list(modules)
+    while pending_modules:
+        for path in _imported_paths(pending_modules.pop()):
+            if path != own_path and path not in modules:
+                modules.add(path)
+                pending_modules.append(path)
+    return sources, modules
+
+
+def code_digest(func) -> str:
+    """
+    Empreinte du code source d'une fonction d'étape.
+
+    Couvre aussi les fonctions de son module qu'elle appelle : modifier un
+    utilitaire local change l'empreinte de toutes les étapes qui s'en servent.
+    """
+    return _sha256("\n".join(_dependencies(func)[0]))
+
+
+def module_digests(func) -> dict:
+    """
+    Empreintes des modules de src utilisés par une fonction d'étape.
+
+    Args:
+        func: Fonction d'étape
+
+    Returns:
+        Dictionnaire {chemin relatif à src: SHA-256 du fichier}, ex:
+        {"cleaning.py": ...} pour une étape qui appelle parse_scores
+    """
+    return {
+        path.relative_to(_SRC_DIR).as_posix(): _file_digest(path)
+        for path in sorted(_dependencies(func)[1])
+    }
+
+
+class ArtifactCache:
+    """
+    Artefacts des étapes stockés sous data/staging.
+
+    Pour chaque étape, le dossier contient un manifeste <étape>.json
+    (empreinte et composantes) et la sortie sérialisée
+    <étape>-<empreinte>.pickle de la dernière exécution.
+    """
+
+    def __init__(self, directory: Path, paths: dict = None):
+        """
+        Args:
+            directory: Dossier des artefacts
+            paths: Valeurs des champs des fichiers d'entrée ({raw_dir}, ...)
+        """
+        self.directory = Path(directory)
+        self.paths = paths or {}
+
+    def _manifest_path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    def _artifact_path(self, name: str, fingerprint: str) -> Path:
+        return self.directory / f"{name}-{fingerprint[:16]}.pickle"
+
+    def read_manifest(self, name: str) -> dict | None:
+        """Manifeste de la dernière exécution de l'étape (None si absent/illisible)."""
+        try:
+            with open(self._manifest_path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _file_digests(self, stage, kwargs: dict, previous: dict | None) -> tuple[dict, dict]:
+        """
+        Empreintes des fichiers d'entrée d'une étape.
+
+        Un fichier dont la signature (mtime, taille) est celle du manifeste
+        précédent n'est pas relu.
+
+        Returns:
+            Tuple ({modèle: empreinte}, {modèle: signature})
+        """
+        old_digests = (previous or {}).get('files', {})
+        old_stats = (previous or {}).get('stats', {})
+        digests, stats = {}, {}
+        for template in stage.files:
+            path = Path(template.format(**{**self.paths, **kwargs}))
+            stats[template] = list(_stat_signature(path)[1:])
+            if template in old_digests and old_stats.get(template) == stats[template]:
+                digests[template] = old_digests[template]
+            else:
+                digests[template] = _file_digest(path)
+        return digests, stats
+
+    def plan(self, stages, stage_kwargs: dict = None) -> dict:
+        """
+        Calcule l'empreinte de chaque étape et les raisons de la reconstruire.
+
+        Args:
+            stages: Liste de Stage dans un ordre topologique
+            stage_kwargs: Arguments nommés par étape {nom: dict}
+
+        Returns:
+            Dictionnaire {nom: (empreinte, manifeste, raisons)} ; une liste de
+            raisons vide signifie que l'artefact en cache est à jour
+        """
+        stage_kwargs = stage_kwargs or {}
+        plan = {}
+        for stage in stages:
+            previous = self.read_manifest(stage.name)
+            files, stats = self._file_digests(stage, stage_kwargs.get(stage.name, {}), previous)
+            manifest = {
+                'version': stage.version,
+                'code': code_digest(stage.func),
+                'modules': module_digests(stage.func),
+                'files': files,
+                'constants': {name: constant_digest(name) for name in stage.constants},
+                'inputs': {name: plan[name][0] for name in stage.inputs if name in plan},
+            }
+            fingerprint = _sha256(json.dumps(manifest, sort_keys=True))
+            manifest['fingerprint'] = fingerprint
+            manifest['stats'] = stats
+
+            reasons = self._reasons(stage.name, manifest, previous)
+            plan[stage.name] = (fingerprint, manifest, reasons)
+        return plan
+
+    def _reasons(self, name: str, manifest: dict, previous: dict | None) -> list[str]:
+        """Raisons lisibles de reconstruire une étape (liste vide si à jour)."""
+        if previous is None:
+            return ["aucun artefact en cache"]
+        if previous.get('fingerprint') == manifest['fingerprint']:
+            if self._artifact_path(name, manifest['fingerprint']).exists():
+                return []
+            return ["artefact absent du cache"]
+
+        reasons = []
+        if previous.get('version') != manifest['version'] or previous.get('code') != manifest['code']:
+            reasons.append("code de l'étape modifié")
+        kinds = [('modules', "module"), ('files', "fichier"), ('constants', "constante"), ('inputs', "entrée")]
+        for kind, label in kinds:
+            old = previous.get(kind, {})
+            for key, digest in manifest[kind].items():
+                if old.get(key) != digest:
+                    shown = Path(key).name if kind == 'files' else key
+                    verb = "reconstruite" if kind == 'inputs' else ("modifiée" if kind == 'constants' else "modifié")
+                    reasons.append(f"{label} {shown} {verb}")
+        return reasons or ["empreinte modifiée"]
+
+    def load(self, name: str, fingerprint: str):
+        """Relit la sortie en cache d'une étape."""
+        with open(self._artifact_path(name, fingerprint), 'rb') as f:
+            return pickle.load(f)
+
+    def store(self, name: str, manifest: dict, output) -> None:
+        """
+        Enregistre la sortie d'une étape et son manifeste (écritures atomiques).
+
+        L'artefact de l'exécution précédente de l'étape est supprimé.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        previous = self.read_manifest(name)
+        artifact = self._artifact_path(name, manifest['fingerprint'])
+
+        for path, write in [
+            (artifact, lambda f: pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)),
+            (self._manifest_path(name), lambda f: f.write(json.dumps(manifest, indent=1).encode('utf-8'))),
+        ]:
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+
+        if previous is not None and previous.get('fingerprint') != manifest['fingerprint']:
+            self._artifact_path(name, previous['fingerprint']).unlink(missing_ok=True)
+
+    def explain(self, stages, stage_kwargs: dict = None) -> dict:
+        """
+        Explique pourquoi chaque étape serait reconstruite.
+
+        Returns:
+            Dictionnaire {nom: raisons} (liste vide : relue depuis le cache)
+        """
+        return {name: reasons for name, (_, _, reasons) in self.plan(stages, stage_kwargs).items()}
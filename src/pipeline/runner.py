@@ -0,0 +1,181 @@
+"""
+Enchaînement des étapes du pipeline, sans notebook.
+
+Les DataFrames passent d'une étape à l'autre en mémoire. Les points de
+contrôle CSV intermédiaires (mêmes noms que les exports des notebooks) ne
+sont écrits que sur demande, pour le débogage.
+"""
+
+import time
+from pathlib import Path
+
+try:
+    from ..analytics import HeadToHeadMatrix
+    from ..storage import write_matches_parquet, write_teams_parquet
+    from ..teams_reference import CONFEDERATIONS_CACHE, FIFA_RANKING_CSV
+except ImportError:
+    from analytics import HeadToHeadMatrix
+    from storage import write_matches_parquet, write_teams_parquet
+    from teams_reference import CONFEDERATIONS_CACHE, FIFA_RANKING_CSV
+
+try:
+    from . import stages
+    from .cache import ArtifactCache
+    from .scheduler import Stage, run_dag, format_report
+except ImportError:
+    import stages
+    from cache import ArtifactCache
+    from scheduler import Stage, run_dag, format_report
+
+STAGING_DIR = stages.BASE_DIR / "data/staging"
+ARTIFACT_DIR = STAGING_DIR / "artifacts"
+
+KNOCKOUT_CONSTANTS = (
+    "match_results.FINALS_PENALTY_WINNERS",
+    "match_results.GROUP_ROUNDS",
+    "match_results.WINNER_ROUND_MAP",
+    "match_results.LOSER_ROUND_MAP",
+)
+
+TEAMS_CONSTANTS = (
+    "teams_constants.ALIASES_MAPPING",
+    "teams_constants.HISTORICAL_TEAMS",
+    "teams_constants.ADDITIONAL_TEAMS",
+    "teams_constants.PLACEHOLDERS",
+    "teams_constants.PREFIX_ALIASES",
+)
+
+# DAG des étapes, dans un ordre topologique. Les quatre extractions et le
+# référentiel teams_mapping sont indépendants.
+STAGES = [
+    Stage("extract_1930_2010", stages.extract_1930_2010, [],
+          files=("{raw_dir}/matches_19302010 (1).csv",),
+          constants=("cleaning.ROUND_STAGES", "cleaning.SCORE_PATTERN", "pipeline.stages.PLACEHOLDER_TEAMS")),
+    Stage("extract_2014", stages.extract_2014, [],
+          files=("{raw_dir}/matche_2014.csv",)),
+    Stage("transform_1930_2014", stages.transform_1930_2014,
+          ["extract_1930_2010", "extract_2014"], "matches_1930_2014.csv",
+          constants=KNOCKOUT_CONSTANTS),
+    Stage("extract_2018", stages.extract_2018, [], "matches_2018_clean.csv",
+          files=("{raw_dir}/data_2018.json",),
+          constants=("pipeline.stages.KO_ROUND_MAP_2018",)),
+    Stage("extract_2022", stages.extract_2022, [], "df_matches_final.csv",
+          files=("{raw_dir}/matches_wc2022_en.json", "{processed_dir}/df_matches_final.csv"),
+          constants=("cleaning.ROUND_STAGES",)),
+    Stage("teams_mapping", stages.load_teams_mapping, [],
+          files=("{reference_dir}/teams_mapping.json",)),
+    Stage("concat_matches", stages.concat_matches,
+          ["transform_1930_2014", "extract_2018", "extract_2022"], "matches_concat.csv",
+          constants=KNOCKOUT_CONSTANTS),
+    Stage("build_teams", stages.build_teams, ["concat_matches"], "teams.csv"),
+    Stage("map_team_ids", stages.map_team_ids,
+          ["concat_matches", "build_teams", "teams_mapping"], "matches_with_ids.csv"),
+    # Les confédérations sont lues par teams_reference dans son propre
+    # data/reference, quel que soit reference_dir
+    Stage("normalize", stages.normalize, ["map_team_ids", "build_teams"],
+          files=(str(CONFEDERATIONS_CACHE), str(FIFA_RANKING_CSV)),
+          constants=TEAMS_CONSTANTS),
+]
+
+
+def build_stage_kwargs(raw_dir: Path, reference_dir: Path) -> dict:
+    """
+    Arguments de chemins des étapes qui lisent des fichiers.
+
+    Returns:
+        Dictionnaire {nom d'étape: kwargs}
+    """
+    stage_kwargs = {s.name: {"raw_dir": raw_dir} for s in STAGES if s.name.startswith("extract_")}
+    # Repli de l'extraction 2022 : export du notebook 03 dans data/processed
+    stage_kwargs["extract_2022"]["processed_dir"] = stages.PROCESSED_DIR
+    stage_kwargs["teams_mapping"] = {"reference_dir": reference_dir}
+    return stage_kwargs
+
+
+def run_pipeline(
+    raw_dir: Path = stages.RAW_DIR,
+    processed_dir: Path = stages.PROCESSED_DIR,
+    reference_dir: Path = stages.REFERENCE_DIR,
+    checkpoint_dir: Path = None,
+    engine=None,
+    max_workers: int = None,
+    cache_dir: Path = None,
+    explain: bool = False,
+    formats=("parquet", "csv"),
+    load_mode: str = "replace",
+):
+    """
+    Exécute le pipeline complet, des fichiers bruts aux tables matches et teams_traitees.
+
+    Args:
+        raw_dir: Dossier des données brutes
+        processed_dir: Dossier de sortie (matches.csv, teams_traitees.csv,
+            matrice des confrontations head_to_head.npy)
+        reference_dir: Dossier des données de référence (teams_mapping.json)
+        checkpoint_dir: Si renseigné, écrit les sorties intermédiaires dans ce dossier
+        engine: Engine SQLAlchemy ; si renseigné, charge les tables dans la base
+        max_workers: Taille du pool de processus des étapes (1 : exécution
+            séquentielle dans le processus courant) et nombre de
+            connexions du chargement
+        cache_dir: Si renseigné, cache d'artefacts : seules les étapes dont
+            les entrées, constantes ou code ont changé sont recalculées
+        explain: Si True, affiche pourquoi chaque étape est reconstruite
+        formats: Formats de sortie : "parquet" (matches.parquet partitionné
+            par édition, teams_traitees.parquet) et/ou "csv"
+        load_mode: "replace" (rechargement complet) ou "upsert" (seules
+            les lignes modifiées sont appliquées)
+
+    Returns:
+        Tuple (DataFrame matches, DataFrame teams)
+    """
+    raw_dir, processed_dir, reference_dir = Path(raw_dir), Path(processed_dir), Path(reference_dir)
+    if checkpoint_dir is not None:
+        checkpoint_dir = Path(checkpoint_dir)
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    checkpoints = {stage.name: stage.checkpoint for stage in STAGES}
+
+    def write_checkpoint(name, output):
+        if checkpoint_dir is not None and checkpoints[name] is not None:
+            output.to_csv(checkpoint_dir / checkpoints[name], index=False)
+
+    stage_kwargs = build_stage_kwargs(raw_dir, reference_dir)
+
+    cache = None
+    if cache_dir is not None:
+        cache = ArtifactCache(cache_dir, paths={"reference_dir": reference_dir})
+
+    start = time.perf_counter()
+    outputs, timings = run_dag(
+        STAGES,
+        stage_kwargs=stage_kwargs,
+        max_workers=max_workers,
+        on_done=write_checkpoint,
+        cache=cache,
+        explain=explain,
+    )
+    print(format_report(STAGES, timings, time.perf_counter() - start))
+
+    matches, teams, unmatched = outputs["normalize"]
+
+    processed_dir.mkdir(parents=True, exist_ok=True)
+    if "parquet" in formats:
+        write_matches_parquet(matches, processed_dir / "matches.parquet")
+        write_teams_parquet(teams, processed_dir / "teams_traitees.parquet")
+    if "csv" in formats:
+        matches.to_csv(processed_dir / "matches.csv", index=False)
+        teams.to_csv(processed_dir / "teams_traitees.csv", index=False, encoding='utf-8')
+    HeadToHeadMatrix.from_matches(matches).save(processed_dir / "head_to_head.npy")
+    print(f"✅ {len(matches)} matchs, {len(teams)} équipes écrits dans {processed_dir}")
+    if unmatched:
+        print(f"⚠️ {len(unmatched)} équipes non matchées : {unmatched}")
+
+    if engine is not None:
+        print("▶ load")
+        changes = stages.load(matches, teams, engine, workers=max_workers, mode=load_mode)
+        if load_mode == "upsert":
+            for table, (inserted, updated, deleted) in changes.items():
+                print(f"  {table} : +{inserted} ~{updated} -{deleted}")
+            print(f"  {len(changes)} table(s) modifiée(s)")
+
+    return matches, teams
@@ -0,0 +1,235 @@
+"""
+Ordonnanceur du pipeline : exécute un DAG d'étapes sur un pool de processus.
+
+Chaque étape déclare ses entrées (noms d'étapes précédentes ou de valeurs
+initiales) ; sa sortie porte son nom. Une étape est soumise dès que toutes
+ses entrées sont disponibles, si bien que les extractions indépendantes
+(1930-2010, 2014, 2018, 2022) tournent en parallèle et se rejoignent à
+concat_matches.
+"""
+
+import time
+from typing import Callable, NamedTuple, Optional
+
+
+class Stage(NamedTuple):
+    """
+    Étape du DAG : sa sortie porte le nom de l'étape.
+
+    files, constants et version alimentent l'empreinte du cache d'artefacts
+    (pipeline.cache) : fichiers lus par l'étape (modèles formatés avec les
+    dossiers, ex: "{raw_dir}/data_2018.json"), constantes "module.NOM" dont
+    elle dépend, et version à incrémenter pour forcer la reconstruction. Le
+    code de la fonction et des modules de src qu'elle utilise est pris en
+    compte automatiquement.
+    """
+    name: str
+    func: Callable
+    inputs: list
+    checkpoint: Optional[str] = None
+    files: tuple = ()
+    constants: tuple = ()
+    version: int = 1
+
+
+def _timed_call(func, args, kwargs):
+    """Exécute func dans le processus de travail et mesure sa durée."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def validate_dag(stages, initial=()):
+    """
+    Vérifie que chaque entrée est produite par une étape ou fournie au départ.
+
+    Args:
+        stages: Liste de Stage
+        initial: Noms des valeurs fournies au départ
+
+    Raises:
+        ValueError: Si un nom est en double, une entrée inconnue ou le graphe cyclique
+    """
+    names = [stage.name for stage in stages]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Étapes en double : {sorted(duplicates)}")
+
+    known = set(names) | set(initial)
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in known]
+        if missing:
+            raise ValueError(f"Entrées inconnues pour {stage.name} : {missing}")
+
+    # Tri topologique : s'il reste des étapes, elles forment un cycle
+    done = set(initial)
+    remaining = list(stages)
+    while remaining:
+        ready = [stage for stage in remaining if set(stage.inputs) <= done]
+        if not ready:
+            raise ValueError(f"Cycle entre les étapes : {[stage.name for stage in remaining]}")
+        done |= {stage.name for stage in ready}
+        remaining = [stage for stage in remaining if stage.name not in done]
+
+
+def critical_path(stages, timings: dict):
+    """
+    Calcule le chemin critique : la plus longue chaîne de dépendances en temps.
+
+    Seules les étapes exécutées (présentes dans timings) sont prises en
+    compte : une étape relue depuis le cache n'est pas sur le chemin.
+
+    Args:
+        stages: Liste de Stage
+        timings: Durée de chaque étape exécutée en secondes {nom: durée}
+
+    Returns:
+        Tuple (liste des noms d'étapes du chemin, durée totale en secondes) ;
+        ([], 0.0) si aucune étape n'a été exécutée
+    """
+    by_name = {stage.name: stage for stage in stages if stage.name in timings}
+    finish = {}
+    previous = {}
+
+    def finish_time(name):
+        if name not in finish:
+            parents = [i for i in by_name[name].inputs if i in by_name]
+            parent = max(parents, key=finish_time, default=None)
+            previous[name] = parent
+            finish[name] = timings[name] + (finish_time(parent) if parent else 0.0)
+        return finish[name]
+
+    if not by_name:
+        return [], 0.0
+    last = max(by_name, key=finish_time)
+
+    path = []
+    name = last
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return path[::-1], finish[last]
+
+
+def _use_cache(stages, outputs, stage_kwargs, cache, explain, on_done):
+    """
+    Relit depuis le cache les étapes à jour dont la sortie est utile.
+
+    Une étape à jour n'est relue que si une étape à reconstruire en dépend,
+    ou si rien n'en dépend (sortie finale du DAG).
+
+    Returns:
+        Tuple (étapes à exécuter, plan du cache)
+    """
+    plan = cache.plan(stages, stage_kwargs)
+    stale = {name for name, (_, _, reasons) in plan.items() if reasons}
+    dependents = {name for stage in stages for name in stage.inputs}
+    needed = {name for stage in stages if stage.name in stale for name in stage.inputs}
+    needed |= {stage.name for stage in stages if stage.name not in dependents}
+
+    for stage in stages:
+        fingerprint, _, reasons = plan[stage.name]
+        if reasons:
+            if explain:
+                print(f"↻ {stage.name} : {' ; '.join(reasons)}")
+        elif stage.name in needed:
+            print(f"✓ {stage.name} (cache)")
+            outputs[stage.name] = cache.load(stage.name, fingerprint)
+            if on_done is not None:
+                on_done(stage.name, outputs[stage.name])
+    return [stage for stage in stages if stage.name in stale], plan
+
+
+def run_dag(stages, initial=None, stage_kwargs=None, max_workers=None, on_done=None,
+            cache=None, explain=False):
+    """
+    Exécute les étapes dès que leurs entrées sont prêtes.
+
+    Args:
+        stages: Liste de Stage (fonctions de niveau module, sérialisables)
+        initial: Valeurs fournies au départ {nom: valeur}
+        stage_kwargs: Arguments nommés par étape {nom: dict}
+        max_workers: Taille du pool de processus ; 1 exécute tout dans le
+            processus courant, dans l'ordre de la liste
+        on_done: Fonction appelée (nom, sortie) à la fin de chaque étape
+        cache: ArtifactCache ; seules les étapes dont l'empreinte a changé
+            (et leur aval) sont exécutées
+        explain: Si True, affiche pourquoi chaque étape est reconstruite
+
+    Returns:
+        Tuple (sorties {nom: valeur}, durées {nom: secondes} des étapes
+        exécutées ; les étapes à jour dans le cache n'y figurent pas)
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+    outputs = dict(initial or {})
+    stage_kwargs = stage_kwargs or {}
+    validate_dag(stages, outputs)
+    timings = {}
+
+    plan = None
+    if cache is not None:
+        stages, plan = _use_cache(stages, outputs, stage_kwargs, cache, explain, on_done)
+
+    def finish(name, result, elapsed):
+        outputs[name] = result
+        timings[name] = elapsed
+        if plan is not None:
+            cache.store(name, plan[name][1], result)
+        if on_done is not None:
+            on_done(name, result)
+
+    if max_workers == 1:
+        pending = list(stages)
+        while pending:
+            stage = next(s for s in pending if all(i in outputs for i in s.inputs))
+            pending.remove(stage)
+            print(f"▶ {stage.name}")
+            args = [outputs[i] for i in stage.inputs]
+            finish(stage.name, *_timed_call(stage.func, args, stage_kwargs.get(stage.name, {})))
+        return outputs, timings
+
+    pending = list(stages)
+    running = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for stage in [s for s in pending if all(i in outputs for i in s.inputs)]:
+                pending.remove(stage)
+                print(f"▶ {stage.name}")
+                args = [outputs[i] for i in stage.inputs]
+                future = pool.submit(_timed_call, stage.func, args, stage_kwargs.get(stage.name, {}))
+                running[future] = stage.name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), *future.result())
+
+    return outputs, timings
+
+
+def format_report(stages, timings: dict, wall_time: float) -> str:
+    """
+    Met en forme les durées par étape et le chemin critique.
+
+    Args:
+        stages: Liste de Stage
+        timings: Durée de chaque étape exécutée {nom: secondes}
+        wall_time: Durée totale mesurée du DAG
+
+    Returns:
+        Rapport multi-lignes
+    """
+    path, length = critical_path(stages, timings)
+    lines = ["Durée par étape :"]
+    for stage in stages:
+        marker = "*" if stage.name in path else " "
+        if stage.name in timings:
+            lines.append(f"  {marker} {stage.name:<22} {timings[stage.name]:8.3f}s")
+        else:
+            lines.append(f"  {marker} {stage.name:<22}    cache")
+    if path:
+        lines.append(f"Chemin critique ({length:.3f}s) : {' → '.join(path)}")
+    else:
+        lines.append("Chemin critique : aucune étape exécutée (tout en cache)")
+    lines.append(f"Durée totale : {wall_time:.3f}s (somme des étapes : {sum(timings.values()):.3f}s)")
+    return "\n".join(lines)
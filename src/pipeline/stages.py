@@ -0,0 +1,404 @@
+"""
+Étapes du pipeline ETL World Cup.
+
+Chaque étape reprend la logique d'un notebook (01b à 07) sous forme d'une
+fonction qui reçoit et retourne des DataFrames : les étapes s'enchaînent en
+mémoire, sans relire les CSV écrits par l'étape précédente. Les tables de
+matchs retournées sont au schéma canonique (schema.coerce_matches).
+"""
+
+import json
+from pathlib import Path
+
+try:
+    from ..cleaning import clean_round_name, clean_round_names, parse_scores
+    from ..load import load_database, upsert_database
+    from ..match_results import resolve_knockout_results
+    from ..normalize_teams import normalize_teams_frame, TeamIdRemapper
+    from ..schema import MATCH_COLUMNS, coerce_matches, coerce_teams
+except ImportError:
+    from cleaning import clean_round_name, clean_round_names, parse_scores
+    from load import load_database, upsert_database
+    from match_results import resolve_knockout_results
+    from normalize_teams import normalize_teams_frame, TeamIdRemapper
+    from schema import MATCH_COLUMNS, coerce_matches, coerce_teams
+
+# Chemins des fichiers
+BASE_DIR = Path(__file__).parent.parent.parent
+RAW_DIR = BASE_DIR / "data/raw"
+PROCESSED_DIR = BASE_DIR / "data/processed"
+REFERENCE_DIR = BASE_DIR / "data/reference"
+
+# Équipes fictives des tableaux (vainqueur du groupe A, etc.) à exclure
+PLACEHOLDER_TEAMS = [
+    'A1', 'A2', 'B1', 'B2', 'C1', 'C2', 'D1', 'D2', 'E1', 'E2', 'F1', 'F2', 'G1', 'G2', 'H1', 'H2',
+    'WINNER', 'LOSER', '1', '2', '3', '4', '5', '6', '7', '8', 'A', 'B', 'C', 'D',
+]
+
+# Clés des tours éliminatoires du JSON 2018
+KO_ROUND_MAP_2018 = {
+    "round_16": "Round of 16",
+    "round_8": "Quarter-finals",
+    "round_4": "Semi-finals",
+    "round_2_loser": "Third Place",
+    "round_2": "Final",
+}
+
+
+def _result_from_scores(home, away):
+    """Résultat 'home_team' / 'away_team' / 'draw' d'après deux Series de scores."""
+    import numpy as np
+
+    home_wins = (home > away).to_numpy(dtype=bool, na_value=False)
+    away_wins = (home < away).to_numpy(dtype=bool, na_value=False)
+    return np.select([home_wins, away_wins], ['home_team', 'away_team'], default='draw')
+
+
+def extract_1930_2010(raw_dir: Path = RAW_DIR):
+    """
+    Extrait et nettoie l'historique 1930-2010 (notebook 01b).
+
+    Args:
+        raw_dir: Dossier des données brutes
+
+    Returns:
+        DataFrame au format intermédiaire de 01b (edition_year, round, team1,
+        team2, score_team1, ...), placeholders et matchs sans score exclus
+    """
+    import pandas as pd
+
+    df = pd.read_csv(Path(raw_dir) / "matches_19302010 (1).csv")
+
+    df[['edition_year', 'host_country']] = df['edition'].str.split('-', n=1, expand=True)
+    df['edition_year'] = df['edition_year'].astype(int)
+    df = df.drop(columns=['edition'])
+
+    df['round'] = clean_round_names(df['round']).astype(object)
+
+    parsed = parse_scores(df['score'])
+    scores = parsed[['score_team1', 'score_team2']]
+    flags = parsed[['extra_time', 'penalty_shootout', 'replay']].astype(bool)
+    df = pd.concat([df, scores, flags], axis=1).drop(columns=['score', 'url'])
+
+    # Les noms gardent leur suffixe local ("Mexico (México)"), résolu plus tard par teams_reference
+    df['team1'] = df['team1'].astype(str).str.strip()
+    df['team2'] = df['team2'].astype(str).str.strip()
+    df['venue'] = df['venue'].str.replace('.', '', regex=False).str.replace('_', ' ', regex=False)
+
+    df = df[~df['team1'].isin(PLACEHOLDER_TEAMS) & ~df['team2'].isin(PLACEHOLDER_TEAMS)]
+    return df[df['score_team1'].notna()]
+
+
+def extract_2014(raw_dir: Path = RAW_DIR):
+    """
+    Lit l'édition 2014, déjà au format intermédiaire de 01b (matche_2014.csv).
+
+    Args:
+        raw_dir: Dossier des données brutes
+
+    Returns:
+        DataFrame au format intermédiaire de 01b
+    """
+    import pandas as pd
+
+    return pd.read_csv(Path(raw_dir) / "matche_2014.csv")
+
+
+def transform_1930_2014(df_1930_2010, df_2014):
+    """
+    Assemble 1930-2014 au schéma cible et calcule les résultats (notebook 01b).
+
+    Args:
+        df_1930_2010: Sortie de extract_1930_2010
+        df_2014: Sortie de extract_2014
+
+    Returns:
+        DataFrame au schéma MATCH_COLUMNS (noms d'équipes dans les colonnes *_team_id)
+    """
+    import pandas as pd
+
+    df = pd.concat([df_1930_2010, df_2014], ignore_index=True)
+
+    matches = pd.DataFrame({
+        'id_match': range(1, len(df) + 1),
+        'home_team_id': df['team1'].values,
+        'away_team_id': df['team2'].values,
+        'home_result': df['score_team1'].astype('Int64').values,
+        'away_result': df['score_team2'].astype('Int64').values,
+        'result': None,
+        'extra_time': df['extra_time'].astype(bool).values,
+        'penalties': df['penalty_shootout'].astype(bool).values,
+        'replay': df['replay'].astype(bool).values,
+        'date': None,
+        'round': df['round'].values,
+        'city': df['venue'].values,
+        'id_stadium': None,
+        'edition': df['edition_year'].values,
+    })
+    matches['result'] = _result_from_scores(matches['home_result'], matches['away_result'])
+    matches['result'] = resolve_knockout_results(matches)
+    return coerce_matches(matches)
+
+
+def extract_2018(raw_dir: Path = RAW_DIR):
+    """
+    Extrait et transforme l'édition 2018 depuis le JSON (notebooks 02a et 02b).
+
+    Args:
+        raw_dir: Dossier des données brutes
+
+    Returns:
+        DataFrame au schéma MATCH_COLUMNS
+    """
+    import pandas as pd
+
+    with open(Path(raw_dir) / "data_2018.json", "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    teams = {t["id"]: t["name"] for t in data["teams"]}
+    stadium_names = {s["id"]: s.get("name") for s in data["stadiums"]}
+    stadium_cities = {s["id"]: s.get("city") for s in data["stadiums"]}
+
+    rounds = [("Group Stage", group["matches"]) for group in data["groups"].values()]
+    rounds += [(KO_ROUND_MAP_2018.get(key), ko["matches"]) for key, ko in data["knockout"].items()]
+
+    rows = []
+    for round_name, matches in rounds:
+        for m in matches:
+            rows.append({
+                "id_match": m.get("name"),
+                "home_team_id": teams.get(m.get("home_team")),
+                "away_team_id": teams.get(m.get("away_team")),
+                "home_result": m.get("home_result"),
+                "away_result": m.get("away_result"),
+                "home_penalty": m.get("home_penalty") if round_name != "Group Stage" else None,
+                "away_penalty": m.get("away_penalty") if round_name != "Group Stage" else None,
+                "date": m.get("date"),
+                "round": round_name,
+                "city": stadium_cities.get(m.get("stadium")),
+                "id_stadium": stadium_names.get(m.get("stadium")),
+            })
+    df = pd.DataFrame(rows)
+
+    df["date"] = pd.to_datetime(df["date"], errors="coerce", utc=True).dt.strftime("%Y-%m-%d")
+    df["home_result"] = pd.to_numeric(df["home_result"], errors="coerce")
+    df["away_result"] = pd.to_numeric(df["away_result"], errors="coerce")
+    df["result"] = _result_from_scores(df["home_result"], df["away_result"])
+
+    knockout = df["round"] != "Group Stage"
+    df["extra_time"] = knockout & (df["home_result"] == df["away_result"])
+    df["penalties"] = df["home_penalty"].notna() & df["away_penalty"].notna()
+    df["replay"] = False
+    df["edition"] = 2018
+    return coerce_matches(df[MATCH_COLUMNS])
+
+
+def extract_2022(raw_dir: Path = RAW_DIR, processed_dir: Path = PROCESSED_DIR):
+    """
+    Extrait l'édition 2022 depuis le JSON de l'API FIFA (notebook 03).
+
+    Sans matches_wc2022_en.json (téléchargé par le notebook 03), l'export
+    df_matches_final.csv du notebook est utilisé à la place.
+
+    Args:
+        raw_dir: Dossier des données brutes
+        processed_dir: Dossier contenant df_matches_final.csv
+
+    Returns:
+        DataFrame au schéma MATCH_COLUMNS
+    """
+    import pandas as pd
+
+    json_path = Path(raw_dir) / "matches_wc2022_en.json"
+    if not json_path.exists():
+        print(f"ℹ️ {json_path.name} absent, lecture de df_matches_final.csv")
+        return coerce_matches(pd.read_csv(Path(processed_dir) / "df_matches_final.csv"))
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        wc_data = json.load(f)
+
+    rows = []
+    for match in wc_data['Results']:
+        stage = match['StageName'][0]['Description']
+        group = match['GroupName'][0]['Description'] if match['GroupName'] else None
+        pen_home = match.get('HomeTeamPenaltyScore', 0)
+        pen_away = match.get('AwayTeamPenaltyScore', 0)
+        is_penalties = (pen_home > 0 or pen_away > 0)
+
+        rows.append({
+            'home_team_id': match['Home']['TeamName'][0]['Description'].title(),
+            'away_team_id': match['Away']['TeamName'][0]['Description'].title(),
+            'home_result': match.get('HomeTeamScore', 0),
+            'away_result': match.get('AwayTeamScore', 0),
+            'total_home': match.get('HomeTeamScore', 0) + pen_home,
+            'total_away': match.get('AwayTeamScore', 0) + pen_away,
+            'extra_time': is_penalties,
+            'penalties': is_penalties,
+            'date': match.get('Date'),
+            'round': clean_round_name(group if (stage == "First stage" and group) else stage),
+            'city': match['Stadium']['CityName'][0]['Description'],
+            'id_stadium': match['Stadium']['Name'][0]['Description'],
+        })
+    df = pd.DataFrame(rows)
+
+    df['date'] = pd.to_datetime(df['date'], utc=True).dt.strftime('%Y-%m-%d')
+    df['result'] = _result_from_scores(df['total_home'], df['total_away'])
+    df['id_match'] = range(1, len(df) + 1)
+    df['replay'] = False
+    df['edition'] = 2022
+    return coerce_matches(df[MATCH_COLUMNS])
+
+
+def concat_matches(*frames):
+    """
+    Concatène les éditions, régénère id_match et résout les nuls (notebook 04).
+
+    Args:
+        frames: DataFrames au schéma MATCH_COLUMNS, dans l'ordre chronologique
+
+    Returns:
+        DataFrame unique trié par édition et date
+    """
+    import pandas as pd
+
+    df_all = pd.concat([frame[MATCH_COLUMNS] for frame in frames], ignore_index=True)
+    df_all = df_all.drop(columns=['id_match'])
+    df_all = df_all.sort_values(by=['edition', 'date']).reset_index(drop=True)
+    df_all.insert(0, 'id_match', range(1, len(df_all) + 1))
+
+    df_all['result'] = resolve_knockout_results(df_all)
+    return coerce_matches(df_all)
+
+
+def build_teams(matches):
+    """
+    Crée la table des équipes distinctes des matchs (notebook 04).
+
+    Args:
+        matches: Sortie de concat_matches (noms d'équipes)
+
+    Returns:
+        DataFrame teams (id_team, nom_standard, confederation, aliases)
+    """
+    import pandas as pd
+
+    names = pd.concat([matches['home_team_id'], matches['away_team_id']]).astype(object)
+    equipes = sorted(names.unique())
+    return coerce_teams(pd.DataFrame({
+        'id_team': range(1, len(equipes) + 1),
+        'nom_standard': equipes,
+        'confederation': None,
+        'aliases': '[]',
+    }))
+
+
+def load_teams_mapping(reference_dir: Path = REFERENCE_DIR) -> dict:
+    """
+    Charge le référentiel teams_mapping.json (notebook 05).
+
+    Args:
+        reference_dir: Dossier des données de référence
+
+    Returns:
+        Dictionnaire {nom standard: {aliases, confederation, ...}}
+    """
+    with open(Path(reference_dir) / "teams_mapping.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def map_team_ids(matches, teams, teams_mapping: dict):
+    """
+    Remplace les noms d'équipes des matchs par leurs IDs (notebook 05b).
+
+    Args:
+        matches: Sortie de concat_matches
+        teams: Sortie de build_teams
+        teams_mapping: Référentiel {nom standard: {aliases, ...}}
+
+    Returns:
+        DataFrame des matchs avec home_team_id / away_team_id en Int64
+
+    Raises:
+        ValueError: Si une équipe n'a pas d'ID
+    """
+    name_to_id = {}
+    for team_id, nom in zip(teams['id_team'], teams['nom_standard']):
+        for variant in (nom, nom.lower(), nom.upper(), nom.title()):
+            name_to_id[variant] = team_id
+        for alias in teams_mapping.get(nom, {}).get('aliases', []):
+            for variant in (alias, alias.lower(), alias.upper()):
+                name_to_id[variant] = team_id
+
+    def lookup(name):
+        name = str(name).strip()
+        return (name_to_id.get(name) or
+                name_to_id.get(name.lower()) or
+                name_to_id.get(name.title()) or
+                name_to_id.get(name.upper()))
+
+    matches = matches.copy()
+    unmapped = set()
+    for column in ['home_team_id', 'away_team_id']:
+        names = matches[column].astype(object)
+        # Une résolution par nom distinct
+        ids = names.map({name: lookup(name) for name in names.dropna().unique()})
+        unmapped |= set(names[ids.isna() & names.notna()])
+        matches[column] = ids.astype('Int64')
+
+    if unmapped:
+        raise ValueError(f"Équipes non mappées : {sorted(unmapped)}")
+    return coerce_matches(matches)
+
+
+def normalize(matches, teams):
+    """
+    Normalise les équipes et fusionne les IDs en doublon (notebook 06).
+
+    Args:
+        matches: Sortie de map_team_ids
+        teams: Sortie de build_teams
+
+    Returns:
+        Tuple (matches avec IDs fusionnés, teams normalisées, équipes non matchées)
+    """
+    teams_result, unmatched, id_mapping = normalize_teams_frame(teams)
+    if id_mapping:
+        matches = TeamIdRemapper(id_mapping).remap(matches)
+    return coerce_matches(matches), coerce_teams(teams_result), unmatched
+
+
+def load(matches, teams, engine, workers=None, mode="replace"):
+    """
+    Charge teams et matches dans PostgreSQL (notebook 07).
+
+    En mode "replace", les tables sont rechargées par COPY
+    (load.load_database) : les partitions sont chargées en parallèle sur des
+    connexions de l'engine, puis échangées avec les anciennes en une seule
+    transaction. En mode "upsert", seules les différences avec la base sont
+    appliquées (load.upsert_database).
+
+    Args:
+        matches: Matchs au schéma canonique
+        teams: Équipes normalisées
+        engine: Engine SQLAlchemy
+        workers: Connexions simultanées au plus (défaut : nombre de CPU)
+        mode: "replace" ou "upsert"
+
+    Returns:
+        "replace" : dictionnaire {table ou partition: nombre de lignes
+        copiées} ; "upsert" : dictionnaire {table ou partition modifiée:
+        Changes}
+
+    Raises:
+        ValueError: Si le mode est inconnu
+    """
+    if mode not in ("replace", "upsert"):
+        raise ValueError(f"Mode de chargement inconnu : {mode}")
+
+    conn = engine.raw_connection()
+    try:
+        if mode == "upsert":
+            return upsert_database(conn, matches, teams)
+        return load_database(conn, matches, teams, connect=engine.raw_connection, workers=workers)
+    finally:
+        conn.close()
@@ -0,0 +1,166 @@
+"""
+Schéma canonique des tables matches et teams.
+
+Définit les dtypes de chaque colonne, dans leur représentation la plus
+compacte (IDs Int16, scores UInt8, Categorical pour les libellés répétés,
+dates en secondes), et les fonctions qui y convertissent un DataFrame.
+Chaque étape du pipeline retourne des tables passées par coerce_matches :
+les types ne dépendent plus du chemin suivi (CSV relu, JSON, concat).
+"""
+
+try:
+    from .cleaning import ROUND_STAGES, canonical_round_name
+except ImportError:
+    from cleaning import ROUND_STAGES, canonical_round_name
+
+RESULT_VALUES = ['home_team', 'away_team', 'draw']
+
+TEAM_ID_COLUMNS = ['home_team_id', 'away_team_id']
+
+# Dtypes canoniques de la table des matchs, dans l'ordre des colonnes.
+# "category" : Categorical sans catégories imposées (city, id_stadium).
+MATCH_DTYPES = {
+    'id_match': 'Int32',
+    'home_team_id': 'Int16',
+    'away_team_id': 'Int16',
+    'home_result': 'UInt8',
+    'away_result': 'UInt8',
+    'result': 'result',
+    'extra_time': 'boolean',
+    'penalties': 'boolean',
+    'replay': 'boolean',
+    'date': 'datetime64[s]',
+    'round': 'round',
+    'city': 'category',
+    'id_stadium': 'category',
+    'edition': 'Int16',
+}
+
+MATCH_COLUMNS = list(MATCH_DTYPES)
+
+TEAM_DTYPES = {
+    'id_team': 'Int16',
+    'nom_standard': 'object',
+    'confederation': 'category',
+    'aliases': 'object',
+}
+
+
+def _resolve_dtype(name: str):
+    """Dtype pandas d'après son nom dans MATCH_DTYPES / TEAM_DTYPES."""
+    import pandas as pd
+
+    if name == 'result':
+        return pd.CategoricalDtype(RESULT_VALUES)
+    if name == 'round':
+        return pd.CategoricalDtype(ROUND_STAGES, ordered=True)
+    return pd.api.types.pandas_dtype(name)
+
+
+def _coerce_rounds(series):
+    """
+    Convertit les libellés de tours en Categorical ordonné (ROUND_STAGES).
+
+    Raises:
+        ValueError: Si un libellé ne correspond à aucune étape
+    """
+    import numpy as np
+    import pandas as pd
+
+    dtype = _resolve_dtype('round')
+    if series.dtype == dtype:
+        return series
+
+    codes, uniques = pd.factorize(series)
+    stages = [canonical_round_name(label) for label in uniques]
+    unknown = [label for label, stage in zip(uniques, stages) if stage is None]
+    if unknown:
+        raise ValueError(f"Tours inconnus : {unknown}")
+
+    # Code -1 de factorize (valeur manquante) : reste manquant
+    stage_codes = np.array([ROUND_STAGES.index(stage) for stage in stages] + [-1], dtype=np.int8)
+    rounds = pd.Categorical.from_codes(stage_codes[codes], dtype=dtype)
+    return pd.Series(rounds, index=series.index, name=series.name)
+
+
+def _coerce_team_ids(series):
+    """
+    IDs d'équipes en Int16 ; tant que la colonne contient des noms
+    (avant map_team_ids), Categorical des noms.
+    """
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype('Int16')
+    return series.astype('category')
+
+
+def _coerce_column(series, type_name: str):
+    """Convertit une colonne vers son dtype canonique."""
+    import pandas as pd
+
+    if type_name == 'round':
+        return _coerce_rounds(series)
+    if type_name.startswith('datetime64'):
+        dates = pd.to_datetime(series, errors='coerce', utc=True, format='ISO8601').dt.tz_localize(None)
+        return dates.astype(type_name)
+    if type_name in ('category', 'result'):
+        # Chaînes vides des CSV relus = valeur manquante
+        series = series.astype(object).where(series.notna() & (series != ''), None)
+    if type_name == 'boolean' and series.dtype == object:
+        series = series.map({True: True, False: False, 'True': True, 'False': False})
+    return series.astype(_resolve_dtype(type_name))
+
+
+def coerce_matches(df):
+    """
+    Convertit une table de matchs vers le schéma canonique MATCH_DTYPES.
+
+    Les colonnes absentes sont ignorées ; les colonnes hors schéma sont
+    conservées telles quelles, après les colonnes du schéma. Les tours
+    sont ramenés aux étapes de ROUND_STAGES.
+
+    Args:
+        df: DataFrame de matchs (sortie d'une étape, CSV relu, ...)
+
+    Returns:
+        Nouveau DataFrame aux dtypes canoniques
+
+    Raises:
+        ValueError: Si un tour est inconnu ou une valeur hors de son type
+            (ex: score négatif)
+    """
+    import pandas as pd
+
+    columns = {}
+    for column, type_name in MATCH_DTYPES.items():
+        if column not in df.columns:
+            continue
+        try:
+            if column in TEAM_ID_COLUMNS:
+                columns[column] = _coerce_team_ids(df[column])
+            else:
+                columns[column] = _coerce_column(df[column], type_name)
+        except TypeError as e:
+            raise ValueError(f"Colonne {column} incompatible avec {type_name} : {e}") from e
+    for column in df.columns:
+        if column not in columns:
+            columns[column] = df[column]
+    return pd.DataFrame(columns, index=df.index)
+
+
+def coerce_teams(df):
+    """
+    Convertit une table d'équipes vers le schéma canonique TEAM_DTYPES.
+
+    Args:
+        df: DataFrame d'équipes
+
+    Returns:
+        Nouveau DataFrame aux dtypes canoniques
+    """
+    result = df.copy()
+    for column, type_name in TEAM_DTYPES.items():
+        if column in result.columns:
+            result[column] = _coerce_column(result[column], type_name)
+    return result
@@ -0,0 +1,442 @@
+"""
+Agrégats matérialisés des matchs pour les requêtes d'analyse (notebooks 08 et 09).
+
+Les vues v_team_stats, v_team_by_edition et v_head_to_head du notebook 00
+réagrègent toute la table matches à chaque appel, avec des jointures
+t.id_team IN (m.home_team_id, m.away_team_id) qu'aucun index simple ne sert.
+Ce module calcule une table de faits et deux tables d'agrégats :
+
+- team_match : une ligne par équipe et par match (buts pour / contre,
+  issue, domicile), indexée par (team_id, edition) ; les requêtes par
+  équipe y sont de simples jointures sur team_id, sans OR ;
+- team_edition_stats : une ligne par (équipe, édition) ;
+- pair_edition_stats : une ligne par (paire d'équipes, édition), la plus
+  petite ID en team_a_id.
+
+Au grain de l'édition, un chargement ne recalcule que les éditions qu'il a
+touchées (load.load_database / load.upsert_database), et les requêtes de
+STATS_QUERIES ne lisent que les lignes des équipes demandées : au plus une
+par édition, au lieu de tout l'historique. Comme les vues, les agrégats
+excluent les matchs Preliminary ; team_match les contient tous.
+"""
+
+try:
+    from .db import run_query
+except ImportError:
+    from db import run_query
+
+TEAM_MATCH_COLUMNS = [
+    'id_match', 'edition', 'team_id', 'opponent_id', 'is_home', 'goals_for', 'goals_against',
+    'outcome', 'round', 'extra_time', 'penalties',
+]
+
+TEAM_EDITION_COLUMNS = [
+    'id_team', 'edition', 'matches', 'wins', 'draws', 'losses', 'goals_for', 'goals_against',
+    'clean_sheets', 'extra_time_matches', 'penalty_matches', 'best_round_rank', 'finals', 'titles',
+]
+
+PAIR_EDITION_COLUMNS = [
+    'team_a_id', 'team_b_id', 'edition', 'matches', 'team_a_wins', 'team_b_wins', 'draws',
+    'team_a_goals', 'team_b_goals', 'extra_time_matches', 'penalty_matches',
+]
+
+# Rang du meilleur tour atteint, comme best_round_rank de v_team_by_edition
+# (les autres tours, dont Second Group Stage, valent 1)
+ROUND_RANKS = {
+    'Final': 6,
+    'Third Place': 5,
+    'Semi-finals': 5,
+    'Quarter-finals': 4,
+    'Round of 16': 3,
+    'Group Stage': 2,
+}
+
+STATS_TABLES = {
+    'team_match': """
+        CREATE TABLE IF NOT EXISTS team_match (
+            id_match            INTEGER NOT NULL,
+            edition             INTEGER NOT NULL,
+            team_id             INTEGER NOT NULL,
+            opponent_id         INTEGER NOT NULL,
+            is_home             BOOLEAN NOT NULL,
+            goals_for           INTEGER NOT NULL,
+            goals_against       INTEGER NOT NULL,
+            outcome             VARCHAR(4) NOT NULL CHECK (outcome IN ('win', 'draw', 'loss')),
+            round               VARCHAR(50) NOT NULL,
+            extra_time          BOOLEAN,
+            penalties           BOOLEAN,
+            PRIMARY KEY (team_id, edition, id_match)
+        )
+    """,
+    'team_edition_stats': """
+        CREATE TABLE IF NOT EXISTS team_edition_stats (
+            id_team             INTEGER NOT NULL,
+            edition             INTEGER NOT NULL,
+            matches             INTEGER NOT NULL,
+            wins                INTEGER NOT NULL,
+            draws               INTEGER NOT NULL,
+            losses              INTEGER NOT NULL,
+            goals_for           INTEGER NOT NULL,
+            goals_against       INTEGER NOT NULL,
+            clean_sheets        INTEGER NOT NULL,
+            extra_time_matches  INTEGER NOT NULL,
+            penalty_matches     INTEGER NOT NULL,
+            best_round_rank     INTEGER NOT NULL,
+            finals              INTEGER NOT NULL,
+            titles              INTEGER NOT NULL,
+            PRIMARY KEY (id_team, edition)
+        )
+    """,
+    'pair_edition_stats': """
+        CREATE TABLE IF NOT EXISTS pair_edition_stats (
+            team_a_id           INTEGER NOT NULL,
+            team_b_id           INTEGER NOT NULL,
+            edition             INTEGER NOT NULL,
+            matches             INTEGER NOT NULL,
+            team_a_wins         INTEGER NOT NULL,
+            team_b_wins         INTEGER NOT NULL,
+            draws               INTEGER NOT NULL,
+            team_a_goals        INTEGER NOT NULL,
+            team_b_goals        INTEGER NOT NULL,
+            extra_time_matches  INTEGER NOT NULL,
+            penalty_matches     INTEGER NOT NULL,
+            PRIMARY KEY (team_a_id, team_b_id, edition)
+        )
+    """,
+}
+
+# Index secondaires (la clé primaire de team_match sert (team_id, edition))
+STATS_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_team_match_edition ON team_match (edition)",
+    "CREATE INDEX IF NOT EXISTS idx_team_match_opponent ON team_match (opponent_id, team_id)",
+]
+
+# Requêtes des notebooks 08 et 09 réécrites sur les agrégats et sur team_match,
+# sans jointure OR (SQL portable : PostgreSQL, et SQLite pour les tests)
+STATS_QUERIES = {
+    'champions': """
+        SELECT t.nom_standard AS equipe, SUM(s.titles) AS titres
+        FROM team_edition_stats s
+        JOIN teams t ON t.id_team = s.id_team
+        WHERE s.titles > 0
+        GROUP BY t.nom_standard
+        ORDER BY titres DESC, equipe
+    """,
+    'finalists': """
+        SELECT t.nom_standard AS equipe, SUM(s.finals) AS finales
+        FROM team_edition_stats s
+        JOIN teams t ON t.id_team = s.id_team
+        WHERE s.finals > 0
+        GROUP BY t.nom_standard
+        ORDER BY finales DESC, equipe
+    """,
+    'team_stats': """
+        SELECT
+            t.id_team,
+            t.nom_standard,
+            t.confederation,
+            SUM(s.matches) AS total_matches,
+            COUNT(*) AS editions,
+            SUM(s.wins) AS wins,
+            SUM(s.draws) AS draws,
+            SUM(s.losses) AS losses,
+            SUM(s.goals_for) AS goals_for,
+            SUM(s.goals_against) AS goals_against,
+            SUM(s.goals_for) - SUM(s.goals_against) AS goal_difference,
+            ROUND(100.0 * SUM(s.wins) / SUM(s.matches), 1) AS win_rate,
+            ROUND(1.0 * SUM(s.goals_for) / SUM(s.matches), 2) AS avg_goals_scored,
+            ROUND(1.0 * SUM(s.goals_against) / SUM(s.matches), 2) AS avg_goals_conceded,
+            SUM(s.clean_sheets) AS clean_sheets
+        FROM team_edition_stats s
+        JOIN teams t ON t.id_team = s.id_team
+        GROUP BY t.id_team, t.nom_standard, t.confederation
+        ORDER BY wins DESC, t.nom_standard
+    """,
+    'team_by_edition': """
+        SELECT
+            t.id_team,
+            t.nom_standard,
+            t.confederation,
+            s.edition,
+            s.matches,
+            s.wins,
+            s.draws,
+            s.losses,
+            s.goals_for,
+            s.goals_against,
+            s.goals_for - s.goals_against AS goal_diff,
+            ROUND(100.0 * s.wins / s.matches, 1) AS win_rate,
+            s.best_round_rank
+        FROM teams t
+        JOIN team_edition_stats s ON s.id_team = t.id_team
+        WHERE t.nom_standard = :team
+        ORDER BY s.edition
+    """,
+    'head_to_head': """
+        SELECT
+            ta.nom_standard AS team_a,
+            tb.nom_standard AS team_b,
+            SUM(s.matches) AS total_matches,
+            SUM(s.team_a_wins) AS team_a_wins,
+            SUM(s.team_b_wins) AS team_b_wins,
+            SUM(s.draws) AS draws,
+            SUM(s.team_a_goals) AS team_a_goals,
+            SUM(s.team_b_goals) AS team_b_goals,
+            SUM(s.extra_time_matches) AS extra_time_matches,
+            SUM(s.penalty_matches) AS penalty_matches
+        FROM teams t1
+        JOIN teams t2 ON t2.nom_standard = :team2
+        JOIN pair_edition_stats s
+            ON s.team_a_id = CASE WHEN t1.id_team < t2.id_team THEN t1.id_team ELSE t2.id_team END
+           AND s.team_b_id = CASE WHEN t1.id_team < t2.id_team THEN t2.id_team ELSE t1.id_team END
+        JOIN teams ta ON ta.id_team = s.team_a_id
+        JOIN teams tb ON tb.id_team = s.team_b_id
+        WHERE t1.nom_standard = :team1
+        GROUP BY ta.nom_standard, tb.nom_standard
+    """,
+    'matches_played': """
+        SELECT t.nom_standard AS equipe, COUNT(*) AS matchs
+        FROM team_match tm
+        JOIN teams t ON t.id_team = tm.team_id
+        WHERE tm.round <> 'Preliminary'
+        GROUP BY t.nom_standard
+        ORDER BY matchs DESC, equipe
+        LIMIT 15
+    """,
+    'wins': """
+        SELECT t.nom_standard AS equipe, COUNT(*) AS victoires
+        FROM team_match tm
+        JOIN teams t ON t.id_team = tm.team_id
+        WHERE tm.outcome = 'win'
+        GROUP BY t.nom_standard
+        ORDER BY victoires DESC, equipe
+        LIMIT 15
+    """,
+    'confederations': """
+        SELECT
+            t.confederation,
+            COUNT(DISTINCT t.id_team) AS nb_equipes,
+            COUNT(*) AS matchs_joues
+        FROM team_match tm
+        JOIN teams t ON t.id_team = tm.team_id
+        WHERE t.confederation IS NOT NULL
+        GROUP BY t.confederation
+        ORDER BY matchs_joues DESC
+    """,
+    'draws': """
+        SELECT
+            t.nom_standard AS equipe,
+            COUNT(*) AS total_matchs,
+            SUM(CASE WHEN tm.outcome = 'draw' THEN 1 ELSE 0 END) AS nuls,
+            ROUND(100.0 * SUM(CASE WHEN tm.outcome = 'draw' THEN 1 ELSE 0 END) / COUNT(*), 1) AS pct_nuls,
+            SUM(CASE WHEN tm.outcome = 'draw' AND tm.goals_for = 0 THEN 1 ELSE 0 END) AS nuls_0_0,
+            SUM(CASE WHEN tm.outcome = 'draw' AND tm.goals_for > 0 THEN 1 ELSE 0 END) AS nuls_avec_buts
+        FROM team_match tm
+        JOIN teams t ON t.id_team = tm.team_id
+        WHERE tm.round <> 'Preliminary'
+        GROUP BY t.nom_standard
+        HAVING COUNT(*) >= 10
+        ORDER BY pct_nuls DESC, equipe
+        LIMIT 20
+    """,
+    'knockout': """
+        SELECT
+            t.nom_standard AS equipe,
+            SUM(CASE WHEN tm.round = 'Round of 16' THEN 1 ELSE 0 END) AS r16_matchs,
+            SUM(CASE WHEN tm.round = 'Round of 16' AND tm.outcome = 'win' THEN 1 ELSE 0 END) AS r16_wins,
+            SUM(CASE WHEN tm.round = 'Quarter-finals' THEN 1 ELSE 0 END) AS qf_matchs,
+            SUM(CASE WHEN tm.round = 'Quarter-finals' AND tm.outcome = 'win' THEN 1 ELSE 0 END) AS qf_wins,
+            SUM(CASE WHEN tm.round = 'Semi-finals' THEN 1 ELSE 0 END) AS sf_matchs,
+            SUM(CASE WHEN tm.round = 'Semi-finals' AND tm.outcome = 'win' THEN 1 ELSE 0 END) AS sf_wins,
+            SUM(CASE WHEN tm.round = 'Final' THEN 1 ELSE 0 END) AS finales,
+            SUM(CASE WHEN tm.round = 'Final' AND tm.outcome = 'win' THEN 1 ELSE 0 END) AS titres,
+            COUNT(*) AS total_knockout,
+            SUM(CASE WHEN tm.outcome = 'win' THEN 1 ELSE 0 END) AS total_wins,
+            ROUND(100.0 * SUM(CASE WHEN tm.outcome = 'win' THEN 1 ELSE 0 END) / COUNT(*), 1) AS knockout_win_rate,
+            SUM(CASE WHEN tm.penalties THEN 1 ELSE 0 END) AS tirs_au_but
+        FROM team_match tm
+        JOIN teams t ON t.id_team = tm.team_id
+        WHERE tm.round IN ('Round of 16', 'Quarter-finals', 'Semi-finals', 'Third Place', 'Final')
+        GROUP BY t.nom_standard
+        HAVING COUNT(*) >= 5
+        ORDER BY titres DESC, knockout_win_rate DESC, equipe
+        LIMIT 20
+    """,
+    'head_to_head_matches': """
+        SELECT
+            tm.edition,
+            tm.round,
+            t1.nom_standard AS team1,
+            t2.nom_standard AS team2,
+            tm.goals_for AS team1_goals,
+            tm.goals_against AS team2_goals,
+            tm.outcome AS team1_outcome,
+            tm.is_home AS team1_home,
+            tm.extra_time,
+            tm.penalties
+        FROM teams t1
+        JOIN team_match tm ON tm.team_id = t1.id_team
+        JOIN teams t2 ON t2.id_team = tm.opponent_id
+        WHERE t1.nom_standard = :team1 AND t2.nom_standard = :team2
+        ORDER BY tm.edition DESC, tm.id_match DESC
+    """,
+}
+
+
+def _played(matches, editions=None):
+    """Matchs comptés dans les agrégats : hors Preliminary, éditions demandées."""
+    played = matches[matches['round'] != 'Preliminary']
+    if editions is not None:
+        played = played[played['edition'].isin(list(editions))]
+    return played
+
+
+def team_match_rows(matches, editions=None):
+    """
+    Table de faits team_match : une ligne par équipe et par match.
+
+    Les colonnes domicile et extérieur sont empilées : chaque match donne
+    une ligne pour son équipe à domicile (is_home vrai) et une pour son
+    équipe à l'extérieur, avec les buts et l'issue vus de cette équipe.
+
+    Args:
+        matches: Matchs avec id_match, home_team_id, away_team_id,
+            home_result, away_result, result, round, extra_time, penalties
+            et edition
+        editions: Éditions à inclure (toutes par défaut)
+
+    Returns:
+        DataFrame aux colonnes TEAM_MATCH_COLUMNS (issue 'win' / 'draw' /
+        'loss'), trié par (team_id, edition, id_match)
+    """
+    import numpy as np
+    import pandas as pd
+
+    if editions is not None:
+        matches = matches[matches['edition'].isin(list(editions))]
+    result = matches['result'].astype(object).to_numpy()
+    rounds = matches['round'].astype(object).to_numpy()
+
+    sides = []
+    for team, opponent, goals_for, goals_against, won, lost in (
+        ('home_team_id', 'away_team_id', 'home_result', 'away_result', 'home_team', 'away_team'),
+        ('away_team_id', 'home_team_id', 'away_result', 'home_result', 'away_team', 'home_team'),
+    ):
+        sides.append(pd.DataFrame({
+            'id_match': matches['id_match'].to_numpy(dtype=np.int64),
+            'edition': matches['edition'].to_numpy(dtype=np.int64),
+            'team_id': matches[team].to_numpy(dtype=np.int64),
+            'opponent_id': matches[opponent].to_numpy(dtype=np.int64),
+            'is_home': team == 'home_team_id',
+            'goals_for': matches[goals_for].to_numpy(dtype=np.int64),
+            'goals_against': matches[goals_against].to_numpy(dtype=np.int64),
+            'outcome': np.select([result == won, result == lost], ['win', 'loss'], default='draw'),
+            'round': rounds,
+            'extra_time': matches['extra_time'].to_numpy(dtype=bool, na_value=False),
+            'penalties': matches['penalties'].to_numpy(dtype=bool, na_value=False),
+        }))
+    rows = pd.concat(sides, ignore_index=True)
+    return rows.sort_values(['team_id', 'edition', 'id_match'], ignore_index=True)[TEAM_MATCH_COLUMNS]
+
+
+def team_edition_stats(matches, editions=None):
+    """
+    Agrège les matchs par (équipe, édition).
+
+    Chaque match compte une fois pour chacune de ses deux équipes : les
+    lignes de team_match_rows sont agrégées en un seul groupby.
+
+    Args:
+        matches: Matchs (mêmes colonnes que team_match_rows)
+        editions: Éditions à agréger (toutes par défaut)
+
+    Returns:
+        DataFrame aux colonnes TEAM_EDITION_COLUMNS, trié par (id_team, edition)
+    """
+    import numpy as np
+
+    rows = team_match_rows(_played(matches, editions))
+    is_final = (rows['round'] == 'Final').to_numpy()
+    wins = (rows['outcome'] == 'win').to_numpy()
+    rows = rows.assign(
+        matches=1,
+        wins=wins,
+        draws=rows['outcome'] == 'draw',
+        losses=rows['outcome'] == 'loss',
+        clean_sheets=rows['goals_against'] == 0,
+        extra_time_matches=rows['extra_time'],
+        penalty_matches=rows['penalties'],
+        best_round_rank=rows['round'].map(ROUND_RANKS).fillna(1).astype(np.int64),
+        finals=is_final,
+        titles=is_final & wins,
+    ).rename(columns={'team_id': 'id_team'})
+
+    aggregations = {column: 'sum' for column in TEAM_EDITION_COLUMNS[2:]}
+    aggregations['best_round_rank'] = 'max'
+    stats = rows.groupby(['id_team', 'edition'], as_index=False, sort=True).agg(aggregations)
+    return stats[TEAM_EDITION_COLUMNS].astype(np.int64)
+
+
+def pair_edition_stats(matches, editions=None):
+    """
+    Agrège les confrontations par (paire d'équipes, édition).
+
+    La paire est normalisée : team_a_id est la plus petite des deux IDs,
+    les victoires et buts sont ceux de chaque équipe de la paire.
+
+    Args:
+        matches: Matchs (mêmes colonnes que team_edition_stats)
+        editions: Éditions à agréger (toutes par défaut)
+
+    Returns:
+        DataFrame aux colonnes PAIR_EDITION_COLUMNS, trié par
+        (team_a_id, team_b_id, edition)
+    """
+    import numpy as np
+    import pandas as pd
+
+    played = _played(matches, editions)
+    home = played['home_team_id'].to_numpy(dtype=np.int64)
+    away = played['away_team_id'].to_numpy(dtype=np.int64)
+    home_goals = played['home_result'].to_numpy(dtype=np.int64)
+    away_goals = played['away_result'].to_numpy(dtype=np.int64)
+    result = played['result'].astype(object).to_numpy()
+
+    # Équipe à domicile = team_a quand son ID est la plus petite
+    home_is_a = home < away
+    home_won, away_won = result == 'home_team', result == 'away_team'
+    rows = pd.DataFrame({
+        'team_a_id': np.where(home_is_a, home, away),
+        'team_b_id': np.where(home_is_a, away, home),
+        'edition': played['edition'].to_numpy(dtype=np.int64),
+        'matches': 1,
+        'team_a_wins': np.where(home_is_a, home_won, away_won),
+        'team_b_wins': np.where(home_is_a, away_won, home_won),
+        'draws': result == 'draw',
+        'team_a_goals': np.where(home_is_a, home_goals, away_goals),
+        'team_b_goals': np.where(home_is_a, away_goals, home_goals),
+        'extra_time_matches': played['extra_time'].to_numpy(dtype=bool, na_value=False),
+        'penalty_matches': played['penalties'].to_numpy(dtype=bool, na_value=False),
+    })
+    stats = rows.groupby(['team_a_id', 'team_b_id', 'edition'], as_index=False, sort=True).sum()
+    return stats[PAIR_EDITION_COLUMNS].astype(np.int64)
+
+
+def run_stats_query(name: str, params: dict = None, conn=None):
+    """
+    Exécute une requête de STATS_QUERIES (engine partagé de db.py).
+
+    Args:
+        name: Nom de la requête (champions, finalists, team_stats,
+            team_by_edition, head_to_head, matches_played, wins,
+            confederations, draws, knockout, head_to_head_matches)
+        params: Paramètres nommés (:team, :team1, :team2)
+        conn: Connexion à utiliser (défaut : une connexion du pool)
+
+    Returns:
+        DataFrame du résultat
+
+    Raises:
+        KeyError: Si la requête est inconnue
+    """
+    return run_query(STATS_QUERIES[name], params, conn=conn)
@@ -0,0 +1,289 @@
+"""
+Stockage colonnaire (Parquet via pyarrow) des données traitées.
+
+Parquet est le format principal de data/processed : les types sont
+conservés d'une étape à l'autre (pas de réinférence des dates ou des
+booléens) et les colonnes répétitives sont encodées en dictionnaire. La
+table des matchs est écrite en dataset partitionné par édition
+(matches.parquet/edition=1930/...) ; l'export CSV reste disponible.
+
+pyarrow n'est importé qu'à l'appel des fonctions.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+try:
+    from .schema import coerce_matches, coerce_teams
+except ImportError:
+    from schema import coerce_matches, coerce_teams
+
+BASE_DIR = Path(__file__).parent.parent
+PROCESSED_DIR = BASE_DIR / "data/processed"
+MATCHES_PARQUET = PROCESSED_DIR / "matches.parquet"
+TEAMS_PARQUET = PROCESSED_DIR / "teams_traitees.parquet"
+
+# Schéma de la table des matchs (14 colonnes) : (colonne, type Arrow)
+MATCH_FIELDS = [
+    ('id_match', 'int32'),
+    ('home_team_id', 'int16'),
+    ('away_team_id', 'int16'),
+    ('home_result', 'uint8'),
+    ('away_result', 'uint8'),
+    ('result', 'dictionary'),
+    ('extra_time', 'bool'),
+    ('penalties', 'bool'),
+    ('replay', 'bool'),
+    ('date', 'date32'),
+    ('round', 'dictionary'),
+    ('city', 'dictionary'),
+    ('id_stadium', 'dictionary'),
+    ('edition', 'int16'),
+]
+
+TEAM_FIELDS = [
+    ('id_team', 'int16'),
+    ('nom_standard', 'string'),
+    ('confederation', 'dictionary'),
+    ('aliases', 'string'),
+]
+
+PARTITION_COLUMN = 'edition'
+
+
+def _arrow_type(name: str):
+    """Type Arrow d'après son nom dans MATCH_FIELDS / TEAM_FIELDS."""
+    import pyarrow as pa
+
+    if name == 'dictionary':
+        return pa.dictionary(pa.int16(), pa.string())
+    if name == 'date32':
+        return pa.date32()
+    return pa.type_for_alias(name)
+
+
+def arrow_schema(fields):
+    """
+    Construit le schéma Arrow d'une table.
+
+    Args:
+        fields: Liste de (colonne, nom de type), ex: MATCH_FIELDS
+
+    Returns:
+        pyarrow.Schema
+    """
+    import pyarrow as pa
+
+    return pa.schema([(column, _arrow_type(type_name)) for column, type_name in fields])
+
+
+def to_arrow(df, fields):
+    """
+    Convertit un DataFrame en table Arrow au schéma explicite.
+
+    Les colonnes sont converties une à une : les chaînes vides ou
+    manquantes deviennent nulles, les dates texte sont analysées.
+
+    Args:
+        df: DataFrame contenant au moins les colonnes de fields
+        fields: Liste de (colonne, nom de type)
+
+    Returns:
+        pyarrow.Table
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    schema = arrow_schema(fields)
+    arrays = []
+    for field in schema:
+        values = df[field.name]
+        if pa.types.is_date32(field.type):
+            values = pd.to_datetime(values, errors='coerce').dt.date
+        elif pa.types.is_dictionary(field.type) or pa.types.is_string(field.type):
+            values = values.astype(object).where(values.notna() & (values != ''), None)
+        arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def from_arrow(table):
+    """
+    Convertit une table Arrow en DataFrame aux dtypes compacts.
+
+    Les entiers restent uint8/int16/int32 (Int* nullables s'il y a des
+    valeurs manquantes), les dictionnaires deviennent des Categorical et
+    les dates des datetime64.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    nullable = {
+        pa.uint8(): pd.UInt8Dtype(),
+        pa.int16(): pd.Int16Dtype(),
+        pa.int32(): pd.Int32Dtype(),
+    }
+    df = table.to_pandas(date_as_object=False)
+    for field in table.schema:
+        if field.type in nullable and table.column(field.name).null_count:
+            df[field.name] = table.column(field.name).to_pandas(types_mapper=nullable.get)
+    return df
+
+
+def _edition_partitioning():
+    """Partitionnement Hive par édition (edition=<année>)."""
+    import pyarrow.dataset as ds
+
+    partition_fields = [(c, t) for c, t in MATCH_FIELDS if c == PARTITION_COLUMN]
+    return ds.partitioning(arrow_schema(partition_fields), flavor='hive')
+
+
+def _remove_path(path: Path) -> None:
+    """Supprime path, fichier ou dossier, s'il existe."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def _replace_path(tmp_path: Path, path: Path) -> None:
+    """
+    Remplace path par tmp_path, l'un ou l'autre pouvant être un fichier ou un dossier.
+
+    L'ancien contenu est mis de côté en <path>.old le temps de la bascule.
+    Un .old laissé par une écriture interrompue est supprimé avant.
+    """
+    old_path = path.with_name(path.name + '.old')
+    _remove_path(old_path)
+    if path.exists():
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    _remove_path(old_path)
+
+
+def write_matches_parquet(matches, path: Path = MATCHES_PARQUET, partitioned: bool = True) -> Path:
+    """
+    Écrit la table des matchs en Parquet.
+
+    L'écriture se fait dans un chemin temporaire renommé à la fin : un
+    lecteur ne voit jamais de dataset à moitié écrit.
+
+    Args:
+        matches: DataFrame au schéma MATCH_FIELDS
+        path: Dossier du dataset (ou fichier si partitioned=False)
+        partitioned: Si True, un sous-dossier edition=<année> par édition
+
+    Returns:
+        Chemin écrit
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = to_arrow(matches, MATCH_FIELDS)
+    tmp_path = path.with_name(path.name + '.tmp')
+    _remove_path(tmp_path)
+
+    try:
+        if partitioned:
+            ds.write_dataset(
+                table,
+                tmp_path,
+                format='parquet',
+                partitioning=_edition_partitioning(),
+                basename_template='part-{i}.parquet',
+            )
+        else:
+            pq.write_table(table, tmp_path)
+        _replace_path(tmp_path, path)
+    finally:
+        _remove_path(tmp_path)
+    return path
+
+
+def read_matches_parquet(path: Path = MATCHES_PARQUET, editions=None, columns=None):
+    """
+    Lit la table des matchs depuis Parquet.
+
+    Args:
+        path: Dataset partitionné ou fichier Parquet
+        editions: Éditions à lire (seules leurs partitions sont ouvertes)
+        columns: Colonnes à lire (toutes par défaut)
+
+    Returns:
+        DataFrame trié par id_match, aux dtypes canoniques de
+        schema.MATCH_DTYPES (colonnes demandées seulement)
+    """
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(
+        path, format='parquet', schema=arrow_schema(MATCH_FIELDS), partitioning=_edition_partitioning()
+    )
+
+    filter_ = None
+    if editions is not None:
+        filter_ = ds.field(PARTITION_COLUMN).isin(list(editions))
+    table = dataset.to_table(columns=columns, filter=filter_)
+
+    # coerce_matches range les colonnes dans l'ordre du schéma : on garde celui demandé
+    df = coerce_matches(from_arrow(table))[table.column_names]
+    if 'id_match' in df.columns:
+        df = df.sort_values('id_match', ignore_index=True)
+    return df
+
+
+def write_teams_parquet(teams, path: Path = TEAMS_PARQUET) -> Path:
+    """
+    Écrit la table des équipes en un fichier Parquet.
+
+    Args:
+        teams: DataFrame au schéma TEAM_FIELDS
+        path: Fichier de sortie
+
+    Returns:
+        Chemin écrit
+    """
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    pq.write_table(to_arrow(teams, TEAM_FIELDS), tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_teams_parquet(path: Path = TEAMS_PARQUET):
+    """
+    Lit la table des équipes depuis Parquet.
+
+    Returns:
+        DataFrame aux dtypes canoniques de schema.TEAM_DTYPES
+    """
+    import pyarrow.parquet as pq
+
+    return coerce_teams(from_arrow(pq.read_table(path, schema=arrow_schema(TEAM_FIELDS))))
+
+
+def export_csv(df, path: Path) -> Path:
+    """
+    Exporte un DataFrame lu depuis Parquet au format CSV historique.
+
+    Les dates sont écrites en AAAA-MM-JJ, comme dans les CSV des notebooks.
+
+    Args:
+        df: DataFrame (matchs ou équipes)
+        path: Fichier CSV de sortie
+
+    Returns:
+        Chemin écrit
+    """
+    import pandas as pd
+
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].dt.strftime('%Y-%m-%d')
+    df.to_csv(path, index=False, encoding='utf-8')
+    return Path(path)
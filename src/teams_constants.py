@@ -290,3 +290,16 @@ ALIASES_MAPPING = {
 
 # Version lowercase pour recherche insensible à la casse
 ALIASES_MAPPING_LOWER = {k.lower(): v for k, v in ALIASES_MAPPING.items()}
+
+# =============================================================================
+# PRÉFIXES DES NOMS "NomAnglais (NomLocal)" DIFFICILES À MAPPER EXACTEMENT
+# Le nom local varie selon l'encodage source (écriture Ge'ez, arménienne,
+# apostrophes droite/courbe) : on se contente du préfixe anglais.
+# Format : "préfixe" -> "nom_standard_FIFA"
+# =============================================================================
+
+PREFIX_ALIASES = {
+    "Ethiopia (": "Ethiopia",
+    "Ivory Coast (Côte d": "Côte d'Ivoire",
+    "Armenia (": "Armenia",
+}
@@ -3,27 +3,40 @@ Fonctions de référentiel pour la normalisation des équipes.
 
 Ce module fournit les fonctions pour normaliser les noms d'équipes,
 récupérer les confédérations, et gérer les équipes historiques.
+
+Les fonctions de recherche scalaires n'importent ni pandas ni numpy :
+seules les versions vectorisées (Series) les importent à l'appel.
 """
 
+import csv
+import hashlib
 import json
-import pandas as pd
+import marshal
+import os
+import unicodedata
+from collections.abc import Mapping
 from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 try:
     from .teams_constants import (
         ALIASES_MAPPING,
-        ALIASES_MAPPING_LOWER,
         HISTORICAL_TEAMS,
         ADDITIONAL_TEAMS,
         PLACEHOLDERS,
+        PREFIX_ALIASES,
     )
 except ImportError:
     from teams_constants import (
         ALIASES_MAPPING,
-        ALIASES_MAPPING_LOWER,
         HISTORICAL_TEAMS,
         ADDITIONAL_TEAMS,
         PLACEHOLDERS,
+        PREFIX_ALIASES,
     )
 
 # Chemin vers le fichier de confédérations FIFA (cache)
@@ -31,6 +44,10 @@ BASE_DIR = Path(__file__).parent.parent
 CONFEDERATIONS_CACHE = BASE_DIR / "data/reference/teams_mapping.json"
 FIFA_RANKING_CSV = BASE_DIR / "data/reference/fifa_ranking_source.csv"
 
+# Cache disque compact (marshal) des confédérations extraites des sources
+CONFEDERATIONS_DISK_CACHE = BASE_DIR / "data/staging/confederations.marshal"
+_DISK_CACHE_VERSION = 1
+
 
 def _load_confederations_from_cache() -> dict:
     """
@@ -54,28 +71,133 @@ def _load_confederations_from_fifa_csv() -> dict:
         Dictionnaire {nom_équipe: confédération}
     """
     if FIFA_RANKING_CSV.exists():
-        df = pd.read_csv(FIFA_RANKING_CSV)
-        if 'confederation' in df.columns:
-            latest_date = df['rank_date'].max()
-            df_latest = df[df['rank_date'] == latest_date]
-            return df_latest.set_index('country_full')['confederation'].to_dict()
+        with open(FIFA_RANKING_CSV, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'confederation' in header:
+                i_date = header.index('rank_date')
+                i_country = header.index('country_full')
+                i_confederation = header.index('confederation')
+
+                # Ne garder que la dernière date disponible (dates ISO : ordre lexical)
+                latest_date, latest = None, {}
+                for row in reader:
+                    rank_date = row[i_date]
+                    if latest_date is None or rank_date > latest_date:
+                        latest_date, latest = rank_date, {}
+                    if rank_date == latest_date:
+                        latest[row[i_country]] = row[i_confederation] or None
+                return latest
     return {}
 
 
-def get_confederations() -> dict:
+def _confederation_sources() -> list[Path]:
+    """Fichiers sources dont dépend le dictionnaire des confédérations."""
+    return [CONFEDERATIONS_CACHE, FIFA_RANKING_CSV]
+
+
+def _stat_signature(path: Path) -> tuple:
     """
-    Retourne le dictionnaire complet des confédérations.
-    Combine: FIFA actuel + équipes historiques + équipes additionnelles.
+    Signature rapide d'un fichier source : (nom, mtime_ns, taille).
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (path.name, None, None)
+    return (path.name, stat.st_mtime_ns, stat.st_size)
+
+
+def _file_digest(path: Path) -> str | None:
+    """
+    Empreinte SHA-256 d'un fichier source (None s'il est absent).
+    """
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_disk_cache() -> tuple | None:
+    """
+    Lit le cache disque des confédérations.
+
+    Returns:
+        Tuple (signatures, empreintes, confédérations) ou None si absent/invalide
+    """
+    try:
+        with open(CONFEDERATIONS_DISK_CACHE, 'rb') as f:
+            version, signatures, digests, confederations = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != _DISK_CACHE_VERSION:
+        return None
+    return signatures, digests, confederations
+
+
+def _write_disk_cache(signatures: list, digests: list, confederations: dict) -> None:
+    """
+    Écrit le cache disque de manière atomique (fichier temporaire + rename).
+    Un échec d'écriture (disque en lecture seule, ...) est ignoré.
+    """
+    payload = (_DISK_CACHE_VERSION, signatures, digests, confederations)
+    tmp_path = CONFEDERATIONS_DISK_CACHE.with_suffix('.tmp')
+    try:
+        CONFEDERATIONS_DISK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(payload, f)
+        os.replace(tmp_path, CONFEDERATIONS_DISK_CACHE)
+    except OSError:
+        pass
+
+
+def _load_source_confederations() -> dict:
+    """
+    Charge les confédérations des sources (JSON puis CSV FIFA) en passant
+    par le cache disque.
+
+    Le cache est valide si les signatures (mtime, taille) des sources sont
+    inchangées ; sinon les empreintes SHA-256 sont comparées avant de
+    relire les sources.
 
     Returns:
         Dictionnaire {nom_équipe: confédération}
     """
+    sources = _confederation_sources()
+    signatures = [_stat_signature(path) for path in sources]
+
+    cached = _read_disk_cache()
+    if cached is not None and cached[0] == signatures:
+        return cached[2]
+
+    digests = [_file_digest(path) for path in sources]
+    if cached is not None and cached[1] == digests:
+        # Sources touchées mais contenu identique : rafraîchir les signatures
+        _write_disk_cache(signatures, digests, cached[2])
+        return cached[2]
+
     # Charger depuis le cache JSON ou le CSV FIFA
     confederations = _load_confederations_from_cache()
 
     if not confederations:
         confederations = _load_confederations_from_fifa_csv()
 
+    _write_disk_cache(signatures, digests, confederations)
+    return confederations
+
+
+def get_confederations() -> dict:
+    """
+    Retourne le dictionnaire complet des confédérations.
+    Combine: FIFA actuel + équipes historiques + équipes additionnelles.
+
+    Returns:
+        Dictionnaire {nom_équipe: confédération}
+    """
+    confederations = dict(_load_source_confederations())
+
     # Ajouter les équipes historiques
     for team, (_, _, conf) in HISTORICAL_TEAMS.items():
         confederations[team] = conf
@@ -86,66 +208,230 @@ def get_confederations() -> dict:
     return confederations
 
 
-# Charger les confédérations une seule fois au démarrage
-CONFEDERATIONS = get_confederations()
+class _LazyConfederations(Mapping):
+    """
+    Dictionnaire des confédérations chargé au premier accès.
+    Évite la lecture des sources à l'import du module.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self):
+        self._data = None
 
-# Mapping insensible à la casse pour les noms standards
-CONFEDERATIONS_LOWER = {k.lower(): k for k in CONFEDERATIONS.keys()}
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = get_confederations()
+        return self._data
 
+    @property
+    def loaded(self) -> bool:
+        """True si les confédérations ont déjà été chargées."""
+        return self._data is not None
 
-def normalize_team_name(raw_name: str) -> str | None:
+    def __getitem__(self, team_name):
+        return self._load()[team_name]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __contains__(self, team_name):
+        return team_name in self._load()
+
+    def get(self, team_name, default=None):
+        return self._load().get(team_name, default)
+
+    def __repr__(self):
+        state = repr(self._data) if self.loaded else "non chargé"
+        return f"CONFEDERATIONS({state})"
+
+
+# Confédérations chargées au premier accès (puis conservées en mémoire)
+CONFEDERATIONS = _LazyConfederations()
+
+
+# =============================================================================
+# RÉSOLVEUR PRÉCOMPILÉ DES NOMS D'ÉQUIPES
+# =============================================================================
+
+# Marqueur de fin de préfixe dans le trie (aucun caractère n'est vide)
+_TRIE_END = ""
+
+# Sentinelle pour distinguer "absent du cache" d'un résultat None
+_MISSING = object()
+
+# Nombre maximal de noms inconnus mémorisés par le résolveur
+RESOLVER_CACHE_SIZE = 65_536
+
+
+def canonical_team_key(name: str) -> str:
     """
-    Convertit un nom brut en nom standard FIFA.
-    Retourne None si c'est un placeholder.
+    Retourne la forme canonique d'un nom d'équipe : Unicode NFKC,
+    casefold et espaces de bord retirés.
 
     Args:
-        raw_name: Nom brut de l'équipe (peut contenir des caractères spéciaux)
+        name: Nom de l'équipe
 
     Returns:
-        Nom standard ou None si placeholder
+        Clé canonique utilisée par l'index du résolveur
     """
-    if pd.isna(raw_name):
-        return None
+    return unicodedata.normalize("NFKC", name.strip()).casefold()
 
-    name = str(raw_name).strip()
 
-    # Exclure les placeholders
-    if name in PLACEHOLDERS:
-        return None
+def _is_missing(value) -> bool:
+    """
+    Équivalent scalaire de pd.isna (None, NaN, NaT, pd.NA).
+    """
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pd.NA : la comparaison renvoie NA, ambiguë en contexte booléen
+        return True
 
-    # Recherche insensible à la casse dans les aliases
-    if name.lower() in ALIASES_MAPPING_LOWER:
-        return ALIASES_MAPPING_LOWER[name.lower()]
 
-    # Appliquer le mapping des aliases (correspondance exacte)
-    if name in ALIASES_MAPPING:
-        return ALIASES_MAPPING[name]
+class _PrefixTrie:
+    """
+    Trie de préfixes canoniques -> nom standard.
+    Remplace les tests startswith successifs par un seul parcours du nom.
+    """
 
-    # -------------------------------------------------------------------------
-    # RECHERCHE INSENSIBLE À LA CASSE DANS LES NOMS STANDARDS
-    # Ex: "ARGENTINA" -> "Argentina", "france" -> "France"
-    # -------------------------------------------------------------------------
-    if name.lower() in CONFEDERATIONS_LOWER:
-        return CONFEDERATIONS_LOWER[name.lower()]
+    __slots__ = ("_root",)
+
+    def __init__(self, prefixes: dict):
+        root = {}
+        for prefix, standard in prefixes.items():
+            node = root
+            for char in canonical_team_key(prefix):
+                node = node.setdefault(char, {})
+            node[_TRIE_END] = standard
+        self._root = root
+
+    def longest_match(self, key: str) -> str | None:
+        """
+        Retourne le nom standard du plus long préfixe de `key`, ou None.
+        """
+        node = self._root
+        found = None
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                break
+            if _TRIE_END in node:
+                found = node[_TRIE_END]
+        return found
+
+
+class TeamNameResolver:
+    """
+    Résolveur précompilé nom brut -> nom standard FIFA.
 
-    # -------------------------------------------------------------------------
-    # GESTION DYNAMIQUE DES CAS PROBLÉMATIQUES
-    # Pour les équipes avec caractères spéciaux difficiles à mapper exactement
-    # -------------------------------------------------------------------------
+    Construit une seule fois à partir des constantes et des confédérations :
+    - un index immuable sur la forme canonique (NFKC, casefold, trim),
+      où les aliases sont prioritaires sur les noms standards ;
+    - un trie de préfixes pour la famille "NomAnglais (NomLocal)" ;
+    - un cache exact des noms déjà résolus (noms connus préchargés).
+    """
 
-    # Cas 1: Ethiopia avec différentes formes de l'écriture Ge'ez
-    if name.startswith("Ethiopia ("):
-        return "Ethiopia"
+    __slots__ = ("_placeholders", "_index", "_prefixes", "_memo", "_memo_limit")
+
+    def __init__(
+        self,
+        confederations: dict,
+        aliases: dict = ALIASES_MAPPING,
+        placeholders=PLACEHOLDERS,
+        prefixes: dict = PREFIX_ALIASES,
+        cache_size: int = RESOLVER_CACHE_SIZE,
+    ):
+        index = {}
+        for team_name in confederations:
+            index[canonical_team_key(team_name)] = team_name
+        for alias, standard in aliases.items():
+            index[canonical_team_key(alias)] = standard
+
+        self._placeholders = frozenset(placeholders)
+        self._index = index
+        self._prefixes = _PrefixTrie(prefixes)
+
+        # Précharger le cache avec tous les noms connus (chemin le plus fréquent)
+        self._memo = {}
+        for name in (*confederations, *aliases, *self._placeholders):
+            self._memo[name] = self._resolve_uncached(name)
+        self._memo_limit = len(self._memo) + cache_size
+
+    @property
+    def index(self) -> MappingProxyType:
+        """Vue en lecture seule de l'index {clé_canonique: nom_standard}."""
+        return MappingProxyType(self._index)
+
+    def _resolve_uncached(self, raw_name: str) -> str | None:
+        name = raw_name.strip()
+
+        # Exclure les placeholders (correspondance exacte)
+        if name in self._placeholders:
+            return None
+
+        key = canonical_team_key(name)
+        standard = self._index.get(key)
+        if standard is None:
+            standard = self._prefixes.longest_match(key)
+        return name if standard is None else standard
+
+    def resolve(self, raw_name) -> str | None:
+        """
+        Convertit un nom brut en nom standard FIFA.
+
+        Args:
+            raw_name: Nom brut de l'équipe
+
+        Returns:
+            Nom standard, le nom nettoyé s'il est inconnu, ou None si placeholder
+        """
+        if type(raw_name) is not str:
+            if _is_missing(raw_name):
+                return None
+            raw_name = str(raw_name)
+
+        result = self._memo.get(raw_name, _MISSING)
+        if result is _MISSING:
+            result = self._resolve_uncached(raw_name)
+            if len(self._memo) < self._memo_limit:
+                self._memo[raw_name] = result
+        return result
+
+
+_resolver = None
+
+
+def get_resolver() -> TeamNameResolver:
+    """
+    Retourne le résolveur partagé, construit au premier appel.
 
-    # Cas 2: Ivory Coast avec différentes apostrophes (droite ' ou courbe ')
-    if name.startswith("Ivory Coast (Côte d"):
-        return "Côte d'Ivoire"
+    Returns:
+        Instance de TeamNameResolver basée sur CONFEDERATIONS
+    """
+    global _resolver
+    if _resolver is None:
+        _resolver = TeamNameResolver(CONFEDERATIONS)
+    return _resolver
 
-    # Cas 3: Armenia avec différentes formes arméniennes
-    if name.startswith("Armenia ("):
-        return "Armenia"
 
-    return name
+def normalize_team_name(raw_name: str) -> str | None:
+    """
+    Convertit un nom brut en nom standard FIFA.
+    Retourne None si c'est un placeholder.
+
+    Args:
+        raw_name: Nom brut de l'équipe (peut contenir des caractères spéciaux)
+
+    Returns:
+        Nom standard ou None si placeholder
+    """
+    return get_resolver().resolve(raw_name)
 
 
 def get_confederation(team_name: str) -> str | None:
@@ -165,6 +451,92 @@ def get_confederation(team_name: str) -> str | None:
     return CONFEDERATIONS.get(normalized, None)
 
 
+def _map_distinct(values: "pd.Series", func) -> "pd.Series":
+    """
+    Applique `func` une seule fois par valeur distincte de la Series,
+    puis diffuse le résultat sur toutes les lignes via des codes catégoriels.
+
+    Args:
+        values: Series d'entrée (objet ou catégorielle)
+        func: Fonction scalaire (valeur -> résultat hashable ou None)
+
+    Returns:
+        Series catégorielle alignée sur l'index d'entrée (None -> NaN)
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(values)
+    results = pd.Series([func(value) for value in uniques], dtype=object)
+
+    # Regrouper les résultats identiques : plusieurs noms bruts -> un nom standard
+    # Le code -1 (valeur manquante en entrée) pointe sur le -1 ajouté en fin
+    result_codes, categories = pd.factorize(results)
+    final_codes = np.append(result_codes, -1)[codes]
+
+    return pd.Series(
+        pd.Categorical.from_codes(final_codes, categories=categories),
+        index=values.index,
+        name=values.name,
+    )
+
+
+def normalize_team_names(names: "pd.Series") -> "pd.Series":
+    """
+    Version vectorisée de normalize_team_name pour une Series entière.
+    Chaque nom distinct n'est résolu qu'une seule fois.
+
+    Args:
+        names: Series de noms bruts
+
+    Returns:
+        Series catégorielle des noms standards (NaN pour les placeholders)
+    """
+    return _map_distinct(names, get_resolver().resolve)
+
+
+def get_confederations_for(names: "pd.Series") -> "pd.Series":
+    """
+    Version vectorisée de get_confederation pour une Series entière.
+
+    Args:
+        names: Series de noms d'équipes (bruts ou normalisés)
+
+    Returns:
+        Series catégorielle des confédérations (NaN si inconnue)
+    """
+    return _map_distinct(names, get_confederation)
+
+
+def build_aliases_index(aliases: dict) -> dict:
+    """
+    Construit l'index inversé nom standard -> aliases en un seul parcours.
+
+    Args:
+        aliases: Mapping {alias: nom_standard}
+
+    Returns:
+        Dictionnaire {nom_standard: tuple des aliases, dans l'ordre du mapping}
+    """
+    index = {}
+    for alias, standard in aliases.items():
+        index.setdefault(standard, []).append(alias)
+    return {standard: tuple(names) for standard, names in index.items()}
+
+
+_aliases_index = None
+
+
+def _get_aliases_index() -> dict:
+    """
+    Retourne l'index inversé des aliases, construit au premier appel.
+    """
+    global _aliases_index
+    if _aliases_index is None:
+        _aliases_index = build_aliases_index(ALIASES_MAPPING)
+    return _aliases_index
+
+
 def get_aliases(team_name: str) -> list[str]:
     """
     Retourne tous les aliases connus pour une équipe.
@@ -175,11 +547,7 @@ def get_aliases(team_name: str) -> list[str]:
     Returns:
         Liste des aliases (noms alternatifs)
     """
-    aliases = []
-    for alias, standard in ALIASES_MAPPING.items():
-        if standard == team_name:
-            aliases.append(alias)
-    return aliases
+    return list(_get_aliases_index().get(team_name, ()))
 
 
 def is_historical_team(team_name: str) -> bool:
@@ -8,6 +8,28 @@ from pathlib import Path
 import tempfile
 import shutil
 
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from schema import coerce_matches, coerce_teams
+
+# Colonnes des tuples de make_matches, replay étant facultatif
+MATCH_TUPLE_COLUMNS = [
+    'edition', 'round', 'home_team_id', 'away_team_id', 'home_result', 'away_result', 'result', 'replay',
+]
+
+
+def make_matches(rows, **columns):
+    """
+    Matchs à partir de tuples (edition, round, home, away, hs, as, result[, replay]).
+
+    id_match numérote les lignes à partir de 1 ; les colonnes passées en
+    mot-clé sont ajoutées telles quelles (ex: penalties=False).
+    """
+    df = pd.DataFrame(rows, columns=MATCH_TUPLE_COLUMNS[:len(rows[0])])
+    return df.assign(id_match=range(1, len(df) + 1), **columns)
+
+
 @pytest.fixture
 def sample_teams_df():
     """Dataframe minimale avec différents cas de tests"""
@@ -119,7 +141,7 @@ def mock_aliases_mapping():
         "C�te d'Ivoire": "Côte d'Ivoire",
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def project_root():
     """Retourne le chemin racine du projet."""
     return Path(__file__).parent.parent
@@ -134,4 +156,18 @@ def real_teams_csv(project_root):
 @pytest.fixture
 def real_matches_csv(project_root):
     """Chemin vers le vrai fichier matches.csv."""
-    return project_root / "data" / "processed" / "matches.csv"
\ No newline at end of file
+    return project_root / "data" / "processed" / "matches.csv"
+
+
+@pytest.fixture(scope="session")
+def processed_tables(project_root):
+    """
+    Tables (matches, teams) de data/processed aux dtypes canoniques.
+
+    Lues une fois pour toute la session : les tests ne doivent pas les
+    modifier en place.
+    """
+    processed = project_root / "data" / "processed"
+    matches = coerce_matches(pd.read_csv(processed / "matches.csv"))
+    teams = coerce_teams(pd.read_csv(processed / "teams_traitees.csv"))
+    return matches, teams
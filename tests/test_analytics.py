@@ -0,0 +1,194 @@
+"""
+Tests unitaires pour analytics.py
+
+Les réponses du moteur en mémoire sont comparées à celles des requêtes
+STATS_QUERIES, exécutées sur une base SQLite remplie avec les agrégats de
+stats.py à partir de data/processed.
+"""
+
+import sqlite3
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from analytics import HEAD_TO_HEAD_FIELDS, HeadToHeadMatrix, MatchAnalytics, _sql_ratio
+from stats import STATS_QUERIES, pair_edition_stats, team_edition_stats, team_match_rows
+
+
+@pytest.fixture(scope="module")
+def analytics(processed_tables):
+    return MatchAnalytics(*processed_tables)
+
+
+@pytest.fixture(scope="module")
+def sql(processed_tables):
+    """Exécute une requête de STATS_QUERIES sur les agrégats en SQLite."""
+    matches, teams = processed_tables
+    conn = sqlite3.connect(":memory:")
+    teams.astype({'confederation': object}).to_sql('teams', conn, index=False)
+    team_edition_stats(matches).to_sql('team_edition_stats', conn, index=False)
+    pair_edition_stats(matches).to_sql('pair_edition_stats', conn, index=False)
+    team_match_rows(matches).to_sql('team_match', conn, index=False)
+
+    def run(name, params=None):
+        return pd.read_sql(STATS_QUERIES[name], conn, params=params)
+
+    yield run
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def matrix(processed_tables):
+    return HeadToHeadMatrix.from_matches(processed_tables[0])
+
+
+PAIRS = [('France', 'Brazil'), ('Brazil', 'France'), ('Germany', 'Argentina'), ('Italy', 'Spain')]
+
+
+class TestSameResultsAsSQL:
+    """Les réponses du moteur sont celles des requêtes SQL."""
+
+    @pytest.mark.parametrize("name", ['champions', 'finalists', 'team_stats', 'confederations'])
+    def test_global_queries(self, analytics, sql, name):
+        pd.testing.assert_frame_equal(analytics.query(name), sql(name), check_dtype=False)
+
+    @pytest.mark.parametrize("team", ['France', 'Brazil', 'Germany', 'Cuba', 'Unknown Team'])
+    def test_team_by_edition(self, analytics, sql, team):
+        expected = sql('team_by_edition', {'team': team})
+        result = analytics.query('team_by_edition', {'team': team})
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False)
+
+    @pytest.mark.parametrize("team1,team2", PAIRS)
+    def test_head_to_head(self, analytics, sql, team1, team2):
+        expected = sql('head_to_head', {'team1': team1, 'team2': team2})
+        result = analytics.query('head_to_head', {'team1': team1, 'team2': team2})
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_head_to_head_never_met(self, analytics):
+        assert analytics.head_to_head('France', 'Unknown Team').empty
+
+
+class TestMatchAnalytics:
+    """Tests du moteur sur des cas construits à la main."""
+
+    def test_preliminary_excluded(self):
+        matches = pd.DataFrame({
+            'id_match': [1, 2], 'home_team_id': [1, 1], 'away_team_id': [2, 2],
+            'home_result': [3, 0], 'away_result': [0, 0], 'result': ['home_team', 'draw'],
+            'extra_time': False, 'penalties': False, 'date': pd.NaT, 'round': ['Preliminary', 'Group Stage'],
+            'edition': [1990, 1990],
+        })
+        teams = pd.DataFrame({'id_team': [1, 2], 'nom_standard': ['A', 'B'], 'confederation': ['UEFA', 'UEFA']})
+        analytics = MatchAnalytics(matches, teams)
+
+        assert analytics.head_to_head('A', 'B')[['total_matches', 'draws']].iloc[0].tolist() == [1, 1]
+        assert analytics.confederations_breakdown()['matchs_joues'].tolist() == [4]
+
+    def test_unknown_query(self, analytics):
+        with pytest.raises(KeyError):
+            analytics.query('matches_played')
+
+    def test_sql_rounding(self):
+        """Arrondi au demi supérieur, sans erreur de division flottante."""
+        assert _sql_ratio(pd.Series([1]), pd.Series([8]), 100).tolist() == [0.13]
+        assert _sql_ratio(pd.Series([2675]), pd.Series([1000]), 100).tolist() == [2.68]
+
+    def test_from_processed_csv(self, tmp_path, processed_tables):
+        matches, teams = processed_tables
+        matches.to_csv(tmp_path / "matches.csv", index=False)
+        teams.to_csv(tmp_path / "teams_traitees.csv", index=False)
+
+        analytics = MatchAnalytics.from_processed(tmp_path)
+
+        assert analytics.champions()['titres'].sum() == (matches['round'] == 'Final').sum()
+
+
+class TestHeadToHeadMatrix:
+    """Tests de la matrice des confrontations."""
+
+    def test_symmetric(self, matrix):
+        cells = matrix.cells
+        assert (cells[:, :, 1] == cells[:, :, 3].T).all()
+        assert (cells[:, :, 4] == cells[:, :, 5].T).all()
+        assert (cells[:, :, 8:] == cells[:, :, 8:].transpose(1, 0, 2)).all()
+
+    def test_pairs_match_pair_edition_stats(self, matrix, processed_tables):
+        """Les paires de la matrice sont celles de pair_edition_stats, toutes éditions cumulées."""
+        pairs_by_edition = pair_edition_stats(processed_tables[0])
+        expected = pairs_by_edition.groupby(['team_a_id', 'team_b_id'], as_index=False).sum()
+        pairs = matrix.pairs().set_index(['team_a_id', 'team_b_id']).sort_index()
+        expected = expected.set_index(['team_a_id', 'team_b_id']).sort_index()
+
+        assert (pairs.index == expected.index).all()
+        assert (pairs['matches'] == expected['matches']).all()
+        assert (pairs['wins'] == expected['team_a_wins']).all()
+        assert (pairs['goals_against'] == expected['team_b_goals']).all()
+
+    def test_last_meeting(self, matrix, processed_tables):
+        matches, teams = processed_tables
+        ids = teams.set_index('nom_standard')['id_team']
+        h2h = matrix.head_to_head(ids['France'], ids['Argentina'])
+
+        assert h2h['last_edition'] == 2022
+        assert h2h['last_id_match'] == matches.loc[matches['round'] == 'Final', 'id_match'].max()
+        assert h2h['last_date'] is None or h2h['last_date'].year == 2022
+        assert h2h['wins'] == matrix.head_to_head(ids['Argentina'], ids['France'])['losses']
+
+    def test_never_met(self, matrix):
+        h2h = matrix.head_to_head(0, matrix.size + 10)
+        assert h2h['matches'] == 0 and h2h['last_edition'] is None
+
+    def test_incremental_equals_full_build(self, matrix, processed_tables):
+        """Ajouter les matchs par éditions redonne la matrice construite en une passe."""
+        matches = processed_tables[0]
+        incremental = HeadToHeadMatrix.from_matches(matches[matches['edition'] < 1998])
+        for edition in sorted(matches.loc[matches['edition'] >= 1998, 'edition'].unique()):
+            incremental.append(matches[matches['edition'] == edition])
+
+        np.testing.assert_array_equal(incremental.cells, matrix.cells)
+
+    def test_grows_for_new_teams(self, processed_tables):
+        matches = processed_tables[0]
+        matrix = HeadToHeadMatrix.from_matches(matches.head(10))
+        before = matrix.cells.copy()
+        new_team = matches.head(1).assign(home_team_id=matrix.size + 5).astype(matches.dtypes.to_dict())
+
+        matrix.append(new_team)
+
+        assert matrix.size == before.shape[0] + 6
+        np.testing.assert_array_equal(matrix.cells[:before.shape[0], :before.shape[0]], before)
+        assert matrix.head_to_head(matrix.size - 1, int(new_team['away_team_id'].iloc[0]))['matches'] == 1
+
+    def test_memmap_update_in_place(self, tmp_path, processed_tables):
+        """Un append sur une matrice ouverte en r+ met le fichier à jour."""
+        matches = processed_tables[0]
+        path = HeadToHeadMatrix.from_matches(matches[matches['edition'] < 2022]).save(tmp_path / "h2h.npy")
+
+        stored = HeadToHeadMatrix.load(path, mmap_mode='r+')
+        assert isinstance(stored.cells, np.memmap)
+        stored.append(matches[matches['edition'] == 2022])
+        del stored
+
+        reopened = HeadToHeadMatrix.load(path)
+        np.testing.assert_array_equal(reopened.cells, HeadToHeadMatrix.from_matches(matches).cells)
+        assert reopened.cells.shape[2] == len(HEAD_TO_HEAD_FIELDS)
+
+    def test_read_only_append_raises(self, tmp_path, processed_tables):
+        """Une matrice ouverte en lecture seule refuse append(), sans modifier le fichier."""
+        matches = processed_tables[0]
+        path = HeadToHeadMatrix.from_matches(matches[matches['edition'] < 2022]).save(tmp_path / "h2h.npy")
+        stored = HeadToHeadMatrix.load(path)
+
+        with pytest.raises(ValueError, match="r\\+"):
+            stored.append(matches[matches['edition'] == 2022])
+
+        np.testing.assert_array_equal(
+            HeadToHeadMatrix.load(path).cells,
+            HeadToHeadMatrix.from_matches(matches[matches['edition'] < 2022]).cells,
+        )
@@ -6,7 +6,14 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 
-from cleaning import clean_percentage, clean_round_name 
+import numpy as np
+import pandas as pd
+
+import cleaning
+from cleaning import (
+    clean_percentage, clean_percentages, clean_round_name, clean_round_names,
+    parse_scores, ROUND_STAGES,
+)
 
 def test_clean_percentage_standard():
     assert clean_percentage("50%") == 50.0
@@ -20,6 +27,47 @@ def test_clean_percentage_error():
     with pytest.raises(ValueError):
         clean_percentage("erreur")
 
+def test_clean_percentages_columns():
+    df = pd.DataFrame({
+        'possession team1': ['65%', ' 12.5% ', '40%'],
+        'possession team2': ['35%', '87.5%', '60%'],
+        'team': ['A', 'B', 'C'],
+    })
+    result, invalid = clean_percentages(df, ['possession team1', 'possession team2'])
+    assert result['possession team1'].tolist() == [65.0, 12.5, 40.0]
+    assert result['possession team2'].dtype == 'float32'
+    assert result['team'].tolist() == ['A', 'B', 'C']
+    assert not invalid.to_numpy().any()
+    # Le DataFrame source n'est pas modifié
+    assert df['possession team1'].tolist() == ['65%', ' 12.5% ', '40%']
+
+def test_clean_percentages_invalid_mask():
+    df = pd.DataFrame({'pct': ['50%', 'erreur', None, '']})
+    result, invalid = clean_percentages(df, ['pct'])
+    assert result['pct'].isna().tolist() == [False, True, True, True]
+    assert invalid['pct'].tolist() == [False, True, False, True]
+
+def test_clean_percentages_numeric_untouched():
+    df = pd.DataFrame({'pct': [50.0, 60.0], 'mixed': [50, '60%']})
+    result, invalid = clean_percentages(df, ['pct', 'mixed', 'absente'])
+    assert result['pct'].dtype == 'float64'
+    assert np.shares_memory(result['pct'].to_numpy(), df['pct'].to_numpy())
+    assert result['mixed'].tolist() == [50.0, 60.0]
+    assert list(invalid.columns) == ['pct', 'mixed']
+
+def test_clean_percentages_object_numbers():
+    """Colonnes objet sans aucune chaîne, ou mêlant nombres et chaînes."""
+    df = pd.DataFrame({
+        'numbers': pd.Series([50, 60.5, None], dtype=object),
+        'mixed': pd.Series([70, ' 30% ', 'erreur'], dtype=object),
+    })
+    result, invalid = clean_percentages(df, ['numbers', 'mixed'])
+    assert result['numbers'].tolist()[:2] == [50.0, 60.5]
+    assert result['numbers'].isna().tolist() == [False, False, True]
+    assert result['mixed'].tolist()[:2] == [70.0, 30.0]
+    assert invalid['mixed'].tolist() == [False, False, True]
+    assert not invalid['numbers'].any()
+
 
 
 def test_clean_round_name_groups():
@@ -31,7 +79,8 @@ def test_clean_round_name_knockout():
     assert clean_round_name("1/8 Finals") == "Round of 16"
     assert clean_round_name("Quarter-finals") == "Quarter-finals"
     assert clean_round_name("1/4") == "Quarter-finals"
-    assert clean_round_name("Semi-final") == "Semi-final"
+    assert clean_round_name("Semi-final") == "Semi-finals"
+    assert clean_round_name("1/2_FINAL") == "Semi-finals"
     assert clean_round_name("Final") == "Final"
 
 def test_clean_round_name_third_place():
@@ -39,4 +88,71 @@ def test_clean_round_name_third_place():
     assert clean_round_name("3rd Place") == "Third Place"
 
 def test_clean_round_name_unknown():
-    assert clean_round_name("Unknown Round") == "Unknown Round"
\ No newline at end of file
+    assert clean_round_name("Unknown Round") == "Unknown Round"
+
+def test_clean_round_name_historical_labels():
+    assert clean_round_name("FIRST") == "Round of 16"
+    assert clean_round_name("FINAL_ROUND") == "Second Group Stage"
+    assert clean_round_name("SEMIFINAL_STAGE") == "Second Group Stage"
+    assert clean_round_name("Second Group Stage") == "Second Group Stage"
+    assert clean_round_name("PLACES_3&4") == "Third Place"
+    assert clean_round_name("_FINAL") == "Final"
+
+def test_clean_round_names_categorical():
+    rounds = pd.Series(["Final", "GROUP_STAGE", "1/2_FINAL", None, "???"], index=[3, 1, 4, 1, 5])
+    result = clean_round_names(rounds)
+    assert list(result.index) == [3, 1, 4, 1, 5]
+    assert result.cat.ordered
+    assert list(result.cat.categories) == ROUND_STAGES
+    assert result.tolist()[:3] == ["Final", "Group Stage", "Semi-finals"]
+    assert result.isna().tolist() == [False, False, False, True, True]
+    assert result.cat.codes.tolist() == [7, 1, 5, -1, -1]
+
+def test_clean_round_names_matches_scalar():
+    labels = pd.Series(["Group A", "Round of 16", "Quarter-final", "Semi-final",
+                        "Play-off for third place", "Final", "PRELIMINARY-Asia"] * 3)
+    result = clean_round_names(labels)
+    assert result.astype(object).tolist() == [clean_round_name(label) for label in labels]
+
+def test_clean_round_names_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(cleaning, "_round_cache", {})
+    monkeypatch.setattr(cleaning, "ROUND_CACHE_SIZE", 2)
+    result = clean_round_names(pd.Series(["Final", "1/4_FINAL", "1/8_FINAL", "Final"]))
+    assert len(cleaning._round_cache) == 2
+    assert result.astype(object).tolist() == ["Final", "Quarter-finals", "Round of 16", "Final"]
+
+
+
+def test_parse_scores_full_score():
+    df = parse_scores(pd.Series(["2-1 (1-0) (a.e.t.) (p.k.)"]))
+    row = df.iloc[0]
+    assert (row['score_team1'], row['score_team2']) == (2, 1)
+    assert (row['half_time_team1'], row['half_time_team2']) == (1, 0)
+    assert row['extra_time'] and row['penalty_shootout'] and not row['replay']
+
+def test_parse_scores_markers():
+    df = parse_scores(pd.Series(["1-1 (0-0) (r.)", "3-0 (w.o.)", "10-1 (5-0)"]))
+    assert df['replay'].tolist() == [True, False, False]
+    assert df['extra_time'].tolist() == [False, False, False]
+    assert df['score_team1'].tolist() == [1, 3, 10]
+    assert df['half_time_team1'].isna().tolist() == [False, True, False]
+
+def test_parse_scores_invalid():
+    df = parse_scores(pd.Series(["xxx", "(A)", None]))
+    assert df['score_team1'].isna().all()
+    assert not df['extra_time'].any()
+
+def test_parse_scores_types_and_index():
+    df = parse_scores(pd.Series(["1-0 (0-0)", "2-2 (1-1)"], index=[10, 20]))
+    assert list(df.index) == [10, 20]
+    assert str(df['score_team1'].dtype) == 'Int64'
+    assert str(df['replay'].dtype) == 'boolean'
+
+def test_parse_scores_raw_feed():
+    raw_csv = os.path.join(os.path.dirname(__file__), '../data/raw/matches_19302010 (1).csv')
+    scores = pd.read_csv(raw_csv)['score']
+    df = parse_scores(scores)
+    assert len(df) == len(scores)
+    assert df['extra_time'].sum() == scores.str.contains('(a.e.t.)', regex=False).sum()
+    assert df['penalty_shootout'].sum() == scores.str.contains('(p.k.)', regex=False).sum()
+    assert df['score_team1'].notna().sum() == scores.str.match(r'\d+-\d+').sum()
@@ -0,0 +1,92 @@
+"""
+Tests unitaires pour db.py
+
+L'engine partagé est testé sur une base SQLite fichier : mêmes appels que
+pour PostgreSQL, sans serveur (le statement_timeout n'est pas appliqué).
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("sqlalchemy")
+
+import db
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine partagé sur une base SQLite contenant une petite table teams."""
+    db.dispose_engine()
+    engine = db.get_engine(url=f"sqlite:///{tmp_path / 'worldcup.db'}")
+    with db.connection() as conn:
+        conn.exec_driver_sql("CREATE TABLE teams (id_team INTEGER PRIMARY KEY, nom_standard TEXT)")
+        conn.exec_driver_sql("INSERT INTO teams VALUES (1, 'France'), (2, 'Brazil')")
+    yield engine
+    db.dispose_engine()
+
+
+class TestGetEngine:
+    """Tests de l'engine partagé."""
+
+    def test_single_engine(self, engine):
+        """Les appels suivants retournent le même engine, quels que soient les arguments."""
+        assert db.get_engine() is engine
+        assert db.get_engine(url="sqlite://") is engine
+
+    def test_pre_ping(self, engine):
+        assert engine.pool._pre_ping
+
+    def test_dispose_resets(self, engine, tmp_path):
+        db.dispose_engine()
+        other = db.get_engine(url=f"sqlite:///{tmp_path / 'other.db'}")
+        assert other is not engine
+
+    def test_database_url(self, monkeypatch):
+        pytest.importorskip("dotenv")
+        for name, value in {'DB_USER': 'u', 'DB_PASSWORD': 'p', 'DB_HOST': 'h', 'DB_NAME': 'wc'}.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.delenv('DB_PORT', raising=False)
+
+        assert db.database_url() == "postgresql+psycopg2://u:p@h:5432/wc"
+
+
+class TestConnection:
+    """Tests du gestionnaire de connexion."""
+
+    def test_rollback_on_error(self, engine):
+        """Une exception annule la transaction."""
+        with pytest.raises(RuntimeError):
+            with db.connection() as conn:
+                conn.exec_driver_sql("DELETE FROM teams")
+                raise RuntimeError("échec")
+
+        assert len(db.run_query("SELECT * FROM teams")) == 2
+
+    def test_connections_reused(self, engine):
+        """Les requêtes successives reprennent les connexions du pool."""
+        for _ in range(5):
+            db.run_query("SELECT 1 AS one")
+        assert engine.pool.checkedout() == 0
+        assert engine.pool.checkedin() == 1
+
+
+class TestRunQuery:
+    """Tests de run_query."""
+
+    def test_params(self, engine):
+        df = db.run_query("SELECT nom_standard FROM teams WHERE id_team = :id", {"id": 2})
+        assert df['nom_standard'].tolist() == ['Brazil']
+
+    def test_statement_reused(self, engine):
+        """Une même requête réutilise la même construction (forme compilée en cache)."""
+        query = "SELECT nom_standard FROM teams WHERE id_team = :id"
+        assert db._statement(query) is db._statement(query)
+
+    def test_explicit_connection(self, engine):
+        with db.connection() as conn:
+            conn.exec_driver_sql("INSERT INTO teams VALUES (3, 'Italy')")
+            df = db.run_query("SELECT COUNT(*) AS n FROM teams", conn=conn)
+        assert df['n'].iloc[0] == 3
@@ -0,0 +1,149 @@
+"""
+Tests unitaires pour elo.py
+
+Le calcul par niveaux est comparé à un parcours match par match de la même
+formule, sur data/processed/matches.csv.
+"""
+
+from functools import partial
+
+import numpy as np
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import make_matches
+from elo import (
+    BASE_RATING,
+    HISTORY_COLUMNS,
+    HOME_ADVANTAGE,
+    K_FACTORS,
+    EloRatings,
+    chronological_order,
+    host_team_ids,
+    match_levels,
+)
+
+# make_matches avec les colonnes lues par EloRatings en plus (pas de tirs au but, date inconnue)
+elo_matches = partial(make_matches, penalties=False, date=pd.NaT)
+
+
+def sequential_elo(matches, hosts):
+    """Référence : un match après l'autre, classements dans un dictionnaire."""
+    ratings = {}
+    for row in matches.iloc[chronological_order(matches)].itertuples():
+        home, away = int(row.home_team_id), int(row.away_team_id)
+        rating_home, rating_away = ratings.get(home, BASE_RATING), ratings.get(away, BASE_RATING)
+        host_ids = hosts.get(int(row.edition), [])
+        if row.round == 'Preliminary' or (home in host_ids and away not in host_ids):
+            advantage = HOME_ADVANTAGE
+        elif away in host_ids and home not in host_ids:
+            advantage = -HOME_ADVANTAGE
+        else:
+            advantage = 0.0
+
+        if row.penalties:
+            score, goal_diff = 0.5, 0
+        else:
+            score = {'home_team': 1.0, 'away_team': 0.0, 'draw': 0.5}[row.result]
+            goal_diff = abs(int(row.home_result) - int(row.away_result))
+        weight = 1.0 if goal_diff <= 1 else 1.5 if goal_diff == 2 else (11 + goal_diff) / 8
+        expected = 1 / (10 ** ((rating_away - rating_home - advantage) / 400) + 1)
+        delta = K_FACTORS[row.round] * weight * (score - expected)
+        ratings[home], ratings[away] = rating_home + delta, rating_away - delta
+    return ratings
+
+
+class TestEloRatings:
+    """Tests du calcul des classements."""
+
+    def test_same_as_sequential(self, processed_tables):
+        matches, teams = processed_tables
+        elo = EloRatings.from_matches(matches, teams)
+        expected = sequential_elo(matches, host_team_ids(teams))
+
+        ids = np.array(sorted(expected))
+        np.testing.assert_allclose(elo.ratings[ids], [expected[i] for i in ids], rtol=0, atol=1e-9)
+
+    def test_incremental_equals_full(self, processed_tables):
+        """Ajouter les éditions une à une redonne le calcul complet."""
+        matches, teams = processed_tables
+        full = EloRatings.from_matches(matches, teams)
+        incremental = EloRatings.from_matches(matches[matches['edition'] < 2010], teams)
+        for edition in (2010, 2014, 2018, 2022):
+            incremental.update(matches[matches['edition'] == edition])
+
+        np.testing.assert_allclose(incremental.ratings, full.ratings, rtol=0, atol=1e-9)
+        pd.testing.assert_frame_equal(incremental.history, full.history)
+
+    def test_history(self, processed_tables):
+        matches, teams = processed_tables
+        history = EloRatings.from_matches(matches, teams).history
+
+        assert list(history.columns) == HISTORY_COLUMNS
+        assert len(history) == len(matches)
+        assert history['edition'].is_monotonic_increasing
+        # Somme nulle : l'un gagne ce que l'autre perd
+        gained = history['home_rating_after'] - history['home_rating_before']
+        lost = history['away_rating_before'] - history['away_rating_after']
+        np.testing.assert_allclose(gained, lost)
+
+    def test_table(self, processed_tables):
+        matches, teams = processed_tables
+        table = EloRatings.from_matches(matches, teams).table(teams)
+
+        assert table['rating'].is_monotonic_decreasing
+        assert table['matches'].sum() == 2 * len(matches)
+        assert table['nom_standard'].notna().all()
+
+
+class TestWeighting:
+    """Avantage du terrain, coefficient K et tirs au but."""
+
+    def test_winner_gains(self):
+        elo = EloRatings.from_matches(elo_matches([(1990, 'Group Stage', 1, 2, 1, 0, 'home_team')]))
+        assert elo.ratings[1] == BASE_RATING + 30 and elo.ratings[2] == BASE_RATING - 30
+
+    def test_knockout_weighs_more(self):
+        group = EloRatings.from_matches(elo_matches([(1990, 'Group Stage', 1, 2, 1, 0, 'home_team')]))
+        final = EloRatings.from_matches(elo_matches([(1990, 'Final', 1, 2, 1, 0, 'home_team')]))
+        assert final.ratings[1] > group.ratings[1]
+
+    def test_home_advantage(self):
+        """Le pays hôte gagne moins qu'une équipe sur terrain neutre, même s'il joue à l'extérieur."""
+        matches = elo_matches([(1990, 'Group Stage', 2, 1, 0, 1, 'away_team')])
+        neutral = EloRatings.from_matches(matches)
+        hosted = EloRatings.from_matches(matches, hosts={1990: [1]})
+        preliminary = EloRatings.from_matches(matches.assign(round='Preliminary'))
+
+        assert hosted.ratings[1] < neutral.ratings[1]
+        assert preliminary.ratings[1] - BASE_RATING > K_FACTORS['Preliminary'] / 2
+
+    def test_penalties_count_as_draw(self):
+        matches = elo_matches([(1990, 'Final', 1, 2, 1, 1, 'home_team')]).assign(penalties=True)
+        elo = EloRatings.from_matches(matches)
+        assert elo.ratings[1] == elo.ratings[2] == BASE_RATING
+
+
+class TestOrdering:
+    def test_rounds_break_ties(self):
+        matches = elo_matches([
+            (1990, 'Final', 1, 2, 1, 0, 'home_team'),
+            (1990, 'Group Stage', 1, 3, 0, 0, 'draw'),
+            (1986, 'Final', 4, 5, 1, 0, 'home_team'),
+        ])
+        assert chronological_order(matches).tolist() == [2, 1, 0]
+
+    def test_dates_before_rounds(self):
+        matches = elo_matches([
+            (2018, 'Group Stage', 1, 2, 1, 0, 'home_team'),
+            (2018, 'Preliminary', 1, 3, 0, 0, 'draw'),
+        ]).assign(date=pd.to_datetime(['2018-06-14', '2018-06-20']))
+        assert chronological_order(matches).tolist() == [0, 1]
+
+    def test_levels_share_no_team(self):
+        home, away = np.array([1, 3, 1, 2]), np.array([2, 4, 3, 4])
+        assert match_levels(home, away, 5).tolist() == [0, 0, 1, 1]
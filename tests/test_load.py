@@ -0,0 +1,608 @@
+"""
+Tests du chargement par COPY (load.py).
+
+Sans serveur PostgreSQL, l'orchestration est testée contre une base SQLite
+derrière un backend de même interface que PostgresBackend : les partitions
+sont des tables matches_<année> déclarées dans partition_bounds, et COPY est
+émulé par un INSERT des lignes du tampon CSV.
+"""
+
+import csv
+import itertools
+import sqlite3
+import threading
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from load import (
+    MATCH_DB_COLUMNS,
+    TEAM_DB_COLUMNS,
+    Changes,
+    ConnectionPool,
+    PostgresBackend,
+    _db_text,
+    load_database,
+    match_keys,
+    partition_summary,
+    split_by_partition,
+    to_copy_buffer,
+    upsert_database,
+)
+from schema import coerce_matches
+from stats import STATS_QUERIES, pair_edition_stats, team_edition_stats, team_match_rows
+
+EDITIONS = [1930, 1934, 1938, 1950, 1954, 1958, 1962, 1966, 1970, 1974, 1978, 1982,
+            1986, 1990, 1994, 1998, 2002, 2006, 2010, 2014, 2018, 2022, 2030]
+
+
+class SQLiteBackend(PostgresBackend):
+    """Backend de test : même interface que PostgresBackend, sur SQLite."""
+
+    # Comme PostgreSQL pour un index sans nom : un nom jamais réutilisé
+    _index_ids = itertools.count()
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.copies = []
+        self.events = []
+        self.deleted = {}
+        self.fetched = []
+        self._lock = threading.Lock()
+
+    def _record(self, event, table):
+        with self._lock:
+            self.events.append((event, table))
+
+    def copy(self, cursor, table, columns, buffer):
+        if table == self.fail_on:
+            raise RuntimeError(f"COPY interrompu sur {table}")
+        rows = [[value if value != '' else None for value in row] for row in csv.reader(buffer)]
+        placeholders = ', '.join('?' for _ in columns)
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        self._record('copy', table)
+        with self._lock:
+            self.copies.append((table, len(rows)))
+
+    def partitions(self, cursor, parent):
+        cursor.execute("SELECT name, lower, upper FROM partition_bounds WHERE parent = ?", (parent,))
+        return {name: (lower, upper) for name, lower, upper in cursor.fetchall()}
+
+    def create_staging(self, cursor, staging, like, temporary=False):
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        temp = "TEMP " if temporary else ""
+        cursor.execute(f"CREATE {temp}TABLE {staging} AS SELECT * FROM {like} WHERE 0")
+
+    def create_partition_indexes(self, cursor, parent, table, bounds):
+        cursor.execute(f"CREATE UNIQUE INDEX {table}_pkey_{next(self._index_ids)} ON {table} (id_match, edition)")
+        self._record('indexes', table)
+
+    def analyze(self, cursor, table):
+        super().analyze(cursor, table)
+        self._record('analyze', table)
+
+    def drop_partition(self, cursor, parent, name):
+        cursor.execute("DELETE FROM partition_bounds WHERE name = ?", (name,))
+        cursor.execute(f"DROP TABLE {name}")
+
+    def attach_partition(self, cursor, parent, staging, name, bounds):
+        cursor.execute(f"ALTER TABLE {staging} RENAME TO {name}")
+        cursor.execute("INSERT INTO partition_bounds VALUES (?, ?, ?, ?)", (parent, name, *bounds))
+
+    def fetch_rows(self, cursor, table, columns):
+        with self._lock:
+            self.fetched.append(table)
+        return super().fetch_rows(cursor, table, columns)
+
+    def summarize_rows(self, cursor, table, columns):
+        # Pas de MD5 en SQLite : même calcul, côté Python
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table}")
+        rows = [[_db_text(value) for value in row] for row in cursor.fetchall()]
+        return partition_summary(pd.DataFrame(rows, columns=columns, dtype=object), columns)
+
+    def max_value(self, cursor, table, column):
+        cursor.execute(f"SELECT MAX(CAST({column} AS INTEGER)) FROM {table}")
+        return cursor.fetchone()[0]
+
+    def upsert_rows(self, cursor, table, staging, columns, conflict):
+        # SQLite : "WHERE true" lève l'ambiguïté entre ON CONFLICT et une jointure
+        column_list = ', '.join(columns)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns if column not in conflict)
+        cursor.execute(
+            f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} WHERE true "
+            f"ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {updates}"
+        )
+        self._record('upsert', table)
+
+    def delete_rows(self, cursor, table, column, values):
+        cursor.executemany(f"DELETE FROM {table} WHERE {column} = ?", [(str(value),) for value in values])
+        self._record('delete', table)
+        with self._lock:
+            self.deleted[table] = list(values)
+
+    def reset_sequence(self, cursor, table, column):
+        pass
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Base SQLite avec teams, le parent matches et une partition par édition."""
+    path = tmp_path / "worldcup.db"
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE teams (id_team INTEGER PRIMARY KEY, {', '.join(TEAM_DB_COLUMNS[1:])})")
+    conn.execute(f"CREATE TABLE matches ({', '.join(MATCH_DB_COLUMNS)})")
+    conn.execute("CREATE TABLE partition_bounds (parent, name, lower, upper)")
+    for year, next_year in zip(EDITIONS, EDITIONS[1:]):
+        conn.execute(f"CREATE TABLE matches_{year} AS SELECT * FROM matches WHERE 0")
+        conn.execute(f"CREATE UNIQUE INDEX matches_{year}_pkey ON matches_{year} (id_match, edition)")
+        conn.execute("INSERT INTO partition_bounds VALUES ('matches', ?, ?, ?)",
+                     (f"matches_{year}", year, next_year))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def connect(db_path):
+    """Ouvre des connexions à la base de test, utilisables depuis un autre thread."""
+    opened = []
+
+    def connect():
+        conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        opened.append(conn)
+        return conn
+
+    connect.opened = opened
+    return connect
+
+
+@pytest.fixture
+def conn(connect):
+    conn = connect()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def real_tables(real_matches_csv, project_root):
+    matches = coerce_matches(pd.read_csv(real_matches_csv))
+    teams = pd.read_csv(project_root / "data/processed/teams_traitees.csv")
+    return matches, teams
+
+
+def count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestCopyBuffer:
+    """Tests de la sérialisation CSV pour COPY."""
+
+    def test_formats(self):
+        df = coerce_matches(pd.DataFrame({
+            'extra_time': [True, False],
+            'date': ['2018-06-14', None],
+            'city': ['Rio de Janeiro, RJ', None],
+        }))
+        buffer = to_copy_buffer(df, ['extra_time', 'date', 'city'])
+
+        assert buffer.read().splitlines() == ['t,2018-06-14,"Rio de Janeiro, RJ"', 'f,,']
+
+
+class TestLoadDatabase:
+    """Tests de load_database."""
+
+    def test_load_counts(self, conn, real_tables):
+        """Une copie par partition, toutes les lignes chargées."""
+        matches, teams = real_tables
+        backend = SQLiteBackend()
+
+        counts = load_database(conn, matches, teams, backend=backend)
+
+        assert count(conn, "teams") == len(teams)
+        assert count(conn, "matches_2018") == 64
+        assert sum(n for name, n in counts.items() if name != 'teams') == len(matches)
+        # teams, une copie par partition, puis team_match et les deux tables d'agrégats
+        assert len(backend.copies) == 1 + len(EDITIONS) - 1 + 3
+        assert not any(t.endswith('_staging') for t, in
+                       conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+
+    def test_reload_replaces(self, conn, real_tables):
+        """Un second chargement remplace les lignes au lieu de les ajouter."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        load_database(conn, matches[matches['edition'] != 2018], teams, backend=SQLiteBackend())
+
+        assert count(conn, "matches_2018") == 0
+        assert count(conn, "matches_2022") == 64
+        assert count(conn, "teams") == len(teams)
+
+    def test_values_round_trip(self, conn, real_tables):
+        """Les valeurs copiées sont celles du DataFrame."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+
+        row = conn.execute(
+            "SELECT id_match, home_result, result, extra_time, date, round, stadium_id "
+            "FROM matches_2022 ORDER BY id_match LIMIT 1"
+        ).fetchone()
+        expected = matches[matches['edition'] == 2022].iloc[0]
+        assert int(row[0]) == expected['id_match']
+        assert row[2] == expected['result']
+        assert row[3] in ('t', 'f')
+        assert row[4] == expected['date'].strftime('%Y-%m-%d')
+        assert row[6] == expected['id_stadium']
+
+    def test_failure_rolls_back(self, conn, real_tables):
+        """Un échec en cours de copie laisse la base dans son état précédent."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+
+        with pytest.raises(RuntimeError):
+            load_database(conn, matches.head(10), teams.head(5),
+                          backend=SQLiteBackend(fail_on="matches_1990_staging"))
+
+        assert count(conn, "teams") == len(teams)
+        assert count(conn, "matches_2018") == 64
+
+    def test_edition_without_partition(self, conn, real_tables):
+        matches, teams = real_tables
+        matches = matches.assign(edition=matches['edition'].where(matches['edition'] != 2022, 2034))
+
+        with pytest.raises(ValueError, match="2034"):
+            load_database(conn, matches, teams, backend=SQLiteBackend())
+        assert count(conn, "teams") == 0
+
+
+class TestParallelLoad:
+    """Tests du chargement parallèle des partitions."""
+
+    def test_parallel_matches_sequential(self, conn, connect, real_tables):
+        """Le chargement parallèle donne les mêmes partitions."""
+        matches, teams = real_tables
+        counts = load_database(conn, matches, teams, backend=SQLiteBackend(),
+                               connect=connect, workers=4)
+
+        assert counts['matches_2018'] == count(conn, "matches_2018") == 64
+        assert sum(count(conn, f"matches_{year}") for year in EDITIONS[:-1]) == len(matches)
+        assert count(conn, "teams") == len(teams)
+
+    def test_pool_is_bounded(self, conn, connect, real_tables):
+        """Au plus workers connexions sont ouvertes, en plus de conn."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend(), connect=connect, workers=3)
+
+        assert len(connect.opened) <= 1 + 3
+
+    def test_indexes_after_copy(self, conn, connect, real_tables):
+        """Index et ANALYZE de chaque partition viennent après sa copie."""
+        matches, teams = real_tables
+        backend = SQLiteBackend()
+        load_database(conn, matches, teams, backend=backend, connect=connect, workers=4)
+
+        for year in EDITIONS[:-1]:
+            table = f"matches_{year}_staging"
+            steps = [event for event, name in backend.events if name == table]
+            assert steps == ['copy', 'indexes', 'analyze']
+
+    def test_failure_drops_staging(self, conn, connect, real_tables):
+        """Un worker en échec : anciennes partitions intactes, staging supprimé."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+
+        with pytest.raises(RuntimeError):
+            load_database(conn, matches.head(10), teams.head(5),
+                          backend=SQLiteBackend(fail_on="matches_1990_staging"),
+                          connect=connect, workers=4)
+
+        assert count(conn, "teams") == len(teams)
+        assert count(conn, "matches_2018") == 64
+        assert not any(t.endswith('_staging') for t, in
+                       conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+
+
+class TestConnectionPool:
+    def test_reuses_connections(self):
+        opened = []
+        pool = ConnectionPool(lambda: opened.append(object()) or opened[-1], size=2)
+
+        for _ in range(5):
+            with pool.acquire() as conn:
+                assert conn is opened[0]
+        assert len(opened) == 1
+
+
+class TestUpsertDatabase:
+    """Tests du chargement incrémental."""
+
+    def test_empty_database(self, conn, real_tables):
+        """Sur une base vide, tout est inséré."""
+        matches, teams = real_tables
+        changes = upsert_database(conn, matches, teams, backend=SQLiteBackend())
+
+        assert changes['teams'] == Changes(len(teams), 0, 0)
+        assert changes['matches_2018'] == Changes(64, 0, 0)
+        assert count(conn, "matches_2018") == 64
+
+    def test_unchanged_is_noop(self, conn, real_tables):
+        """Sans différence, aucune partition n'est touchée."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        backend = SQLiteBackend()
+
+        assert upsert_database(conn, matches, teams, backend=backend) == {}
+        assert backend.events == []
+        assert backend.fetched == ['teams']
+
+    def test_only_changed_partition(self, conn, real_tables):
+        """Un score corrigé ne touche que sa partition et garde l'id_match en base."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        first = matches.index[matches['edition'] == 2018][0]
+        matches.loc[first, 'home_result'] = 9
+        matches['id_match'] += 1000
+        backend = SQLiteBackend()
+
+        changes = upsert_database(conn, matches, teams, backend=backend)
+
+        assert changes == {'matches_2018': Changes(0, 1, 0)}
+        touched = {table for _, table in backend.events if table.startswith('matches')}
+        assert touched == {'matches_2018_upsert', 'matches_2018'}
+        assert backend.fetched == ['teams', 'matches_2018']
+        id_match = matches.loc[first, 'id_match'] - 1000
+        assert conn.execute(
+            "SELECT home_result FROM matches_2018 WHERE id_match = ?", (str(id_match),)
+        ).fetchone() == ('9',)
+
+    def test_insert_and_delete(self, conn, real_tables):
+        """Un match retiré est supprimé, un nouveau reçoit l'id_match suivant."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        final = matches[matches['edition'] == 2022].tail(1)
+        replay = final.assign(date=final['date'] + pd.Timedelta(days=2)).astype(matches.dtypes.to_dict())
+        matches = pd.concat([matches.drop(final.index[0] - 1), replay], ignore_index=True)
+
+        changes = upsert_database(conn, matches, teams, backend=SQLiteBackend())
+
+        assert changes == {'matches_2022': Changes(1, 0, 1)}
+        assert count(conn, "matches_2022") == 64
+        new_id = conn.execute("SELECT MAX(CAST(id_match AS INTEGER)) FROM matches_2022").fetchone()[0]
+        assert new_id == matches['id_match'].max() + 1
+
+    def test_team_update(self, conn, real_tables):
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        teams.loc[0, 'confederation'] = 'UEFA'
+
+        changes = upsert_database(conn, matches, teams, backend=SQLiteBackend())
+
+        assert changes == {'teams': Changes(0, 1, 0)}
+        assert conn.execute("SELECT confederation FROM teams WHERE id_team = 1").fetchone() == ('UEFA',)
+
+
+class TestMaterializedStats:
+    """Agrégats matérialisés : rafraîchissement et requêtes d'analyse."""
+
+    def test_champions(self, conn, real_tables):
+        """Les titres lus dans team_edition_stats sont ceux des finales."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+
+        champions = pd.read_sql(STATS_QUERIES['champions'], conn)
+
+        finals = matches[matches['round'] == 'Final']
+        winners = finals['home_team_id'].where(finals['result'] == 'home_team', finals['away_team_id'])
+        names = teams.set_index('id_team')['nom_standard']
+        expected = winners.map(names).value_counts()
+        assert champions.set_index('equipe')['titres'].to_dict() == expected.to_dict()
+
+    def test_team_by_edition_and_head_to_head(self, conn, real_tables):
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        names = teams.set_index('id_team')['nom_standard']
+        final = matches[(matches['round'] == 'Final') & (matches['edition'] == 2022)].iloc[0]
+        home, away = names[final['home_team_id']], names[final['away_team_id']]
+
+        by_edition = pd.read_sql(STATS_QUERIES['team_by_edition'], conn, params={'team': home})
+        assert by_edition.set_index('edition').loc[2022, 'best_round_rank'] == 6
+
+        h2h = pd.read_sql(STATS_QUERIES['head_to_head'], conn, params={'team1': home, 'team2': away})
+        pairs = pair_edition_stats(matches)
+        low, high = sorted([final['home_team_id'], final['away_team_id']])
+        pair = pairs[(pairs['team_a_id'] == low) & (pairs['team_b_id'] == high)]
+        assert h2h['total_matches'].iloc[0] == pair['matches'].sum()
+        assert h2h['team_a'].iloc[0] == names[low]
+
+    def test_upsert_refreshes_touched_editions(self, conn, real_tables):
+        """Un upsert ne recalcule que les éditions des partitions modifiées."""
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        first = matches.index[matches['edition'] == 2018][0]
+        matches.loc[first, 'home_result'] += 1
+        backend = SQLiteBackend()
+
+        upsert_database(conn, matches, teams, backend=backend)
+
+        assert backend.deleted['team_edition_stats'] == [2018]
+        assert backend.deleted['pair_edition_stats'] == [2018]
+        loaded = pd.read_sql("SELECT * FROM team_edition_stats ORDER BY id_team, edition", conn)
+        pd.testing.assert_frame_equal(loaded, team_edition_stats(matches), check_dtype=False)
+
+
+# Requêtes historiques des notebooks 08 et 09 (jointures OR), pour comparaison
+# (les partitions du stand-in SQLite gardent les scores en texte, d'où les CAST)
+LEGACY_QUERIES = {
+    'matches_played': """
+        SELECT t.nom_standard AS equipe, COUNT(*) AS matchs
+        FROM teams t
+        JOIN all_matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+        WHERE m.round != 'Preliminary'
+        GROUP BY t.nom_standard
+        ORDER BY matchs DESC, equipe
+        LIMIT 15
+    """,
+    'wins': """
+        SELECT t.nom_standard AS equipe, COUNT(*) AS victoires
+        FROM all_matches m
+        JOIN teams t ON (
+            (m.result = 'home_team' AND m.home_team_id = t.id_team) OR
+            (m.result = 'away_team' AND m.away_team_id = t.id_team)
+        )
+        GROUP BY t.nom_standard
+        ORDER BY victoires DESC, equipe
+        LIMIT 15
+    """,
+    'confederations': """
+        SELECT
+            t.confederation,
+            COUNT(DISTINCT t.id_team) AS nb_equipes,
+            COUNT(*) AS matchs_joues
+        FROM teams t
+        JOIN all_matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+        WHERE t.confederation IS NOT NULL
+        GROUP BY t.confederation
+        ORDER BY matchs_joues DESC
+    """,
+    'draws': """
+        SELECT
+            t.nom_standard AS equipe,
+            COUNT(*) AS total_matchs,
+            SUM(CASE WHEN m.result = 'draw' THEN 1 ELSE 0 END) AS nuls,
+            ROUND(100.0 * SUM(CASE WHEN m.result = 'draw' THEN 1 ELSE 0 END) / COUNT(*), 1) AS pct_nuls,
+            SUM(CASE WHEN m.result = 'draw' AND CAST(m.home_result AS INTEGER) = 0 THEN 1 ELSE 0 END) AS nuls_0_0,
+            SUM(CASE WHEN m.result = 'draw' AND CAST(m.home_result AS INTEGER) > 0 THEN 1 ELSE 0 END) AS nuls_avec_buts
+        FROM teams t
+        JOIN all_matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+        WHERE m.round != 'Preliminary'
+        GROUP BY t.nom_standard
+        HAVING COUNT(*) >= 10
+        ORDER BY pct_nuls DESC, equipe
+        LIMIT 20
+    """,
+    'knockout': """
+        WITH knockout_matches AS (
+            SELECT
+                t.nom_standard,
+                m.round,
+                CASE
+                    WHEN (m.home_team_id = t.id_team AND m.result = 'home_team')
+                         OR (m.away_team_id = t.id_team AND m.result = 'away_team') THEN 1
+                    ELSE 0
+                END AS win,
+                m.penalties
+            FROM teams t
+            JOIN all_matches m ON t.id_team IN (m.home_team_id, m.away_team_id)
+            WHERE m.round IN ('Round of 16', 'Quarter-finals', 'Semi-finals', 'Third Place', 'Final')
+        )
+        SELECT
+            nom_standard AS equipe,
+            SUM(CASE WHEN round = 'Round of 16' THEN 1 ELSE 0 END) AS r16_matchs,
+            SUM(CASE WHEN round = 'Round of 16' AND win = 1 THEN 1 ELSE 0 END) AS r16_wins,
+            SUM(CASE WHEN round = 'Quarter-finals' THEN 1 ELSE 0 END) AS qf_matchs,
+            SUM(CASE WHEN round = 'Quarter-finals' AND win = 1 THEN 1 ELSE 0 END) AS qf_wins,
+            SUM(CASE WHEN round = 'Semi-finals' THEN 1 ELSE 0 END) AS sf_matchs,
+            SUM(CASE WHEN round = 'Semi-finals' AND win = 1 THEN 1 ELSE 0 END) AS sf_wins,
+            SUM(CASE WHEN round = 'Final' THEN 1 ELSE 0 END) AS finales,
+            SUM(CASE WHEN round = 'Final' AND win = 1 THEN 1 ELSE 0 END) AS titres,
+            COUNT(*) AS total_knockout,
+            SUM(win) AS total_wins,
+            ROUND(100.0 * SUM(win) / COUNT(*), 1) AS knockout_win_rate,
+            SUM(CASE WHEN penalties THEN 1 ELSE 0 END) AS tirs_au_but
+        FROM knockout_matches
+        GROUP BY nom_standard
+        HAVING COUNT(*) >= 5
+        ORDER BY titres DESC, knockout_win_rate DESC, equipe
+        LIMIT 20
+    """,
+}
+
+
+class TestTeamMatch:
+    """Table de faits team_match."""
+
+    @pytest.fixture
+    def loaded(self, conn, real_tables):
+        matches, teams = real_tables
+        load_database(conn, matches, teams, backend=SQLiteBackend())
+        partitions = " UNION ALL ".join(f"SELECT * FROM matches_{year}" for year in EDITIONS[:-1])
+        conn.execute(f"CREATE TEMP VIEW all_matches AS {partitions}")
+        return matches, teams
+
+    def test_two_rows_per_match(self, conn, loaded):
+        matches, _ = loaded
+        assert count(conn, "team_match") == 2 * len(matches)
+        assert conn.execute("SELECT COUNT(*) FROM team_match WHERE is_home = 't'").fetchone()[0] == len(matches)
+
+    @pytest.mark.parametrize("name", sorted(LEGACY_QUERIES))
+    def test_same_results_as_or_joins(self, conn, loaded, name):
+        """Les requêtes réécrites sur team_match donnent les résultats des jointures OR."""
+        expected = pd.read_sql(LEGACY_QUERIES[name], conn)
+        result = pd.read_sql(STATS_QUERIES[name], conn)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_head_to_head_matches(self, conn, loaded):
+        matches, teams = loaded
+        names = teams.set_index('id_team')['nom_standard']
+        final = matches[(matches['round'] == 'Final') & (matches['edition'] == 2022)].iloc[0]
+        params = {'team1': names[final['home_team_id']], 'team2': names[final['away_team_id']]}
+
+        h2h = pd.read_sql(STATS_QUERIES['head_to_head_matches'], conn, params=params)
+
+        rows = team_match_rows(matches)
+        pair = rows[(rows['team_id'] == final['home_team_id']) & (rows['opponent_id'] == final['away_team_id'])]
+        assert len(h2h) == len(pair)
+        assert h2h.iloc[0]['edition'] == 2022
+
+    def test_upsert_uses_database_ids(self, conn, loaded):
+        """Après un upsert, team_match référence les id_match de la base."""
+        matches, teams = loaded
+        final = matches[matches['edition'] == 2022].tail(1)
+        replay = final.assign(date=final['date'] + pd.Timedelta(days=2)).astype(matches.dtypes.to_dict())
+        matches = pd.concat([matches, replay], ignore_index=True)
+        matches['id_match'] += 5000
+
+        upsert_database(conn, matches, teams, backend=SQLiteBackend())
+
+        orphans = conn.execute(
+            "SELECT COUNT(*) FROM team_match tm WHERE tm.edition = 2022 AND NOT EXISTS "
+            "(SELECT 1 FROM matches_2022 m WHERE CAST(m.id_match AS INTEGER) = tm.id_match)"
+        ).fetchone()[0]
+        assert orphans == 0
+        assert conn.execute("SELECT COUNT(*) FROM team_match WHERE edition = 2022").fetchone()[0] == 2 * 65
+
+
+class TestMatchKeys:
+    def test_replays_are_distinct_and_stable(self):
+        """Deux matchs identiques sans date sont départagés par l'ordre des id_match."""
+        text = pd.DataFrame({
+            'id_match': ['7', '3', '5'], 'edition': ['1934'] * 3, 'round': ['Round of 16'] * 3,
+            'home_team_id': ['1', '1', '2'], 'away_team_id': ['2', '2', '1'], 'date': [''] * 3,
+        })
+        keys = match_keys(text)
+
+        assert keys.is_unique
+        assert keys[1].endswith('#0') and keys[0].endswith('#1')
+
+
+class TestPartitionSummary:
+    def test_order_independent_value_sensitive(self):
+        text = pd.DataFrame({'edition': ['1934', '1934'], 'home_result': ['1', '3'], 'date': ['', '1934-06-10']})
+        columns = list(text.columns)
+        summary = partition_summary(text, columns)
+
+        assert summary[0] == 2
+        assert partition_summary(text.iloc[::-1], columns) == summary
+        assert partition_summary(text.assign(home_result=['1', '4']), columns) != summary
+        assert partition_summary(text.iloc[:0], columns) == (0, 0)
+
+
+class TestSplitByPartition:
+    def test_bounds_are_half_open(self):
+        matches = pd.DataFrame({'edition': [1930, 1934, 1937]})
+        parts = split_by_partition(matches, {'p1930': (1930, 1934), 'p1934': (1934, 1938)})
+
+        assert parts['p1930']['edition'].tolist() == [1930]
+        assert parts['p1934']['edition'].tolist() == [1934, 1937]
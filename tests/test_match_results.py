@@ -0,0 +1,119 @@
+"""
+Tests unitaires pour match_results.py
+
+Vérifie la résolution vectorisée des matchs nuls en phase éliminatoire
+sur un petit tableau construit à la main.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import make_matches
+from match_results import build_round_membership, resolve_knockout_results
+
+
+@pytest.fixture
+def bracket_df():
+    """Édition 1990 : demi-finales, 3e place et finale, avec des nuls à départager."""
+    return make_matches([
+        (1990, 'Group Stage', 'A', 'B', 1, 1, 'draw', False),
+        (1990, 'Semi-finals', 'A', 'B', 1, 1, 'draw', False),   # A en finale
+        (1990, 'Semi-finals', 'C', 'D', 0, 0, 'draw', False),   # C en 3e place -> D gagne
+        (1990, 'Third Place', 'B', 'C', 2, 1, 'home_team', False),
+        (1990, 'Final', 'A', 'D', 0, 0, 'draw', False),
+    ])
+
+
+class TestBuildRoundMembership:
+    """Tests de la table d'appartenance (édition, tour, équipe)."""
+
+    def test_unique_triplets(self, bracket_df):
+        """Chaque participation n'apparaît qu'une fois."""
+        membership = build_round_membership(bracket_df)
+
+        assert not membership.duplicated().any()
+        semis = membership[membership['round'] == 'Semi-finals']
+        assert set(semis['team']) == {'A', 'B', 'C', 'D'}
+
+    def test_rounds_filter(self, bracket_df):
+        """Seuls les tours demandés sont indexés."""
+        membership = build_round_membership(bracket_df, rounds={'Final'})
+
+        assert set(membership['round']) == {'Final'}
+        assert set(membership['team']) == {'A', 'D'}
+
+
+class TestResolveKnockoutResults:
+    """Tests de resolve_knockout_results."""
+
+    def test_winner_from_next_round(self, bracket_df):
+        """L'équipe présente au tour suivant a gagné."""
+        result = resolve_knockout_results(bracket_df)
+        assert result[1] == 'home_team'
+
+    def test_loser_from_third_place(self, bracket_df):
+        """L'équipe présente au match pour la 3e place a perdu."""
+        result = resolve_knockout_results(bracket_df)
+        assert result[2] == 'away_team'
+
+    def test_group_draw_kept(self, bracket_df):
+        """Un nul en phase de groupes reste un nul."""
+        result = resolve_knockout_results(bracket_df)
+        assert result[0] == 'draw'
+
+    def test_final_penalty_winner(self, bracket_df):
+        """Une finale aux tirs au but est résolue par penalty_winners."""
+        assert resolve_knockout_results(bracket_df)[4] == 'draw'
+        result = resolve_knockout_results(bracket_df, penalty_winners={1990: 'D'})
+        assert result[4] == 'away_team'
+
+    def test_non_draw_results_kept(self, bracket_df):
+        """Les résultats différents de 'draw' ne sont pas recalculés."""
+        bracket_df.loc[1, 'result'] = 'away_team'
+        result = resolve_knockout_results(bracket_df)
+        assert result[1] == 'away_team'
+        assert result[3] == 'home_team'
+
+    def test_replay_draw_kept(self, bracket_df):
+        """Un nul suivi d'un replay reste un nul."""
+        bracket_df.loc[1, 'replay'] = True
+        result = resolve_knockout_results(bracket_df)
+        assert result[1] == 'draw'
+
+    def test_score_decides_mislabelled_draw(self, bracket_df):
+        """Un 'draw' avec des scores différents est corrigé par le score."""
+        bracket_df.loc[2, ['home_result', 'away_result']] = [3, 1]
+        result = resolve_knockout_results(bracket_df)
+        assert result[2] == 'home_team'
+
+    def test_editions_are_independent(self, bracket_df):
+        """La présence au tour suivant d'une autre édition ne compte pas."""
+        other = bracket_df.assign(edition=1994)
+        other = other[other['round'] == 'Semi-finals']
+        matches = pd.concat([bracket_df, other], ignore_index=True)
+
+        result = resolve_knockout_results(matches)
+
+        # Sans finale ni 3e place en 1994, les demi-finales restent indécises
+        assert result[len(bracket_df):].tolist() == ['draw', 'draw']
+        assert result[1] == 'home_team'
+
+    def test_index_preserved(self, bracket_df):
+        """Le résultat est aligné sur l'index d'entrée."""
+        shuffled = bracket_df.sample(frac=1, random_state=0)
+        shuffled.index = shuffled.index + 100
+
+        result = resolve_knockout_results(shuffled)
+
+        assert result.index.equals(shuffled.index)
+        assert result[101] == 'home_team'
+
+    def test_real_matches_unchanged(self, real_matches_csv):
+        """Les résultats de matches.csv sont déjà résolus : rien ne change."""
+        matches = pd.read_csv(real_matches_csv)
+        result = resolve_knockout_results(matches)
+        assert result.equals(matches['result'])
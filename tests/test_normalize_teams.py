@@ -20,7 +20,13 @@ from teams_reference import (
     normalize_team_name,
     get_confederation,
     get_aliases,
+    build_aliases_index,
     build_alias_to_fifa_mapping,
+    canonical_team_key,
+    get_resolver,
+    TeamNameResolver,
+    normalize_team_names,
+    get_confederations_for,
     CONFEDERATIONS,
 )
 
@@ -41,7 +47,7 @@ class TestNormalizeTeamName:
 
     def test_normalize_case_sensitivity(self):
         """La normalisation est insensible à la casse."""
-        # Ces tests dépendent de CONFEDERATIONS_LOWER
+        # Ces tests dépendent de l'index canonique du résolveur
         result = normalize_team_name("ARGENTINA")
         assert result == "Argentina"
 
@@ -80,6 +86,68 @@ class TestNormalizeTeamName:
         result = normalize_team_name("Ivory Coast (Côte d'Ivoire)")
         assert result == "Côte d'Ivoire"
     
+class TestTeamNameResolver:
+    """Tests pour le résolveur précompilé TeamNameResolver."""
+
+    def test_canonical_key(self):
+        """La clé canonique est NFKC, casefold et sans espaces de bord."""
+        assert canonical_team_key("  FRANCE ") == "france"
+        assert canonical_team_key("Straße") == "strasse"
+
+    def test_resolver_matches_normalize_team_name(self):
+        """Le résolveur partagé est utilisé par normalize_team_name."""
+        resolver = get_resolver()
+        for name in ["France", "West Germany", "A1", "ARGENTINA", "Unknown Team"]:
+            assert resolver.resolve(name) == normalize_team_name(name)
+
+    def test_resolver_known_names(self):
+        """Tous les aliases et noms standards sont résolus."""
+        from teams_constants import ALIASES_MAPPING_LOWER
+
+        resolver = get_resolver()
+        for alias, standard in ALIASES_MAPPING_LOWER.items():
+            assert resolver.resolve(alias) == standard
+        for team in CONFEDERATIONS:
+            if team.lower() not in ALIASES_MAPPING_LOWER:
+                assert resolver.resolve(team) == team
+
+    def test_resolver_strips_whitespace(self):
+        """Les espaces de bord sont ignorés."""
+        assert get_resolver().resolve("  France  ") == "France"
+        assert get_resolver().resolve(" Unknown Team ") == "Unknown Team"
+
+    def test_resolver_prefix_trie(self):
+        """La famille "Nom (NomLocal)" est résolue par préfixe."""
+        resolver = get_resolver()
+        assert resolver.resolve("Armenia (Հայաստան)") == "Armenia"
+        assert resolver.resolve("Ivory Coast (Côte d’Ivoire)") == "Côte d'Ivoire"
+        assert resolver.resolve("Ethiopia (ኢትዮ)") == "Ethiopia"
+
+    def test_resolver_custom_sources(self, mock_confederations, mock_aliases_mapping):
+        """Le résolveur se construit depuis des sources arbitraires."""
+        resolver = TeamNameResolver(
+            mock_confederations,
+            aliases=mock_aliases_mapping,
+            placeholders={"X1"},
+            prefixes={"Germany (": "Germany"},
+        )
+        assert resolver.resolve("west germany") == "Germany"
+        assert resolver.resolve("Germany (BRD)") == "Germany"
+        assert resolver.resolve("X1") is None
+        assert resolver.resolve("x1") == "x1"
+
+    def test_resolver_index_is_read_only(self):
+        """L'index exposé n'est pas modifiable."""
+        with pytest.raises(TypeError):
+            get_resolver().index["france"] = "Brazil"
+
+    def test_resolver_non_string_input(self):
+        """Les entrées non textuelles sont converties comme avant."""
+        assert get_resolver().resolve(None) is None
+        assert get_resolver().resolve(1) is None  # placeholder "1"
+        assert get_resolver().resolve(12) == "12"
+
+
 class TestGetConfederation:
     """Tests pour la fonction get_confederation."""
 
@@ -108,6 +176,46 @@ class TestGetConfederation:
         assert get_confederation("A1") is None
 
 
+class TestBatchNormalization:
+    """Tests pour normalize_team_names et get_confederations_for."""
+
+    def test_batch_matches_scalar(self, sample_teams_df):
+        """Le chemin vectorisé donne les mêmes résultats que le scalaire."""
+        names = sample_teams_df['nom_standard']
+        result = normalize_team_names(names)
+        assert result.tolist() == [normalize_team_name(n) for n in names]
+
+    def test_batch_preserves_index_and_name(self):
+        """L'index et le nom de la Series d'entrée sont conservés."""
+        names = pd.Series(['FRG', 'France'], index=[10, 20], name='team')
+        result = normalize_team_names(names)
+        assert list(result.index) == [10, 20]
+        assert result.name == 'team'
+
+    def test_batch_returns_categorical(self):
+        """Les noms bruts équivalents partagent la même catégorie."""
+        names = pd.Series(['FRG', 'West Germany', 'Germany', 'France'] * 100)
+        result = normalize_team_names(names)
+        assert isinstance(result.dtype, pd.CategoricalDtype)
+        assert set(result.cat.categories) == {'Germany', 'France'}
+        assert len(result) == 400
+
+    def test_batch_placeholders_and_missing(self):
+        """Placeholders et valeurs manquantes donnent NaN."""
+        result = normalize_team_names(pd.Series(['A1', None, float('nan'), 'Brazil']))
+        assert result.isna().tolist() == [True, True, True, False]
+
+    def test_batch_empty_series(self):
+        """Une Series vide reste vide."""
+        assert len(normalize_team_names(pd.Series([], dtype=object))) == 0
+
+    def test_confederations_for(self):
+        """Confédérations vectorisées, y compris via alias."""
+        result = get_confederations_for(pd.Series(['France', 'FRG', 'Brazil', 'Unknown Team XYZ']))
+        assert result.iloc[:3].tolist() == ['UEFA', 'UEFA', 'CONMEBOL']
+        assert pd.isna(result.iloc[3])
+
+
 class TestGetAliases:
     """Tests pour la fonction get_aliases."""
 
@@ -128,6 +236,25 @@ class TestGetAliases:
         """Équipe inconnue retourne liste vide."""
         aliases = get_aliases("Unknown Team XYZ")
         assert aliases == []
+
+    def test_get_aliases_preserves_mapping_order(self):
+        """L'ordre des aliases suit celui de ALIASES_MAPPING."""
+        from teams_constants import ALIASES_MAPPING
+
+        expected = [alias for alias, std in ALIASES_MAPPING.items() if std == "Germany"]
+        assert get_aliases("Germany") == expected
+
+    def test_get_aliases_returns_a_copy(self):
+        """Modifier la liste retournée n'altère pas l'index."""
+        get_aliases("Germany").append("Atlantis")
+        assert "Atlantis" not in get_aliases("Germany")
+
+    def test_build_aliases_index(self, mock_aliases_mapping):
+        """L'index inversé regroupe les aliases par nom standard."""
+        index = build_aliases_index(mock_aliases_mapping)
+        assert index["Germany"] == ('West Germany', 'FRG', "Allemagne de l'Ouest")
+        assert index["GDR"] == ('East Germany',)
+        assert "France" not in index
         
 class TestBuildAliasToFifaMapping:
     """Tests pour la fonction build_alias_to_fifa_mapping."""
@@ -150,6 +277,105 @@ class TestBuildAliasToFifaMapping:
         for team in CONFEDERATIONS.keys():
             assert team in mapping
             
+class TestConfederationsCache:
+    """Tests du chargement paresseux et du cache disque des confédérations."""
+
+    @pytest.fixture
+    def isolated_sources(self, tmp_path):
+        """Sources JSON/CSV et cache disque isolés dans un répertoire temporaire."""
+        import teams_reference
+
+        mapping_json = tmp_path / "teams_mapping.json"
+        mapping_json.write_text(
+            json.dumps({"France": {"confederation": "UEFA"}}), encoding="utf-8"
+        )
+        with patch.object(teams_reference, 'CONFEDERATIONS_CACHE', mapping_json), \
+                patch.object(teams_reference, 'FIFA_RANKING_CSV', tmp_path / "absent.csv"), \
+                patch.object(teams_reference, 'CONFEDERATIONS_DISK_CACHE', tmp_path / "conf.marshal"):
+            yield teams_reference, mapping_json
+
+    def test_lazy_mapping_loads_on_first_access(self, isolated_sources):
+        """Les sources ne sont lues qu'au premier accès."""
+        teams_reference, _ = isolated_sources
+        lazy = teams_reference._LazyConfederations()
+        assert not lazy.loaded
+        assert lazy["France"] == "UEFA"
+        assert lazy.loaded
+        assert lazy.get("Soviet Union") == "UEFA"  # équipe historique ajoutée
+
+    def test_disk_cache_written_and_reused(self, isolated_sources):
+        """Un second chargement lit le cache sans relire le JSON."""
+        teams_reference, _ = isolated_sources
+        first = teams_reference.get_confederations()
+        assert teams_reference.CONFEDERATIONS_DISK_CACHE.exists()
+
+        with patch.object(teams_reference, '_load_confederations_from_cache') as loader:
+            second = teams_reference.get_confederations()
+        loader.assert_not_called()
+        assert first == second
+
+    def test_disk_cache_survives_touch(self, isolated_sources):
+        """Une source touchée mais inchangée ne force pas de relecture."""
+        teams_reference, mapping_json = isolated_sources
+        teams_reference.get_confederations()
+        mapping_json.write_text(mapping_json.read_text(encoding="utf-8"), encoding="utf-8")
+
+        with patch.object(teams_reference, '_load_confederations_from_cache') as loader:
+            teams_reference.get_confederations()
+        loader.assert_not_called()
+
+    def test_disk_cache_invalidated_on_change(self, isolated_sources):
+        """Une source modifiée invalide le cache."""
+        teams_reference, mapping_json = isolated_sources
+        teams_reference.get_confederations()
+        mapping_json.write_text(
+            json.dumps({"France": {"confederation": "UEFA"}, "Brazil": {"confederation": "CONMEBOL"}}),
+            encoding="utf-8",
+        )
+        assert teams_reference.get_confederations()["Brazil"] == "CONMEBOL"
+
+    def test_corrupted_disk_cache_is_ignored(self, isolated_sources):
+        """Un cache illisible est reconstruit."""
+        teams_reference, _ = isolated_sources
+        teams_reference.CONFEDERATIONS_DISK_CACHE.write_bytes(b"pas du marshal")
+        assert teams_reference.get_confederations()["France"] == "UEFA"
+
+
+class TestImportFootprint:
+    """Les fonctions de recherche scalaires n'importent pas pandas."""
+
+    @pytest.mark.parametrize("module", ["teams_reference", "normalize_teams"])
+    def test_lookup_surface_without_pandas(self, module):
+        """Import et recherche scalaire sans charger pandas ni numpy."""
+        import subprocess
+
+        code = (
+            "import sys\n"
+            f"sys.path.insert(0, {str(Path(__file__).parent.parent / 'src')!r})\n"
+            f"import {module}\n"
+            "from teams_reference import (normalize_team_name, get_confederation,\n"
+            "    get_aliases, is_historical_team, get_successor)\n"
+            "assert normalize_team_name('FRG') == 'Germany'\n"
+            "assert get_confederation('FRG') == 'UEFA'\n"
+            "assert get_aliases('GDR')\n"
+            "assert is_historical_team('GDR') and get_successor('GDR') == 'Germany'\n"
+            "print('pandas' in sys.modules, 'numpy' in sys.modules)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False False"
+
+    def test_fifa_csv_fallback_without_pandas(self):
+        """Le repli sur le CSV FIFA garde la dernière date du classement."""
+        import teams_reference
+
+        confederations = teams_reference._load_confederations_from_fifa_csv()
+        df = pd.read_csv(teams_reference.FIFA_RANKING_CSV)
+        latest = df[df['rank_date'] == df['rank_date'].max()]
+        assert confederations == latest.set_index('country_full')['confederation'].to_dict()
+
+
 class TestNormalizeTeamsFunction:
     """Tests pour la fonction principale normalize_teams."""
     
@@ -391,6 +617,129 @@ class TestNormalizeTeamsFunction:
             parsed = json.loads(aliases_str)
             assert isinstance(parsed, list)
             
+class TestTeamIdRemapper:
+    """Tests du remappage vectorisé des IDs dans les matchs."""
+
+    def test_remap_dataframe(self, sample_matches_df):
+        """Les anciens IDs sont remplacés dans les deux colonnes."""
+        from normalize_teams import TeamIdRemapper
+
+        remapper = TeamIdRemapper({3: 2, 4: 2})
+        result = remapper.remap(sample_matches_df)
+
+        assert result['home_team_id'].tolist() == [1, 2, 2, 5]
+        assert result['away_team_id'].tolist() == [2, 5, 1, 2]
+        assert result['home_team_id'].dtype == sample_matches_df['home_team_id'].dtype
+        # L'original n'est pas modifié
+        assert sample_matches_df['home_team_id'].tolist() == [1, 3, 2, 5]
+
+    def test_remap_counts(self, sample_matches_df):
+        """Les compteurs home/away sont calculés par ancien ID."""
+        from normalize_teams import TeamIdRemapper
+
+        remapper = TeamIdRemapper({3: 2, 4: 2, 7: 1})
+        remapper.remap(sample_matches_df)
+
+        assert remapper.report() == [(3, 2, 1, 0), (4, 2, 0, 1), (7, 1, 0, 0)]
+
+    def test_remap_chunks_equals_whole(self, sample_matches_df):
+        """Le traitement par chunks donne le même résultat et les mêmes compteurs."""
+        from normalize_teams import TeamIdRemapper
+
+        whole = TeamIdRemapper({3: 2, 4: 2})
+        expected = whole.remap(sample_matches_df)
+
+        chunked = TeamIdRemapper({3: 2, 4: 2})
+        chunks = (sample_matches_df.iloc[i:i + 3] for i in range(0, len(sample_matches_df), 3))
+        result = pd.concat(list(chunked.remap(chunks)))
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert chunked.report() == whole.report()
+
+    def test_remap_keeps_missing_and_unknown_ids(self):
+        """Les IDs manquants ou hors mapping sont conservés."""
+        from normalize_teams import TeamIdRemapper
+
+        matches = pd.DataFrame({
+            'home_team_id': pd.array([3, None, 500], dtype='Int64'),
+            'away_team_id': pd.array([1, 3, None], dtype='Int64'),
+        })
+        result = TeamIdRemapper({3: 2}).remap(matches)
+
+        assert result['home_team_id'].tolist() == [2, pd.NA, 500]
+        assert result['away_team_id'].tolist() == [1, 2, pd.NA]
+        assert str(result['home_team_id'].dtype) == 'Int64'
+
+    def test_empty_mapping(self, sample_matches_df):
+        """Un mapping vide ne change rien."""
+        from normalize_teams import TeamIdRemapper
+
+        result = TeamIdRemapper({}).remap(sample_matches_df)
+        pd.testing.assert_frame_equal(result, sample_matches_df)
+
+
+class TestStreamingMatchesRewrite:
+    """Tests de la réécriture de matches.csv par morceaux."""
+
+    @pytest.fixture
+    def matches_csv(self, tmp_path, sample_matches_df):
+        """matches.csv temporaire avec une colonne texte à valeurs manquantes."""
+        matches = sample_matches_df.assign(
+            id_stadium=['12', '', '7', ''],
+            city=['Montevideo', 'Rome', 'Paris, Colombes', 'Lille'],
+        )
+        path = tmp_path / "matches.csv"
+        matches.to_csv(path, index=False)
+        return path
+
+    def test_rewrite_by_chunks(self, matches_csv):
+        """Les IDs sont remappés, quel que soit le découpage."""
+        from normalize_teams import rewrite_matches_team_ids
+
+        remapper = rewrite_matches_team_ids({3: 2, 4: 2}, matches_csv, chunksize=1)
+        result = pd.read_csv(matches_csv)
+
+        assert result['home_team_id'].tolist() == [1, 2, 2, 5]
+        assert result['away_team_id'].tolist() == [2, 5, 1, 2]
+        assert remapper.report() == [(3, 2, 1, 0), (4, 2, 0, 1)]
+        assert not matches_csv.with_name("matches.csv.tmp").exists()
+
+    def test_rewrite_keeps_other_columns_verbatim(self, matches_csv):
+        """Les colonnes hors IDs sont réécrites octet pour octet."""
+        from normalize_teams import rewrite_matches_team_ids
+
+        lines = matches_csv.read_text().splitlines(keepends=True)
+        rewrite_matches_team_ids({3: 2, 4: 2}, matches_csv, chunksize=3)
+        rewritten = matches_csv.read_text().splitlines(keepends=True)
+
+        # Seules les lignes contenant un ancien ID changent (ligne 0 = en-tête)
+        assert [i for i, (a, b) in enumerate(zip(lines, rewritten)) if a != b] == [2, 4]
+        assert rewritten[2].split(',')[3:] == lines[2].split(',')[3:]
+        assert rewritten[4].split(',')[3:] == lines[4].split(',')[3:]
+
+    def test_skip_when_no_remapped_id(self, matches_csv):
+        """Le fichier n'est pas réécrit si aucun ancien ID n'y apparaît."""
+        from normalize_teams import rewrite_matches_team_ids, matches_reference_ids
+
+        mtime_before = matches_csv.stat().st_mtime_ns
+
+        assert not matches_reference_ids({99: 1}, matches_csv)
+        assert rewrite_matches_team_ids({99: 1}, matches_csv) is None
+        assert matches_csv.stat().st_mtime_ns == mtime_before
+
+    def test_original_kept_on_error(self, matches_csv):
+        """En cas d'erreur, l'original est intact et le temporaire supprimé."""
+        from normalize_teams import rewrite_matches_team_ids, TeamIdRemapper
+
+        before = matches_csv.read_text()
+        with patch.object(TeamIdRemapper, 'apply', side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                rewrite_matches_team_ids({3: 2}, matches_csv)
+
+        assert matches_csv.read_text() == before
+        assert not matches_csv.with_name("matches.csv.tmp").exists()
+
+
 class TestEdgeCases:
     """Tests des cas limites."""
 
@@ -190,7 +190,7 @@ class TestNormalizationQuality:
 
     def test_known_teams_are_normalized_correctly(self):
         """Vérifie que les équipes connues sont bien normalisées."""
-        from teams_reference import normalize_team_name
+        from teams_reference import normalize_team_names
 
         test_cases = [
             ("France", "France"),
@@ -202,10 +202,25 @@ class TestNormalizationQuality:
             ("ARGENTINA", "Argentina"),
         ]
 
-        for input_name, expected in test_cases:
-            result = normalize_team_name(input_name)
+        inputs = pd.Series([input_name for input_name, _ in test_cases])
+        results = normalize_team_names(inputs)
+        for (input_name, expected), result in zip(test_cases, results):
             assert result == expected, f"'{input_name}' -> '{result}', attendu '{expected}'"
 
+    def test_real_match_names_are_normalized_once(self, project_root):
+        """Les noms bruts de l'historique 1930-2010 sont tous normalisés."""
+        from teams_reference import normalize_team_names
+
+        raw_csv = project_root / "data" / "raw" / "matches_19302010 (1).csv"
+        raw = pd.read_csv(raw_csv)
+        names = pd.concat([raw['team1'], raw['team2']], ignore_index=True)
+
+        result = normalize_team_names(names)
+
+        assert len(result) == len(names)
+        # Beaucoup moins de catégories que de lignes
+        assert len(result.cat.categories) < names.nunique()
+
     def test_all_confederations_are_valid(self):
         """Vérifie que toutes les confédérations sont valides."""
         from teams_reference import CONFEDERATIONS
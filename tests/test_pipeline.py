@@ -0,0 +1,322 @@
+"""
+Tests du pipeline sans notebook (src/pipeline).
+
+Les étapes sont exécutées sur les vrais fichiers bruts du projet ; la
+sortie de bout en bout est comparée aux fichiers de data/processed.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import time
+
+from pipeline import run_pipeline, stages, Stage, run_dag, critical_path, STAGES
+from pipeline.cache import ArtifactCache, code_digest, module_digests
+from pipeline.runner import build_stage_kwargs
+from pipeline.scheduler import format_report, validate_dag
+
+
+def _sleep_and_return(value, seconds=0.3):
+    """Étape de test : attend puis retourne value."""
+    time.sleep(seconds)
+    return value
+
+
+def _add(a, b):
+    """Étape de test : somme de deux entrées."""
+    return a + b
+
+
+def _read_file(raw_dir, name):
+    """Étape de test : contenu d'un fichier."""
+    return (Path(raw_dir) / name).read_text()
+
+
+class TestStages:
+    """Tests des étapes individuelles."""
+
+    def test_extract_1930_2010_drops_placeholders(self):
+        """Les équipes fictives et les matchs sans score sont exclus."""
+        df = stages.extract_1930_2010()
+
+        assert not df['team1'].isin(stages.PLACEHOLDER_TEAMS).any()
+        assert not df['team2'].isin(stages.PLACEHOLDER_TEAMS).any()
+        assert df['score_team1'].notna().all()
+
+    def test_transform_1930_2014_schema(self):
+        """1930-2014 est mis au schéma commun à 14 colonnes."""
+        df = stages.transform_1930_2014(stages.extract_1930_2010(), stages.extract_2014())
+
+        assert list(df.columns) == stages.MATCH_COLUMNS
+        assert set(df['edition']) >= {1930, 2014}
+        assert set(df['result']) <= {'home_team', 'away_team', 'draw'}
+
+    def test_final_1994_resolved_by_penalties(self):
+        """La finale 1994 (0-0, tirs au but) est gagnée par le Brésil."""
+        df = stages.transform_1930_2014(stages.extract_1930_2010(), stages.extract_2014())
+        final = df[(df['edition'] == 1994) & (df['round'] == 'Final')].iloc[0]
+
+        winner = final['home_team_id'] if final['result'] == 'home_team' else final['away_team_id']
+        assert winner.startswith('Brazil')
+
+    def test_extract_2018(self):
+        """2018 : 64 matchs, dates sans heure, knockout nuls en prolongation."""
+        df = stages.extract_2018()
+
+        assert len(df) == 64
+        assert df['date'].notna().all()
+        assert (df['date'] == df['date'].dt.normalize()).all()
+        assert df.loc[df['penalties'], 'extra_time'].all()
+
+    def test_map_team_ids_unmapped_raises(self):
+        """Une équipe sans ID lève une ValueError."""
+        matches = pd.DataFrame({'home_team_id': ['France'], 'away_team_id': ['Atlantis']})
+        teams = pd.DataFrame({'id_team': [1], 'nom_standard': ['France']})
+
+        with pytest.raises(ValueError, match="Atlantis"):
+            stages.map_team_ids(matches, teams, {})
+
+    def test_map_team_ids_uses_aliases(self):
+        """Les alias du référentiel et la casse sont résolus."""
+        matches = pd.DataFrame({'home_team_id': ['FRANCE'], 'away_team_id': ['FRG']})
+        teams = pd.DataFrame({'id_team': [1, 2], 'nom_standard': ['France', 'Germany']})
+
+        result = stages.map_team_ids(matches, teams, {'Germany': {'aliases': ['FRG']}})
+
+        assert result['home_team_id'].tolist() == [1]
+        assert result['away_team_id'].tolist() == [2]
+
+
+class TestScheduler:
+    """Tests de l'ordonnanceur DAG."""
+
+    @pytest.fixture
+    def diamond(self):
+        return [
+            Stage("a", _sleep_and_return, ["x"]),
+            Stage("b", _sleep_and_return, ["y"]),
+            Stage("sum", _add, ["a", "b"]),
+        ]
+
+    def test_independent_stages_run_concurrently(self, diamond):
+        """Deux étapes de 0,3 s sans dépendance durent moins de 0,6 s au total."""
+        start = time.perf_counter()
+        outputs, timings = run_dag(diamond, initial={"x": 1, "y": 2}, max_workers=2)
+        elapsed = time.perf_counter() - start
+
+        assert outputs["sum"] == 3
+        assert timings["a"] >= 0.3 and timings["b"] >= 0.3
+        assert elapsed < timings["a"] + timings["b"]
+
+    def test_sequential_mode(self, diamond):
+        """max_workers=1 exécute dans le processus courant, même résultat."""
+        done = []
+        outputs, _ = run_dag(diamond, initial={"x": 1, "y": 2},
+                             stage_kwargs={"a": {"seconds": 0}, "b": {"seconds": 0}},
+                             max_workers=1, on_done=lambda name, _: done.append(name))
+
+        assert outputs["sum"] == 3
+        assert done == ["a", "b", "sum"]
+
+    def test_unknown_input_raises(self):
+        with pytest.raises(ValueError, match="inconnues"):
+            validate_dag([Stage("a", _add, ["missing", "x"])], initial=["x"])
+
+    def test_cycle_raises(self):
+        with pytest.raises(ValueError, match="Cycle"):
+            validate_dag([Stage("a", _add, ["b"]), Stage("b", _add, ["a"])])
+
+    def test_critical_path(self, diamond):
+        """Le chemin critique suit la branche la plus lente."""
+        path, length = critical_path(diamond, {"a": 1.0, "b": 3.0, "sum": 0.5})
+
+        assert path == ["b", "sum"]
+        assert length == pytest.approx(3.5)
+
+    def test_critical_path_skips_cached(self, diamond):
+        """Les étapes relues depuis le cache ne sont pas sur le chemin critique."""
+        assert critical_path(diamond, {"sum": 0.5}) == (["sum"], 0.5)
+        assert critical_path(diamond, {}) == ([], 0.0)
+
+    def test_report_all_cached(self, diamond):
+        report = format_report(diamond, {}, 0.01)
+
+        assert "tout en cache" in report
+        assert "*" not in report
+
+    def test_pipeline_dag_is_valid(self):
+        """Le DAG du pipeline est acyclique et ses entrées sont déclarées."""
+        validate_dag(STAGES, initial=[])
+        extracts = [stage for stage in STAGES if stage.name.startswith("extract_")]
+        assert all(stage.inputs == [] for stage in extracts)
+
+
+class TestArtifactCache:
+    """Tests de la reconstruction incrémentale par empreinte."""
+
+    @pytest.fixture
+    def files_dag(self, tmp_path):
+        raw = tmp_path / "raw"
+        raw.mkdir()
+        (raw / "a.txt").write_text("a")
+        (raw / "b.txt").write_text("b")
+        dag = [
+            Stage("a", _read_file, [], files=("{raw_dir}/a.txt",)),
+            Stage("b", _read_file, [], files=("{raw_dir}/b.txt",),
+                  constants=("cleaning.ROUND_CACHE_SIZE",)),
+            Stage("ab", _add, ["a", "b"]),
+        ]
+        kwargs = {"a": {"raw_dir": raw, "name": "a.txt"}, "b": {"raw_dir": raw, "name": "b.txt"}}
+        cache = ArtifactCache(tmp_path / "artifacts")
+
+        def run():
+            return run_dag(dag, stage_kwargs=kwargs, max_workers=1, cache=cache)
+
+        return raw, dag, kwargs, cache, run
+
+    def test_second_run_uses_cache(self, files_dag):
+        """Sans modification, aucune étape n'est recalculée."""
+        _, _, _, _, run = files_dag
+        run()
+        outputs, timings = run()
+
+        assert outputs["ab"] == "ab"
+        assert timings == {}
+        assert "a" not in outputs  # inutile : ab est à jour
+
+    def test_changed_file_rebuilds_downstream_only(self, files_dag):
+        """Un fichier modifié reconstruit son étape et son aval, pas le reste."""
+        raw, dag, kwargs, cache, run = files_dag
+        run()
+        (raw / "b.txt").write_text("B!")
+
+        assert cache.explain(dag, kwargs) == {
+            "a": [],
+            "b": ["fichier b.txt modifié"],
+            "ab": ["entrée b reconstruite"],
+        }
+        outputs, timings = run()
+        assert outputs["ab"] == "aB!"
+        assert set(timings) == {"b", "ab"}
+
+    def test_changed_constant_rebuilds(self, files_dag, monkeypatch):
+        """Une constante modifiée invalide l'étape qui la déclare."""
+        import cleaning
+
+        _, dag, kwargs, cache, run = files_dag
+        run()
+        monkeypatch.setattr(cleaning, "ROUND_CACHE_SIZE", 1)
+
+        reasons = cache.explain(dag, kwargs)
+        assert reasons["b"] == ["constante cleaning.ROUND_CACHE_SIZE modifiée"]
+        assert reasons["a"] == []
+
+    def test_version_bump_rebuilds(self, files_dag):
+        """Incrémenter la version d'une étape la reconstruit."""
+        _, dag, kwargs, cache, run = files_dag
+        run()
+        dag[0] = dag[0]._replace(version=2)
+
+        assert cache.explain(dag, kwargs)["a"] == ["code de l'étape modifié"]
+
+    def test_stage_modules_in_fingerprint(self):
+        """Les modules de src appelés par une étape entrent dans son empreinte."""
+        assert set(module_digests(stages.extract_1930_2010)) == {"cleaning.py"}
+        assert {"match_results.py", "schema.py"} <= set(module_digests(stages.transform_1930_2014))
+        # normalize_teams importe teams_reference, qui importe teams_constants
+        assert {"normalize_teams.py", "teams_reference.py", "teams_constants.py"} <= set(
+            module_digests(stages.normalize)
+        )
+        assert module_digests(_add) == {}
+
+    def test_local_helper_in_code_digest(self, monkeypatch):
+        """Modifier un utilitaire du module de l'étape change l'empreinte de son code."""
+        import inspect
+
+        before = {name: code_digest(getattr(stages, name)) for name in ("transform_1930_2014", "extract_2014")}
+        getsource = inspect.getsource
+        monkeypatch.setattr(inspect, "getsource",
+                            lambda obj: getsource(obj) + "#" if obj is stages._result_from_scores else getsource(obj))
+
+        assert code_digest(stages.transform_1930_2014) != before["transform_1930_2014"]
+        assert code_digest(stages.extract_2014) == before["extract_2014"]
+
+    def test_changed_module_rebuilds(self, tmp_path, monkeypatch):
+        """Un module appelé par l'étape modifié la reconstruit, sans Stage.version."""
+        from pipeline import cache as cache_module
+
+        dag = [Stage("rounds", stages.extract_1930_2010, [])]
+        cache = ArtifactCache(tmp_path / "artifacts")
+        fingerprint, manifest, _ = cache.plan(dag)["rounds"]
+        cache.store("rounds", manifest, "sortie")
+
+        file_digest = cache_module._file_digest
+        monkeypatch.setattr(cache_module, "_file_digest",
+                            lambda path: "modifié" if path.name == "cleaning.py" else file_digest(path))
+
+        assert cache.explain(dag) == {"rounds": ["module cleaning.py modifié"]}
+
+    def test_normalize_fingerprints_reference_files(self):
+        """normalize suit les fichiers de référence réellement lus par teams_reference."""
+        import teams_reference
+
+        normalize = next(stage for stage in STAGES if stage.name == "normalize")
+        files = {Path(template) for template in normalize.files}
+        assert {teams_reference.CONFEDERATIONS_CACHE, teams_reference.FIFA_RANKING_CSV} <= files
+
+    def test_pipeline_rerun_from_cache(self, tmp_path, project_root):
+        """Le pipeline relancé sans modification relit tout depuis le cache."""
+        first, _ = run_pipeline(processed_dir=tmp_path / "out", cache_dir=tmp_path / "cache",
+                                 formats=("csv",))
+        second, _ = run_pipeline(processed_dir=tmp_path / "out", cache_dir=tmp_path / "cache",
+                                 formats=("csv",))
+
+        pd.testing.assert_frame_equal(first, second)
+        cache = ArtifactCache(tmp_path / "cache", {"reference_dir": stages.REFERENCE_DIR})
+        kwargs = build_stage_kwargs(stages.RAW_DIR, stages.REFERENCE_DIR)
+        assert not any(cache.explain(STAGES, kwargs).values())
+
+
+@pytest.fixture(scope="module")
+def pipeline_output(tmp_path_factory):
+    """Exécute le pipeline une fois, dans des dossiers temporaires."""
+    out = tmp_path_factory.mktemp("processed")
+    checkpoints = tmp_path_factory.mktemp("staging")
+    run_pipeline(processed_dir=out, checkpoint_dir=checkpoints, formats=("csv",))
+    return out, checkpoints
+
+
+class TestRunPipeline:
+    """Test de bout en bout."""
+
+    def test_checkpoints_written(self, pipeline_output):
+        """Les points de contrôle portent les noms des exports des notebooks."""
+        _, checkpoints = pipeline_output
+        names = {path.name for path in checkpoints.iterdir()}
+        assert {"matches_2018_clean.csv", "teams.csv", "matches_with_ids.csv"} <= names
+
+    def test_teams_match_processed(self, pipeline_output, project_root):
+        """teams_traitees.csv est identique à celui produit par les notebooks."""
+        out, _ = pipeline_output
+        expected = pd.read_csv(project_root / "data/processed/teams_traitees.csv")
+        pd.testing.assert_frame_equal(pd.read_csv(out / "teams_traitees.csv"), expected)
+
+    def test_matches_match_processed(self, pipeline_output, project_root):
+        """
+        matches.csv est identique, sauf les tirs au but (p.k.) désormais
+        détectés et les tours ramenés aux étapes canoniques.
+        """
+        out, _ = pipeline_output
+        expected = pd.read_csv(project_root / "data/processed/matches.csv")
+        expected['round'] = expected['round'].replace('Semi-final', 'Semi-finals')
+        matches = pd.read_csv(out / "matches.csv")
+
+        pd.testing.assert_frame_equal(matches.drop(columns='penalties'),
+                                      expected.drop(columns='penalties'))
+        changed = matches['penalties'] != expected['penalties']
+        assert matches.loc[changed, 'penalties'].all()
+        assert (matches.loc[changed, 'edition'] <= 2010).all()
@@ -0,0 +1,113 @@
+"""
+Tests unitaires pour schema.py
+
+Vérifie la conversion vers le schéma canonique des matchs et l'empreinte
+mémoire de la table consolidée.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from schema import MATCH_COLUMNS, coerce_matches, coerce_teams
+
+
+@pytest.fixture
+def raw_matches():
+    """Matchs tels que relus d'un CSV : objets, float64 et chaînes."""
+    return pd.DataFrame({
+        'id_match': [1, 2, 3],
+        'home_team_id': [10.0, 11.0, 12.0],
+        'away_team_id': [11.0, 12.0, 10.0],
+        'home_result': [1, 0, 2],
+        'away_result': [1, 3, 2],
+        'result': ['draw', 'away_team', 'home_team'],
+        'extra_time': ['False', 'False', 'True'],
+        'penalties': [False, False, True],
+        'replay': [False, False, False],
+        'date': [None, '2018-06-14', '2018-07-15T18:00:00+03:00'],
+        'round': ['Group Stage', 'Semi-final', 'FINAL'],
+        'city': ['Moscow', '', 'Moscow'],
+        'id_stadium': [None, None, 'Luzhniki'],
+        'edition': [2018, 2018, 2018],
+    })
+
+
+class TestCoerceMatches:
+    """Tests de coerce_matches."""
+
+    def test_dtypes(self, raw_matches):
+        df = coerce_matches(raw_matches)
+
+        assert list(df.columns) == MATCH_COLUMNS
+        assert df['home_team_id'].dtype == 'Int16'
+        assert df['home_result'].dtype == 'UInt8'
+        assert df['extra_time'].dtype == 'boolean'
+        assert df['date'].dtype == 'datetime64[s]'
+        assert df['round'].cat.ordered
+        assert isinstance(df['city'].dtype, pd.CategoricalDtype)
+        assert df['extra_time'].tolist() == [False, False, True]
+
+    def test_values(self, raw_matches):
+        """Tours canoniques, dates sans heure ni fuseau, chaînes vides manquantes."""
+        df = coerce_matches(raw_matches)
+
+        assert df['round'].tolist() == ['Group Stage', 'Semi-finals', 'Final']
+        assert df['date'].isna().tolist() == [True, False, False]
+        assert df['date'][1] == pd.Timestamp('2018-06-14')
+        assert pd.isna(df['city'][1])
+
+    def test_team_names_kept_as_categories(self, raw_matches):
+        """Avant map_team_ids, les colonnes d'IDs contiennent des noms."""
+        raw_matches['home_team_id'] = ['France', 'Brazil', 'France']
+        df = coerce_matches(raw_matches)
+
+        assert isinstance(df['home_team_id'].dtype, pd.CategoricalDtype)
+        assert df['home_team_id'].tolist() == ['France', 'Brazil', 'France']
+
+    def test_idempotent(self, raw_matches):
+        once = coerce_matches(raw_matches)
+        pd.testing.assert_frame_equal(coerce_matches(once), once)
+
+    def test_unknown_round_raises(self, raw_matches):
+        raw_matches.loc[0, 'round'] = 'Friendly'
+        with pytest.raises(ValueError, match="Friendly"):
+            coerce_matches(raw_matches)
+
+    def test_negative_score_raises(self, raw_matches):
+        raw_matches.loc[0, 'home_result'] = -1
+        with pytest.raises(ValueError, match="home_result"):
+            coerce_matches(raw_matches)
+
+    def test_extra_columns_kept(self, raw_matches):
+        raw_matches['source'] = 'json'
+        assert coerce_matches(raw_matches).columns[-1] == 'source'
+
+    def test_memory_footprint(self, real_matches_csv):
+        """La table consolidée tient en moins de 64 octets par match, 5x moins qu'au CSV."""
+        matches = pd.read_csv(real_matches_csv)
+        before = matches.memory_usage(deep=True).sum()
+        after = coerce_matches(matches).memory_usage(deep=True).sum()
+
+        assert after / len(matches) < 64
+        assert before / after > 5
+
+
+class TestCoerceTeams:
+    """Tests de coerce_teams."""
+
+    def test_dtypes(self):
+        teams = pd.DataFrame({
+            'id_team': [1, 2],
+            'nom_standard': ['France', 'Brazil'],
+            'confederation': ['UEFA', None],
+            'aliases': ['[]', '[]'],
+        })
+        df = coerce_teams(teams)
+
+        assert df['id_team'].dtype == 'Int16'
+        assert isinstance(df['confederation'].dtype, pd.CategoricalDtype)
+        assert df['nom_standard'].tolist() == ['France', 'Brazil']
@@ -0,0 +1,104 @@
+"""
+Tests unitaires pour stats.py
+
+Les agrégats vectorisés sont comparés à un calcul match par match, sur un
+petit tableau construit à la main et sur data/processed/matches.csv.
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from conftest import make_matches
+from stats import (
+    PAIR_EDITION_COLUMNS,
+    TEAM_EDITION_COLUMNS,
+    pair_edition_stats,
+    team_edition_stats,
+)
+
+
+@pytest.fixture
+def small_df():
+    return make_matches([
+        (1990, 'Preliminary', 1, 2, 5, 0, 'home_team'),
+        (1990, 'Group Stage', 1, 2, 1, 1, 'draw'),
+        (1990, 'Group Stage', 3, 1, 0, 2, 'away_team'),
+        (1990, 'Final', 2, 1, 1, 0, 'home_team'),
+        (1994, 'Group Stage', 2, 1, 0, 3, 'away_team'),
+    ], extra_time=False, penalties=False)
+
+
+@pytest.fixture
+def real_matches(processed_tables):
+    return processed_tables[0]
+
+
+class TestTeamEditionStats:
+    """Tests de team_edition_stats."""
+
+    def test_small(self, small_df):
+        stats = team_edition_stats(small_df).set_index(['id_team', 'edition'])
+
+        team1 = stats.loc[(1, 1990)]
+        assert team1[['matches', 'wins', 'draws', 'losses']].tolist() == [3, 1, 1, 1]
+        assert team1[['goals_for', 'goals_against', 'clean_sheets']].tolist() == [3, 2, 1]
+        assert team1[['best_round_rank', 'finals', 'titles']].tolist() == [6, 1, 0]
+        assert stats.loc[(2, 1990), 'titles'] == 1
+        assert stats.loc[(3, 1990), 'best_round_rank'] == 2
+
+    def test_preliminary_excluded(self, small_df):
+        stats = team_edition_stats(small_df)
+        assert stats['matches'].sum() == 2 * 4
+
+    def test_editions_filter(self, small_df):
+        stats = team_edition_stats(small_df, editions={1994})
+        assert set(stats['edition']) == {1994}
+        assert list(stats.columns) == TEAM_EDITION_COLUMNS
+
+    def test_real_matches_per_team(self, real_matches):
+        """Mêmes totaux qu'un calcul match par match."""
+        stats = team_edition_stats(real_matches)
+        played = real_matches[real_matches['round'] != 'Preliminary']
+        team = played['home_team_id'].iloc[0]
+
+        wins = goals = 0
+        for row in played.itertuples():
+            if row.home_team_id == team:
+                wins += row.result == 'home_team'
+                goals += row.home_result
+            elif row.away_team_id == team:
+                wins += row.result == 'away_team'
+                goals += row.away_result
+        totals = stats[stats['id_team'] == team].sum()
+        assert (totals['wins'], totals['goals_for']) == (wins, goals)
+
+    def test_one_title_per_final(self, real_matches):
+        stats = team_edition_stats(real_matches)
+        n_finals = (real_matches['round'] == 'Final').sum()
+        assert stats['titles'].sum() == n_finals
+        assert stats['finals'].sum() == 2 * n_finals
+
+
+class TestPairEditionStats:
+    """Tests de pair_edition_stats."""
+
+    def test_pair_normalized(self, small_df):
+        stats = pair_edition_stats(small_df).set_index(['team_a_id', 'team_b_id', 'edition'])
+
+        pair = stats.loc[(1, 2, 1990)]
+        assert pair[['matches', 'team_a_wins', 'team_b_wins', 'draws']].tolist() == [2, 0, 1, 1]
+        assert pair[['team_a_goals', 'team_b_goals']].tolist() == [1, 2]
+        assert stats.loc[(1, 2, 1994), 'team_a_wins'] == 1
+        assert stats.loc[(1, 3, 1990), 'team_a_goals'] == 2
+
+    def test_totals_match_team_stats(self, real_matches):
+        """La somme des paires redonne les victoires de team_edition_stats."""
+        pairs = pair_edition_stats(real_matches)
+        teams = team_edition_stats(real_matches)
+
+        assert (pairs['team_a_wins'].sum() + pairs['team_b_wins'].sum()) == teams['wins'].sum()
+        assert pairs['matches'].sum() * 2 == teams['matches'].sum()
+        assert list(pairs.columns) == PAIR_EDITION_COLUMNS
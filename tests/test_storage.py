@@ -0,0 +1,130 @@
+"""
+Tests du stockage Parquet (storage.py).
+
+Ignorés si pyarrow n'est pas installé.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("pyarrow")
+
+from schema import coerce_matches, coerce_teams
+from storage import (
+    export_csv,
+    read_matches_parquet,
+    read_teams_parquet,
+    write_matches_parquet,
+    write_teams_parquet,
+)
+
+
+@pytest.fixture
+def real_matches(real_matches_csv):
+    return pd.read_csv(real_matches_csv)
+
+
+class TestMatchesParquet:
+    """Tests de la table des matchs en Parquet."""
+
+    def test_partitioned_by_edition(self, real_matches, tmp_path):
+        """Un dossier edition=<année> par édition."""
+        path = write_matches_parquet(real_matches, tmp_path / "matches.parquet")
+
+        partitions = {p.name for p in path.iterdir()}
+        assert partitions == {f"edition={e}" for e in real_matches['edition'].unique()}
+
+    def test_compact_dtypes(self, real_matches, tmp_path):
+        """Relue aux dtypes canoniques : IDs Int16, buts UInt8, booléens, catégories et dates."""
+        path = write_matches_parquet(real_matches, tmp_path / "matches.parquet")
+        df = read_matches_parquet(path)
+
+        assert df['home_team_id'].dtype == 'Int16'
+        assert df['home_result'].dtype == 'UInt8'
+        assert df['extra_time'].dtype == 'boolean'
+        assert isinstance(df['round'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(df['date'])
+        assert df.memory_usage(deep=True).sum() < real_matches.memory_usage(deep=True).sum() / 4
+
+    def test_csv_round_trip(self, real_matches, tmp_path):
+        """L'export CSV d'une table relue depuis Parquet est celui de l'original mis au schéma."""
+        path = write_matches_parquet(real_matches, tmp_path / "matches.parquet")
+        csv_path = export_csv(read_matches_parquet(path), tmp_path / "matches.csv")
+        expected = export_csv(coerce_matches(real_matches), tmp_path / "expected.csv")
+
+        assert csv_path.read_bytes() == expected.read_bytes()
+
+    def test_read_coerces_matches(self, real_matches, tmp_path):
+        """La lecture Parquet passe par coerce_matches, colonnes demandées comprises."""
+        path = write_matches_parquet(real_matches, tmp_path / "matches.parquet")
+
+        pd.testing.assert_frame_equal(read_matches_parquet(path), coerce_matches(real_matches))
+        subset = read_matches_parquet(path, columns=['id_match', 'round', 'home_result'])
+        assert subset.dtypes.astype(str).tolist() == ['Int32', 'category', 'UInt8']
+
+    def test_edition_filter(self, real_matches, tmp_path):
+        """Seules les éditions demandées sont lues."""
+        path = write_matches_parquet(real_matches, tmp_path / "matches.parquet")
+        df = read_matches_parquet(path, editions=[2018, 2022], columns=['id_match', 'edition'])
+
+        assert set(df['edition']) == {2018, 2022}
+        assert len(df) == 128
+        assert list(df.columns) == ['id_match', 'edition']
+
+    def test_rewrite_replaces_dataset(self, real_matches, tmp_path):
+        """Réécrire le dataset remplace les anciennes partitions."""
+        path = tmp_path / "matches.parquet"
+        write_matches_parquet(real_matches, path)
+        write_matches_parquet(real_matches[real_matches['edition'] == 2018], path)
+
+        assert read_matches_parquet(path)['edition'].unique().tolist() == [2018]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["matches.parquet"]
+
+    def test_single_file(self, real_matches, tmp_path):
+        """partitioned=False écrit un seul fichier lisible par read_matches_parquet."""
+        path = write_matches_parquet(real_matches, tmp_path / "m.parquet", partitioned=False)
+
+        assert path.is_file()
+        assert len(read_matches_parquet(path)) == len(real_matches)
+
+
+    def test_stale_old_dataset_removed(self, real_matches, tmp_path):
+        """Un .old laissé par une écriture interrompue n'empêche pas la suivante."""
+        path = tmp_path / "matches.parquet"
+        write_matches_parquet(real_matches, path)
+        path.rename(path.with_name("matches.parquet.old"))
+        write_matches_parquet(real_matches, path)
+
+        write_matches_parquet(real_matches[real_matches['edition'] == 2018], path)
+
+        assert read_matches_parquet(path)['edition'].unique().tolist() == [2018]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["matches.parquet"]
+
+    @pytest.mark.parametrize("before,after", [(False, True), (True, False)])
+    def test_switch_partitioning(self, real_matches, tmp_path, before, after):
+        """Un fichier unique peut être remplacé par un dataset partitionné, et inversement."""
+        path = tmp_path / "matches.parquet"
+        write_matches_parquet(real_matches, path, partitioned=before)
+        write_matches_parquet(real_matches, path, partitioned=after)
+
+        assert path.is_dir() == after
+        assert len(read_matches_parquet(path)) == len(real_matches)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["matches.parquet"]
+
+
+class TestTeamsParquet:
+    """Tests de la table des équipes en Parquet."""
+
+    def test_round_trip(self, real_teams_csv, project_root, tmp_path):
+        teams_csv = project_root / "data/processed/teams_traitees.csv"
+        path = write_teams_parquet(pd.read_csv(teams_csv), tmp_path / "teams.parquet")
+        teams = read_teams_parquet(path)
+
+        assert teams['id_team'].dtype == 'Int16'
+        assert isinstance(teams['confederation'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(teams, coerce_teams(pd.read_csv(teams_csv)))
+        assert export_csv(teams, tmp_path / "teams.csv").read_bytes() == teams_csv.read_bytes()